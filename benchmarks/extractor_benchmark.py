@@ -0,0 +1,84 @@
+"""Compare per-flight field extraction cost of dpath against FieldExtractor.
+
+Run from the repository root with the integration's requirements and dpath
+installed:
+
+    python benchmarks/extractor_benchmark.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+import dpath.util  # noqa: E402
+from whats_that_plane.sensor import FLIGHT_FIELDS  # noqa: E402
+
+SAMPLE_PAYLOAD = {
+    "identification": {"id": "2f8a1b3c", "number": {"default": "BA117"}, "callsign": "BAW117"},
+    "status": {"live": True, "icon": "green"},
+    "aircraft": {
+        "model": {"code": "B77W", "text": "Boeing 777-36N(ER)"},
+        "hex": "400c1f",
+        "registration": "G-STBA",
+        "images": {
+            "thumbnails": [{"src": "https://cdn.jetphotos.com/200/1.jpg"}],
+            "medium": [{"src": "https://cdn.jetphotos.com/400/1.jpg"}],
+            "large": [{"src": "https://cdn.jetphotos.com/640/1.jpg"}],
+        },
+    },
+    "airline": {"name": "British Airways", "code": {"iata": "BA", "icao": "BAW"}},
+    "airport": {
+        "origin": {
+            "name": "London Heathrow Airport",
+            "code": {"iata": "LHR", "icao": "EGLL"},
+            "position": {
+                "latitude": 51.4706, "longitude": -0.461941,
+                "country": {"name": "United Kingdom", "code": "GBR", "codeLong": "GBR"},
+                "region": {"city": "London"},
+            },
+            "timezone": {"name": "Europe/London"},
+        },
+        "destination": {
+            "name": "New York John F. Kennedy International Airport",
+            "code": {"iata": "JFK", "icao": "KJFK"},
+            "position": {
+                "latitude": 40.6398, "longitude": -73.7789,
+                "country": {"name": "United States", "code": "USA", "codeLong": "USA"},
+                "region": {"city": "New York"},
+            },
+            "timezone": {"name": "America/New_York"},
+        },
+    },
+    "time": {
+        "scheduled": {"departure": 1760000000, "arrival": 1760029000},
+        "real": {"departure": 1760000900, "arrival": None},
+        "estimated": {"departure": None, "arrival": 1760029500},
+    },
+    "trail": [{"lat": 51.5, "lng": -0.5, "alt": 12000, "spd": 320, "ts": 1760001500, "hd": 280}],
+}
+
+
+def extract_with_dpath(payload, paths):
+    return {field: dpath.util.get(payload, path, default=None) for field, path in paths.items()}
+
+
+def main():
+    paths = FLIGHT_FIELDS.schema
+    assert extract_with_dpath(SAMPLE_PAYLOAD, paths) == FLIGHT_FIELDS.extract(SAMPLE_PAYLOAD).as_dict()
+
+    iterations = 2000
+    dpath_seconds = min(timeit.repeat(lambda: extract_with_dpath(SAMPLE_PAYLOAD, paths), number=iterations, repeat=5))
+    extractor_seconds = min(timeit.repeat(lambda: FLIGHT_FIELDS.extract(SAMPLE_PAYLOAD), number=iterations, repeat=5))
+
+    print(json.dumps({
+        "fields": len(paths),
+        "dpath_us_per_flight": round(dpath_seconds / iterations * 1e6, 2),
+        "extractor_us_per_flight": round(extractor_seconds / iterations * 1e6, 2),
+        "speedup": round(dpath_seconds / extractor_seconds, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Benchmark the coordinator and sensor hot paths against a synthetic feed.
+
+For each aircraft count the following stages are measured:
+
+* ``geometry``: radius, altitude and FOV filter over the whole feed
+* ``trail_update``: appending one position to every visible flight's trail
+* ``detail_merge``: merging a clickhandler payload into every visible flight
+* ``update_cycle``: a full steady-state ``_async_update_data`` tick
+* ``format``: ``update_sensor_data`` with warm formatting caches
+* ``format_cold``: ``update_sensor_data`` after the caches are cleared
+* ``serialize``: encoding the state attributes the way Home Assistant does
+
+Each stage reports the median and fastest latency over ``--repeat`` runs, the
+peak memory traced during one extra run and the number of memory blocks that
+run left allocated. Run from the repository root with the integration's
+requirements and Home Assistant installed:
+
+    python benchmarks/hot_paths_benchmark.py --sizes 10 100 1000 5000 --output results.json
+"""
+import argparse
+import asyncio
+import copy
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.json import json_bytes  # noqa: E402
+from synthetic import SyntheticTransport, generate_details, generate_flights  # noqa: E402
+from whats_that_plane import WhatsThatPlaneCoordinator, import_dependencies  # noqa: E402
+from whats_that_plane.geometry import compute_flight_geometry  # noqa: E402
+from whats_that_plane.limiter import RequestLimiter  # noqa: E402
+from whats_that_plane.sensor import WhatsThatPlaneSensor  # noqa: E402
+
+LATITUDE = 51.4775
+LONGITUDE = -0.4614
+RADIUS_KM = 25
+POLL_SECONDS = 10
+
+
+async def measure(run, setup=None, repeat=5):
+    """Time ``run(state)`` ``repeat`` times, then trace memory over one more run."""
+    latencies = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        result = run(state)
+        if inspect.isawaitable(result):
+            await result
+        latencies.append(time.perf_counter() - start)
+
+    state = setup() if setup else None
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = run(state)
+    if inspect.isawaitable(result):
+        await result
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+
+    return {
+        "median_ms": round(statistics.median(latencies) * 1000, 3),
+        "min_ms": round(min(latencies) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_blocks": retained_blocks,
+    }
+
+
+def build_config(args):
+    return {
+        "latitude": LATITUDE,
+        "longitude": LONGITUDE,
+        "radius_km": RADIUS_KM,
+        "facing_direction": 0,
+        "fov_cone": 360,
+        "update_interval": POLL_SECONDS,
+        "historic_flights_max_count": args.historic,
+        "hold_flight_data_seconds": 0,
+        "trail_max_points": max(args.trail_points * 2, 1000),
+        "detail_fetch_max_concurrency": 64,
+        "detail_fetch_cycle_timeout_seconds": 600,
+    }
+
+
+async def benchmark_size(hass, count, args):
+    flights = generate_flights(count, LATITUDE, LONGITUDE, RADIUS_KM * 1.2, seed=count)
+    coordinator = WhatsThatPlaneCoordinator(hass, config=build_config(args))
+    coordinator.config_entry = SimpleNamespace(entry_id=f"benchmark-{count}")
+    coordinator.fr_api.get_flights = lambda *_: flights
+    coordinator.transport = SyntheticTransport(flights, args.trail_points)
+    coordinator.limiter = RequestLimiter(rate_per_minute=1e9, burst=1e9)
+    # As async_first_refresh does before the first update.
+    import_dependencies()
+    coordinator.dependencies_loaded = True
+
+    # Historic flights: expire a separate batch so their records have the same shape as live ones.
+    historic_source = generate_flights(args.historic, LATITUDE, LONGITUDE, RADIUS_KM * 0.5, seed=count + 1)
+    coordinator.historic_flights = []
+    for flight in historic_source:
+        flight_details = {}
+        coordinator._merge_flight_details(flight_details, generate_details(flight, args.trail_points))
+        coordinator.historic_flights.append({"data": flight_details, "last_seen": flight.time})
+
+    # Warm up: the first tick fetches details for every visible flight.
+    coordinator.data = await coordinator._async_update_data()
+    visible = len(coordinator.data)
+    results = {"aircraft": count, "visible": visible, "historic": len(coordinator.historic_flights)}
+
+    latitudes = [flight.latitude for flight in flights]
+    longitudes = [flight.longitude for flight in flights]
+    altitudes = [flight.altitude for flight in flights]
+    results["geometry"] = await measure(
+        lambda _: compute_flight_geometry(
+            LATITUDE, LONGITUDE, latitudes, longitudes, altitudes, RADIUS_KM, 0, 60000, 0, 360
+        ),
+        repeat=args.repeat,
+    )
+
+    tracked = {flight.id: flight for flight in flights if flight.id in coordinator.tracked_flights}
+
+    def trail_setup():
+        return [
+            (copy.deepcopy(coordinator.tracked_flights[flight_id]["data"]["trail"]), flight)
+            for flight_id, flight in tracked.items()
+        ]
+
+    def trail_run(trails):
+        now = int(time.time())
+        for trail, flight in trails:
+            trail.append(flight.latitude + 0.01, flight.longitude + 0.01, flight.altitude, flight.ground_speed, flight.heading, now)
+
+    results["trail_update"] = await measure(trail_run, trail_setup, args.repeat)
+
+    payloads = {flight_id: generate_details(flight, args.trail_points) for flight_id, flight in tracked.items()}
+
+    def merge_setup():
+        live = {}
+        for flight_id, flight in tracked.items():
+            live[flight_id] = {
+                "latitude": flight.latitude,
+                "longitude": flight.longitude,
+                "altitude": flight.altitude,
+                "heading": flight.heading,
+                "callsign": flight.callsign,
+                "trail": [{"lat": flight.latitude, "lng": flight.longitude, "alt": flight.altitude, "spd": flight.ground_speed, "ts": flight.time, "hd": flight.heading}],
+                "identification": {"id": flight_id, "callsign": flight.callsign},
+            }
+        return live
+
+    def merge_run(live):
+        for flight_id, flight_details in live.items():
+            coordinator._merge_flight_details(flight_details, payloads[flight_id])
+
+    results["detail_merge"] = await measure(merge_run, merge_setup, args.repeat)
+
+    async def cycle_run(_):
+        for flight in flights:
+            flight.advance(POLL_SECONDS)
+        coordinator.data = await coordinator._async_update_data()
+
+    results["update_cycle"] = await measure(cycle_run, repeat=args.repeat)
+
+    sensor = WhatsThatPlaneSensor(coordinator)
+    results["format"] = await measure(lambda _: sensor.update_sensor_data(), repeat=args.repeat)
+
+    def cold_setup():
+        sensor._static_cache.clear()
+        sensor._historic_cache.clear()
+
+    results["format_cold"] = await measure(lambda _: sensor.update_sensor_data(), cold_setup, args.repeat)
+
+    sensor.update_sensor_data()
+    attributes = sensor.extra_state_attributes
+    results["serialize"] = await measure(lambda _: json_bytes(attributes), repeat=args.repeat)
+    results["attribute_bytes"] = len(json_bytes(attributes))
+    results["detail_requests"] = coordinator.transport.request_count
+
+    await coordinator.async_shutdown()
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="aircraft counts to benchmark")
+    parser.add_argument("--trail-points", type=int, default=100, help="trail points per clickhandler payload")
+    parser.add_argument("--historic", type=int, default=50, help="historic flights held by the coordinator")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--output", help="write the JSON results to this file as well as stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            runs = [await benchmark_size(hass, count, args) for count in args.sizes]
+        finally:
+            await hass.async_stop(force=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "trail_points": args.trail_points,
+        "repeat": args.repeat,
+        "results": runs,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""Synthetic FlightRadar24 feed and clickhandler payloads for the benchmarks.
+
+Flights mimic the ``FlightRadar24.entities.flight.Flight`` attributes the
+coordinator reads, and details follow the clickhandler payload shape, so the
+integration's hot paths see realistic data without touching the network.
+"""
+import math
+import random
+import string
+import time
+
+EARTH_MEAN_RADIUS_KM = 6371.0088
+
+AIRLINES = (
+    ("British Airways", "BA", "BAW"),
+    ("easyJet", "U2", "EZY"),
+    ("Ryanair", "FR", "RYR"),
+    ("Lufthansa", "LH", "DLH"),
+    ("KLM", "KL", "KLM"),
+    ("Emirates", "EK", "UAE"),
+    ("Delta Air Lines", "DL", "DAL"),
+    ("Qatar Airways", "QR", "QTR"),
+)
+
+AIRCRAFT = (
+    ("A320", "Airbus A320-251N"),
+    ("A20N", "Airbus A320neo"),
+    ("B738", "Boeing 737-8AS"),
+    ("B77W", "Boeing 777-36N(ER)"),
+    ("A388", "Airbus A380-861"),
+    ("E190", "Embraer E190LR"),
+    ("EC35", "Airbus Helicopters H135"),
+)
+
+AIRPORTS = (
+    ("London Heathrow Airport", "LHR", "EGLL", 51.4706, -0.461941, "United Kingdom", "GBR", "London", "Europe/London"),
+    ("Amsterdam Schiphol Airport", "AMS", "EHAM", 52.3086, 4.76389, "Netherlands", "NLD", "Amsterdam", "Europe/Amsterdam"),
+    ("Frankfurt Airport", "FRA", "EDDF", 50.0264, 8.54313, "Germany", "DEU", "Frankfurt", "Europe/Berlin"),
+    ("Dubai International Airport", "DXB", "OMDB", 25.2528, 55.3644, "United Arab Emirates", "ARE", "Dubai", "Asia/Dubai"),
+    ("New York John F. Kennedy International Airport", "JFK", "KJFK", 40.6398, -73.7789, "United States", "USA", "New York", "America/New_York"),
+    ("Doha Hamad International Airport", "DOH", "OTHH", 25.2731, 51.6081, "Qatar", "QAT", "Doha", "Asia/Qatar"),
+    ("Dublin Airport", "DUB", "EIDW", 53.4213, -6.27007, "Ireland", "IRL", "Dublin", "Europe/Dublin"),
+)
+
+
+class SyntheticFlight:
+    """Stand-in for the FlightRadar24 ``Flight`` entity returned by ``get_flights``."""
+
+    __slots__ = (
+        "id", "icao_24bit", "latitude", "longitude", "heading", "altitude", "ground_speed", "squawk",
+        "aircraft_code", "registration", "time", "origin_airport_iata", "destination_airport_iata",
+        "number", "airline_iata", "on_ground", "vertical_speed", "callsign", "airline_icao",
+    )
+
+    def advance(self, seconds):
+        """Move the flight along its heading, as the live feed would between polls."""
+        distance_km = self.ground_speed * 1.852 / 3600 * seconds
+        self.latitude, self.longitude = _destination(self.latitude, self.longitude, self.heading, distance_km)
+        self.altitude = max(0, self.altitude + round(self.vertical_speed * seconds / 60))
+        self.time += int(seconds)
+
+
+def _destination(latitude, longitude, bearing, distance_km):
+    angular_distance = distance_km / EARTH_MEAN_RADIUS_KM
+    latitude_rad = math.radians(latitude)
+    bearing_rad = math.radians(bearing)
+    destination_latitude = math.asin(
+        math.sin(latitude_rad) * math.cos(angular_distance)
+        + math.cos(latitude_rad) * math.sin(angular_distance) * math.cos(bearing_rad)
+    )
+    destination_longitude = math.radians(longitude) + math.atan2(
+        math.sin(bearing_rad) * math.sin(angular_distance) * math.cos(latitude_rad),
+        math.cos(angular_distance) - math.sin(latitude_rad) * math.sin(destination_latitude),
+    )
+    return math.degrees(destination_latitude), (math.degrees(destination_longitude) + 540) % 360 - 180
+
+
+def generate_flights(count, latitude, longitude, radius_km, seed=0, now=None):
+    """Return ``count`` flights scattered uniformly over a disc of ``radius_km``."""
+    rng = random.Random(seed)
+    now = int(now or time.time())
+    flights = []
+    for index in range(count):
+        flight = SyntheticFlight()
+        airline_name, airline_iata, airline_icao = rng.choice(AIRLINES)
+        aircraft_code, _ = rng.choice(AIRCRAFT)
+        origin, destination = rng.sample(AIRPORTS, 2)
+        distance_km = radius_km * math.sqrt(rng.random())
+        flight.latitude, flight.longitude = _destination(latitude, longitude, rng.uniform(0, 360), distance_km)
+        flight.id = f"{0x30000000 + index:08x}"
+        flight.icao_24bit = f"{rng.getrandbits(24):06X}"
+        flight.heading = rng.randrange(360)
+        flight.altitude = rng.choice((0, rng.randrange(500, 8000), rng.randrange(20000, 41000)))
+        flight.ground_speed = rng.randrange(90, 520) if flight.altitude else rng.randrange(0, 30)
+        flight.vertical_speed = rng.choice((0, 0, rng.randrange(-2000, 2500)))
+        flight.squawk = f"{rng.randrange(8 ** 4):04o}"
+        flight.aircraft_code = aircraft_code
+        flight.registration = f"G-{''.join(rng.choices(string.ascii_uppercase, k=4))}"
+        flight.time = now - rng.randrange(0, 10)
+        flight.origin_airport_iata = origin[1]
+        flight.destination_airport_iata = destination[1]
+        flight.number = f"{airline_iata}{rng.randrange(1, 9999)}"
+        flight.airline_iata = airline_iata
+        flight.airline_icao = airline_icao
+        flight.on_ground = int(flight.altitude == 0)
+        flight.callsign = f"{airline_icao}{rng.randrange(1, 9999)}"
+        flights.append(flight)
+    return flights
+
+
+def generate_trail(flight, points, rng, now=None, step_seconds=30):
+    """Return ``points`` clickhandler trail points ending at the flight, newest first."""
+    now = int(now or flight.time)
+    trail = []
+    latitude, longitude, altitude = flight.latitude, flight.longitude, flight.altitude
+    for index in range(points):
+        trail.append({
+            "lat": round(latitude, 5),
+            "lng": round(longitude, 5),
+            "alt": altitude,
+            "spd": flight.ground_speed,
+            "ts": now - index * step_seconds,
+            "hd": flight.heading,
+        })
+        distance_km = flight.ground_speed * 1.852 / 3600 * step_seconds
+        latitude, longitude = _destination(latitude, longitude, (flight.heading + 180 + rng.uniform(-3, 3)) % 360, distance_km)
+        altitude = max(0, altitude - round(flight.vertical_speed * step_seconds / 60))
+    return trail
+
+
+def generate_details(flight, trail_points=100, seed=None):
+    """Return a clickhandler payload for ``flight`` with ``trail_points`` trail points."""
+    rng = random.Random(flight.id if seed is None else seed)
+    airline = next(airline for airline in AIRLINES if airline[2] == flight.airline_icao)
+    aircraft_text = next(text for code, text in AIRCRAFT if code == flight.aircraft_code)
+    origin = next(airport for airport in AIRPORTS if airport[1] == flight.origin_airport_iata)
+    destination = next(airport for airport in AIRPORTS if airport[1] == flight.destination_airport_iata)
+    departure = flight.time - rng.randrange(1800, 6 * 3600)
+    arrival = departure + rng.randrange(3600, 8 * 3600)
+
+    return {
+        "identification": {"id": flight.id, "number": {"default": flight.number}, "callsign": flight.callsign},
+        "status": {"live": True, "icon": rng.choice(("green", "yellow", "red")), "text": "Estimated"},
+        "aircraft": {
+            "model": {"code": flight.aircraft_code, "text": aircraft_text},
+            "hex": flight.icao_24bit.lower(),
+            "registration": flight.registration,
+            "images": {
+                size: [{"src": f"https://cdn.jetphotos.com/{size}/{flight.id}-{index}.jpg"} for index in range(3)]
+                for size in ("thumbnails", "medium", "large")
+            },
+        },
+        "airline": {"name": airline[0], "code": {"iata": airline[1], "icao": airline[2]}},
+        "airport": {"origin": _airport(origin), "destination": _airport(destination), "real": None},
+        "time": {
+            "scheduled": {"departure": departure, "arrival": arrival},
+            "real": {"departure": departure + rng.randrange(0, 1800), "arrival": None},
+            "estimated": {"departure": None, "arrival": arrival + rng.randrange(-900, 1800)},
+            "other": {"eta": arrival, "updated": flight.time},
+        },
+        "trail": generate_trail(flight, trail_points, rng),
+    }
+
+
+def _airport(airport):
+    name, iata, icao, latitude, longitude, country, country_code, city, timezone = airport
+    return {
+        "name": name,
+        "code": {"iata": iata, "icao": icao},
+        "position": {
+            "latitude": latitude,
+            "longitude": longitude,
+            "altitude": 80,
+            "country": {"name": country, "code": country_code, "codeLong": country_code},
+            "region": {"city": city},
+        },
+        "timezone": {"name": timezone, "offset": 0, "abbr": "UTC"},
+        "visible": True,
+    }
+
+
+class SyntheticTransport:
+    """Serves generated clickhandler payloads in place of ``FlightDetailTransport``."""
+
+    def __init__(self, flights, trail_points=100):
+        self._flights = {flight.id: flight for flight in flights}
+        self.trail_points = trail_points
+        self.request_count = 0
+
+    async def async_get_flight_details(self, flight_id):
+        self.request_count += 1
+        return generate_details(self._flights[flight_id], self.trail_points)
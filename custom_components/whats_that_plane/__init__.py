@@ -1,18 +1,56 @@
 import os
+import importlib
 import shutil
 import logging
 import asyncio
-import math
 import time
-import dpath.util
 from datetime import timedelta
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, CoreState, Event
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, CoreState, Event, callback
 from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from FlightRadar24 import FlightRadar24API
-from geopy.distance import geodesic
-from .const import DOMAIN
+from .aircraft import load_type_designators
+from .archive import FlightArchive, QUERY_FILTERS
+from .cache import FlightDetailCache
+from .const import (
+    DOMAIN,
+    DATA_ARCHIVE,
+    DATA_DETAIL_CACHE,
+    DATA_FEED_HUB,
+    DATA_FRONTEND,
+    DATA_LIMITER,
+    DATA_TRANSPORT,
+    DETAILS_REVISION,
+    DETAIL_REQUEST_RESERVE_TOKENS,
+    EVENT_FLIGHT_CLOSEST_APPROACH,
+    EVENT_FLIGHT_ENTERED,
+    EVENT_FLIGHT_EXITED,
+    FRONTEND_CARD_FILENAME,
+    FRONTEND_URL_BASE,
+    LEGACY_CARD_URL,
+    REQUEST_RATE_PER_MINUTE,
+)
+from .delta import diff_flight_payloads
+from .events import FlightPass
+from .extractor import FieldExtractor, set_path
+from .extrapolation import PositionFix, vertical_rate_fpm
+from .frontend import FrontendAssetView, FrontendBundle
+from .geometry import compute_flight_geometry, geodesic_km, load_numpy, sector_bounds, square_bounds
+from .hub import FlightFeedHub, create_flight_radar_api, fetch_flights, format_bounds, parse_bounds
+from .limiter import RequestLimiter, RequestThrottled
+from .replay import FeedRecorder, FeedReplay
+from .scheduler import next_poll_interval
+from .telemetry import CycleTelemetry
+from .trail import FlightTrail, merge_points
+from .transport import FlightDetailTransport
+from .websocket_api import async_register_websocket_commands
+from .zones import Zone, ZoneIndex
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = ["sensor"]
@@ -21,41 +59,34 @@ ORIGIN_LONGITUDE = 'airport/origin/position/longitude'
 DESTINATION_LATITUDE = 'airport/destination/position/latitude'
 DESTINATION_LONGITUDE = 'airport/destination/position/longitude'
 
-def setup_frontend_files(hass: HomeAssistant) -> None:
-    source_dir = os.path.join(os.path.dirname(__file__), 'www')
-    destination_dir = hass.config.path(f"www/community/{DOMAIN}")
-
-    if not os.path.exists(source_dir):
-        _LOGGER.error(f"www source directory not found at {source_dir}")
-        return
-
-    if not os.path.exists(destination_dir):
-        os.makedirs(destination_dir)
-        _LOGGER.info(f"Created www destination directory at {destination_dir}")
-
-    for filename in os.listdir(source_dir):
-        source_file = os.path.join(source_dir, filename)
-        destination_file = os.path.join(destination_dir, filename)
-
-        should_copy = False
-        if not os.path.exists(destination_file):
-            should_copy = True
-        else:
-            try:
-                source_time = os.path.getmtime(source_file)
-                destination_time = os.path.getmtime(destination_file)
-                if source_time > destination_time:
-                    should_copy = True
-            except OSError as e:
-                _LOGGER.warning(f"Could not compare file times for {filename}: {e}")
-                should_copy = True
-
-        if should_copy:
-            try:
-                shutil.copy2(source_file, destination_file)
-                _LOGGER.info(f"Copied/Updated {filename} in {destination_dir}")
-            except OSError as e:
-                _LOGGER.error(f"Failed to copy {filename}: {e}")
+QUERY_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional("entry_id"): cv.string,
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    **{vol.Optional(column): cv.string for column in QUERY_FILTERS},
+    vol.Optional("limit", default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+    vol.Optional("include_records", default=False): cv.boolean,
+})
+
+ROUTE_FIELDS = FieldExtractor("RouteFields", {
+    "origin_latitude": ORIGIN_LATITUDE,
+    "origin_longitude": ORIGIN_LONGITUDE,
+    "destination_latitude": DESTINATION_LATITUDE,
+    "destination_longitude": DESTINATION_LONGITUDE,
+})
+
+# Third-party modules that are slow to import, loaded lazily by the modules using them.
+LAZY_IMPORTS = ("FlightRadar24", "geopy.distance", "pycountry")
+
+def import_dependencies() -> None:
+    """Import the lazily loaded dependencies so their first use doesn't block the event loop."""
+    for module in LAZY_IMPORTS:
+        importlib.import_module(module)
+    load_numpy()
+    load_type_designators()
+
+def _is_card_resource(url):
+    return url.split("?")[0] in (f"{FRONTEND_URL_BASE}/{FRONTEND_CARD_FILENAME}", LEGACY_CARD_URL)
 
 async def register_lovelace_resource(hass, url):
     lovelace = hass.data.get("lovelace")
@@ -76,6 +107,19 @@ async def register_lovelace_resource(hass, url):
         _LOGGER.info(f"Lovelace resource '{url}' is already registered.")
         return
 
+    # Point an earlier version of the card, or the old copy under /local, at the new URL.
+    stale = next((res for res in resources.async_items() if _is_card_resource(res["url"])), None)
+    if stale is not None:
+        stale_url = stale["url"]
+        _LOGGER.info(f"Updating Lovelace resource {stale_url} to {url}")
+        try:
+            await resources.async_update_item(stale["id"], {"res_type": "module", "url": url})
+        except Exception as e:
+            _LOGGER.error(f"Failed to update Lovelace resource: {e}")
+        if stale_url == LEGACY_CARD_URL:
+            await hass.async_add_executor_job(remove_legacy_frontend_files, hass)
+        return
+
     _LOGGER.info(f"Registering Lovelace resource: {url}")
     try:
         await resources.async_create_item({
@@ -86,15 +130,49 @@ async def register_lovelace_resource(hass, url):
         _LOGGER.error(f"Failed to register Lovelace resource: {e}")
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    async_register_websocket_commands(hass)
+
+    frontend = await hass.async_add_executor_job(FrontendBundle.load)
+    hass.data.setdefault(DOMAIN, {})[DATA_FRONTEND] = frontend
+    try:
+        await hass.async_add_executor_job(frontend.prebuild)
+    except Exception as e:
+        _LOGGER.warning(f"Could not prebuild the compressed frontend files, they will be compressed on first request: {e}")
+    hass.http.register_view(FrontendAssetView(hass, frontend))
+
+    async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+        archive = hass.data.get(DOMAIN, {}).get(DATA_ARCHIVE)
+        if archive is None:
+            raise HomeAssistantError("No What's that plane?! entry has archive_historic_flights enabled")
+
+        start = call.data.get("start")
+        end = call.data.get("end")
+        flights = await archive.async_query(
+            entry_id=call.data.get("entry_id"),
+            start=dt_util.as_utc(start).timestamp() if start else None,
+            end=dt_util.as_utc(end).timestamp() if end else None,
+            limit=call.data["limit"],
+            include_records=call.data["include_records"],
+            **{column: call.data.get(column) for column in QUERY_FILTERS},
+        )
+        for flight in flights:
+            flight["last_seen"] = dt_util.utc_from_timestamp(flight["last_seen"]).isoformat()
+        return {"flights": flights}
+
+    hass.services.async_register(
+        DOMAIN,
+        "query_history",
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    await hass.async_add_executor_job(setup_frontend_files, hass)
-
     async def _register_resource(event: Event | None = None) -> None:
         await register_lovelace_resource(
-            hass, f"/local/community/{DOMAIN}/whats-that-plane-map.js"
+            hass, hass.data[DOMAIN][DATA_FRONTEND].url(FRONTEND_CARD_FILENAME)
         )
 
         hass.data.pop("whats_that_plane_listener", None)
@@ -108,10 +186,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
+    if DATA_DETAIL_CACHE not in hass.data[DOMAIN]:
+        detail_cache = FlightDetailCache(hass)
+        await detail_cache.async_load()
+        hass.data[DOMAIN][DATA_DETAIL_CACHE] = detail_cache
+
+    if DATA_LIMITER not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_LIMITER] = RequestLimiter()
+
+    if DATA_FEED_HUB not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_FEED_HUB] = FlightFeedHub(hass, hass.data[DOMAIN][DATA_LIMITER])
+
+    if DATA_TRANSPORT not in hass.data[DOMAIN]:
+        transport = FlightDetailTransport(hass, hass.data[DOMAIN][DATA_LIMITER])
+        await transport.async_load()
+        hass.data[DOMAIN][DATA_TRANSPORT] = transport
+
+    if {**entry.data, **entry.options}.get("archive_historic_flights", False) and DATA_ARCHIVE not in hass.data[DOMAIN]:
+        archive = FlightArchive(hass)
+        await archive.async_setup()
+        hass.data[DOMAIN][DATA_ARCHIVE] = archive
+
     coordinator = WhatsThatPlaneCoordinator(hass, entry=entry)
-    await coordinator.async_config_entry_first_refresh()
+    # The entry's device carries the flight device triggers.
+    coordinator.device_id = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        entry_type=dr.DeviceEntryType.SERVICE,
+    ).id
+    await coordinator.async_restore_historic_flights()
+    coordinator.async_start_extrapolation()
+    # The entry comes up straight away with no flights; the first poll runs in the background.
+    entry.async_create_background_task(
+        hass, coordinator.async_first_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+    )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    update_request_rate(hass)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(update_listener))
     return True
@@ -120,40 +232,64 @@ async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    if len(hass.config_entries.async_entries(DOMAIN)) == 1:
+    last_entry = len(hass.config_entries.async_entries(DOMAIN)) == 1
+    if last_entry:
         _LOGGER.info("Last entry for What's that plane?! being removed, cleaning up resources.")
-        await async_remove_lovelace_resource(hass, f"/local/community/{DOMAIN}/whats-that-plane-map.js")
-        await hass.async_add_executor_job(remove_frontend_files, hass)
-
+        await async_remove_lovelace_resource(hass)
+        await hass.async_add_executor_job(remove_legacy_frontend_files, hass)
 
     if listener := hass.data.pop("whats_that_plane_listener", None):
         listener()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        update_request_rate(hass)
+
+    if last_entry:
+        # Shared resources are released after the coordinator has flushed its last flights into them.
+        if detail_cache := hass.data[DOMAIN].pop(DATA_DETAIL_CACHE, None):
+            await detail_cache.async_save()
+        hass.data[DOMAIN].pop(DATA_FEED_HUB, None)
+        hass.data[DOMAIN].pop(DATA_LIMITER, None)
+        if transport := hass.data[DOMAIN].pop(DATA_TRANSPORT, None):
+            await transport.async_close()
+        if archive := hass.data[DOMAIN].pop(DATA_ARCHIVE, None):
+            await archive.async_close()
     return unload_ok
 
-def remove_frontend_files(hass: HomeAssistant) -> None:
+def update_request_rate(hass: HomeAssistant) -> None:
+    """Budget the shared request limiter for the loaded entry asking for the highest rate."""
+    limiter = hass.data[DOMAIN].get(DATA_LIMITER)
+    coordinators = [value for value in hass.data[DOMAIN].values() if isinstance(value, WhatsThatPlaneCoordinator)]
+    if limiter is None or not coordinators:
+        return
+    limiter.set_rate(max(coordinator.config.get("request_rate_per_minute", REQUEST_RATE_PER_MINUTE) for coordinator in coordinators))
+    for coordinator in coordinators:
+        coordinator.check_poll_budget()
+
+def remove_legacy_frontend_files(hass: HomeAssistant) -> None:
+    """Remove the copy of the www files made by earlier versions of the integration."""
     destination_dir = hass.config.path(f"www/community/{DOMAIN}")
     if os.path.exists(destination_dir):
         shutil.rmtree(destination_dir)
         _LOGGER.info(f"Removed www directory at {destination_dir}")
 
-async def async_remove_lovelace_resource(hass: HomeAssistant, url: str):
+async def async_remove_lovelace_resource(hass: HomeAssistant):
     lovelace = hass.data.get("lovelace")
     if lovelace and hasattr(lovelace, "resources"):
         resources = lovelace.resources
-        resource_to_remove = next((res for res in resources.async_items() if res["url"] == url), None)
+        resource_to_remove = next((res for res in resources.async_items() if _is_card_resource(res["url"])), None)
         
         if resource_to_remove:
             try:
                 await resources.async_delete_item(resource_to_remove["id"])
-                _LOGGER.info(f"Removed Lovelace resource: {url}")
+                _LOGGER.info(f"Removed Lovelace resource: {resource_to_remove['url']}")
             except Exception as e:
                 _LOGGER.error(f"Failed to remove Lovelace resource: {e}")
         else:
-            _LOGGER.warning(f"Could not find Lovelace resource to remove: {url}")
+            _LOGGER.warning("Could not find the map card's Lovelace resource to remove")
 
 class WhatsThatPlaneCoordinator(DataUpdateCoordinator):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry | None = None, config: dict | None = None):
@@ -167,10 +303,40 @@ class WhatsThatPlaneCoordinator(DataUpdateCoordinator):
             raise ValueError("Coordinator must be initialized with either an entry or a config dict.")
 
         update_seconds = self._config.get("update_interval", 60)
-        self.fr_api = FlightRadar24API()
-        self.scraper = None                           
+        self.feed_hub = hass.data.get(DOMAIN, {}).get(DATA_FEED_HUB)
+        self.fr_api = None
+        self.replay = None
+        if replay_file := self._config.get("replay_file"):
+            # Replays stand in for both the feed and the detail transport, bypassing anything shared.
+            self.replay = FeedReplay(hass, hass.config.path(replay_file), self._config.get("replay_speed", 1.0))
+            self.feed_hub = None
+            self.fr_api = self.replay
+        elif self.feed_hub is None:
+            self.fr_api = create_flight_radar_api()
+        self.recorder = FeedRecorder(hass, hass.config.path(record_file)) if (record_file := self._config.get("record_file")) else None
+        self.limiter = hass.data.get(DOMAIN, {}).get(DATA_LIMITER) or RequestLimiter()
+        self.transport = hass.data.get(DOMAIN, {}).get(DATA_TRANSPORT) or FlightDetailTransport(hass, self.limiter)
+        if self.replay is not None:
+            self.transport = self.replay
         self.tracked_flights = {}
         self.historic_flights = []
+        self.dependencies_loaded = False
+        self._flight_payload = None
+        self._build_flight_payload = None
+        self._payload_listeners = []
+        self._position_listeners = []
+        self._detail_tasks = {}
+        self._pending_details = set()
+        self.telemetry = CycleTelemetry()
+        self._position_fixes = {}
+        self._unsub_extrapolation = None
+        self.device_id = None
+        self._passes = {}
+        self._pending_events = []
+        self.zone_index = ZoneIndex(Zone.from_config(zone, self._config) for zone in self._config.get("zones") or [])
+        self._bounds = self._compute_bounds()
+        self.detail_cache = hass.data.get(DOMAIN, {}).get(DATA_DETAIL_CACHE) if self.replay is None else None
+        self.archive = hass.data.get(DOMAIN, {}).get(DATA_ARCHIVE) if self._config.get("archive_historic_flights", False) else None
 
         super().__init__(
             hass,
@@ -179,178 +345,585 @@ class WhatsThatPlaneCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_seconds),
         )
 
-    def _get_flight_details_scraper(self, flight_id: str) -> dict:
-        import cloudscraper
-        if self.scraper is None:
-            self.scraper = cloudscraper.create_scraper()
-            self.scraper.get("https://www.flightradar24.com/")
-        
-        url = f"https://data-live.flightradar24.com/clickhandler/?flight={flight_id}"
-        response = self.scraper.get(url, timeout=10)
-        if response.status_code == 403:
-            self.scraper.get("https://www.flightradar24.com/")
-            response = self.scraper.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-
     @property
     def config(self):
         return self._config
 
-    def _calculate_bearing(self, your_latitude, your_longitude, flight_latitude, flight_longitude):
-        delta_longitude = math.radians(flight_longitude - your_longitude)
-        your_latitude = math.radians(your_latitude)
-        flight_latitude = math.radians(flight_latitude)
-        y = math.sin(delta_longitude) * math.cos(flight_latitude)
-        x = math.cos(your_latitude) * math.sin(flight_latitude) - math.sin(your_latitude) * math.cos(flight_latitude) * math.cos(delta_longitude)
-        initial_bearing = math.atan2(y, x)
-        return (math.degrees(initial_bearing) + 360) % 360
-
-    def _is_within_fov(self, bearing, direction, fov):
-        if fov >= 360:
-            return True
-        half_fov = fov / 2
-        lower_bound = (direction - half_fov) % 360
-        upper_bound = (direction + half_fov) % 360
-        return lower_bound <= bearing <= upper_bound if lower_bound < upper_bound else bearing >= lower_bound or bearing <= upper_bound
+    def _compute_bounds(self):
+        """Compute the feed bounds once per config; options changes reload the entry.
+
+        The bounds cover the entry's own radius and FOV plus every observation zone.
+        """
+        config = self._config
+        if config.get("fov_sector_bounds", False) and config["fov_cone"] < 360:
+            bounds = format_bounds(*sector_bounds(
+                config["latitude"], config["longitude"], config["radius_km"],
+                config["facing_direction"], config["fov_cone"],
+            ))
+        else:
+            bounds = format_bounds(*square_bounds(config["latitude"], config["longitude"], config["radius_km"]))
+
+        if not self.zone_index:
+            return bounds
+        north, south, west, east = parse_bounds(bounds)
+        zone_north, zone_south, zone_west, zone_east = self.zone_index.bounds
+        return format_bounds(max(north, zone_north), min(south, zone_south), min(west, zone_west), max(east, zone_east))
+
+    def _merge_flight_details(self, flight_details, details):
+        """Merge scraped clickhandler details into a live flight record in place.
+
+        Live fields written by the update loop win over the scraped payload. The
+        scraped trail and the points already recorded locally are merged by
+        timestamp, since details fetched late or served from the cache can be
+        as new as the local points or newer.
+        """
+        live_data = dict(flight_details)
+        live_trail = live_data.pop('trail', None) or []
+        live_identification = live_data.pop('identification', {})
+
+        flight_details.clear()
+        flight_details.update(details)
+        flight_details.update(live_data)
+        flight_details['trail'] = self._new_trail(merge_points(live_trail, details.get('trail') or []))
+
+        for key, value in live_identification.items():
+            set_path(flight_details, f'identification/{key}', value)
+        flight_details[DETAILS_REVISION] = live_data.get(DETAILS_REVISION, 0) + 1
+
+    def _new_trail(self, points=()):
+        return FlightTrail.from_points(
+            points,
+            self._config.get("trail_max_points", 1000),
+            self._config.get("trail_simplify_tolerance_m", 0),
+        )
+
+    async def _async_fetch_flight_details(self, flight_id, flight_details, request_timeout):
+        try:
+            details = await asyncio.wait_for(
+                self.transport.async_get_flight_details(flight_id),
+                timeout=request_timeout,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning(f"Timed out fetching details for {flight_id} after {request_timeout}s")
+            return False
+        except RequestThrottled as e:
+            _LOGGER.debug(f"Deferring details for {flight_id}: {e}")
+            self._pending_details.add(flight_id)
+            self._count("throttled")
+            return False
+        except Exception as e:
+            _LOGGER.warning(f"Could not fetch details for {flight_id}: {e}")
+            return False
+
+        if details:
+            if self.detail_cache is not None:
+                self.detail_cache.set(flight_id, details)
+            if self.recorder is not None:
+                self.recorder.record_details(flight_id, details)
+            self._merge_flight_details(flight_details, details)
+        return True
+
+    async def _async_fetch_new_flight_details(self, new_flights, distances):
+        """Fetch details for newly visible flights concurrently, nearest first.
+
+        Flights already held in the shared detail cache are filled in directly
+        without a request. The rest are queued by ``distances`` and started while
+        the request limiter has tokens to spare; flights it can't cover yet, or
+        whose request was throttled, stay queued for later cycles while they
+        remain visible.
+
+        Requests are capped by ``detail_fetch_max_concurrency`` and each one by
+        ``detail_fetch_timeout_seconds``. Once ``detail_fetch_cycle_timeout_seconds``
+        has elapsed the cycle returns with whatever has landed; the remaining
+        requests keep running and notify listeners as they complete.
+        """
+        self._pending_details.update(new_flights)
+        self._pending_details.intersection_update(distances)
+        if not self._pending_details:
+            return
+
+        max_concurrency = max(1, self._config.get("detail_fetch_max_concurrency", 4))
+        request_timeout = self._config.get("detail_fetch_timeout_seconds", 10)
+        cycle_timeout = self._config.get("detail_fetch_cycle_timeout_seconds", 5)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(flight_id, flight_details):
+            async with semaphore:
+                return await self._async_fetch_flight_details(flight_id, flight_details, request_timeout)
+
+        tasks = {}
+        for flight_id in sorted(self._pending_details, key=distances.get):
+            if flight_id in self._detail_tasks:
+                continue
+            flight_details = self.tracked_flights[flight_id]["data"]
+            if self.detail_cache is not None and (cached_details := self.detail_cache.get(flight_id)):
+                _LOGGER.debug(f"Using cached details for {flight_id}")
+                self._count("cache_hits")
+                if self.recorder is not None:
+                    self.recorder.record_details(flight_id, cached_details)
+                self._merge_flight_details(flight_details, cached_details)
+                self._pending_details.discard(flight_id)
+                continue
+            if self.detail_cache is not None and flight_id in new_flights:
+                # Deferred flights are looked up again every cycle; count their miss once.
+                self._count("cache_misses")
+            if not self.limiter.try_acquire(DETAIL_REQUEST_RESERVE_TOKENS):
+                continue
+            self._count("detail_requests")
+            self._pending_details.discard(flight_id)
+            task = self.hass.async_create_background_task(
+                _fetch(flight_id, flight_details), f"{DOMAIN} details {flight_id}"
+            )
+            self._detail_tasks[flight_id] = task
+            task.add_done_callback(lambda _task, flight_id=flight_id: self._detail_tasks.pop(flight_id, None))
+            tasks[task] = flight_id
+
+        if self._pending_details:
+            _LOGGER.debug(f"Deferred details for {len(self._pending_details)} flight(s) until the request budget allows")
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=cycle_timeout)
+
+        if pending:
+            _LOGGER.debug(f"{len(pending)} detail request(s) still in flight after {cycle_timeout}s, publishing partial data")
+            for task in pending:
+                task.add_done_callback(self._handle_late_flight_details)
+
+    def _count(self, name, value=1) -> None:
+        # Detail requests can outlive their update and are counted against the latest one.
+        if (cycle := self.telemetry.current or self.telemetry.last) is not None:
+            cycle.count(name, value)
+
+    def _handle_late_flight_details(self, task):
+        if task.cancelled() or task.exception() is not None or not task.result():
+            return
+        self.async_update_listeners()
+
+    @callback
+    def async_start_extrapolation(self) -> None:
+        """Move tracked flights along their last heading and speed between feed polls."""
+        interval = self._config.get("extrapolation_interval_seconds", 0)
+        if interval <= 0 or self._unsub_extrapolation is not None:
+            return
+        self._unsub_extrapolation = async_track_time_interval(
+            self.hass, self._async_extrapolate_positions, timedelta(seconds=interval)
+        )
+
+    @callback
+    def _async_extrapolate_positions(self, _now=None) -> None:
+        """Move tracked flights to their projected positions and push only those positions.
+
+        Nothing is reformatted: position listeners patch the sensor's flight
+        attributes and payload subscribers get a delta of just the moved fields.
+        """
+        if not self._position_fixes:
+            return
+        now = self._now()
+        max_seconds = self._config.get("extrapolation_max_seconds", 60)
+        positions = {}
+        for flight_id, fix in self._position_fixes.items():
+            flight_info = self.tracked_flights.get(flight_id)
+            if flight_info is None:
+                continue
+            latitude, longitude, altitude = fix.project(now, max_seconds)
+            position = {"latitude": latitude, "longitude": longitude, "altitude": self._display_altitude(altitude)}
+            flight_info["data"].update(position)
+            positions[flight_id] = position
+        if not positions:
+            return
+
+        for listener in list(self._position_listeners):
+            listener(positions)
+        self._async_patch_flight_payload(positions)
+
+    @callback
+    def _async_patch_flight_payload(self, positions) -> None:
+        """Move flights in the built flight payload and send the moved fields to payload listeners."""
+        payload = self._flight_payload
+        if payload is None:
+            # Built on demand from the sensor's already patched records.
+            return
+        flights = []
+        changed = []
+        for record in payload["flights"]:
+            position = positions.get(record.get("flight_id"))
+            if position is not None:
+                fields = {key: value for key, value in position.items() if record.get(key) != value}
+                if fields:
+                    record = {**record, **fields}
+                    changed.append({"flight_id": record["flight_id"], "fields": fields})
+            flights.append(record)
+        if not changed:
+            return
+        self._flight_payload = {**payload, "flights": flights}
+        for listener in list(self._payload_listeners):
+            listener({"changed": changed})
+
+    def _display_altitude(self, altitude):
+        if altitude is None:
+            return 0
+        if self._config.get("altitude_units", "imperial (feet (ft))").startswith('metric'):
+            return round(altitude * 0.3048)
+        return altitude
+
+    @callback
+    def async_update_listeners(self) -> None:
+        super().async_update_listeners()
+        # Fire flight events once the sensor has written the update they belong to.
+        events, self._pending_events = self._pending_events, []
+        for event_type, data in events:
+            self.hass.bus.async_fire(event_type, {
+                "device_id": self.device_id,
+                "entry_id": self.config_entry.entry_id if self.config_entry else None,
+                **data,
+            })
+
+    @property
+    def flight_payload(self):
+        """The sensor's formatted flights with full trails, built on first use after each update."""
+        if self._flight_payload is None and self._build_flight_payload is not None:
+            self._flight_payload = self._build_flight_payload()
+        return self._flight_payload
+
+    @callback
+    def async_set_flight_payload(self, build_payload) -> None:
+        """Store how to build the sensor's flight payload and send what changed to payload listeners.
+
+        The payload is only built when a websocket client asks for it or a
+        payload listener is subscribed, so full trails cost nothing otherwise.
+        """
+        previous = self._flight_payload
+        self._flight_payload = None
+        self._build_flight_payload = build_payload
+        if not self._payload_listeners:
+            return
+        delta = diff_flight_payloads(previous, self.flight_payload)
+        if delta is None:
+            return
+        for listener in list(self._payload_listeners):
+            listener(delta)
+
+    @callback
+    def async_add_position_listener(self, listener):
+        """Call ``listener`` with ``{flight_id: {"latitude", "longitude", "altitude"}}`` after each extrapolation."""
+        self._position_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._position_listeners:
+                self._position_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_add_payload_listener(self, listener):
+        """Call ``listener`` with every payload delta, and with ``None`` when the coordinator shuts down."""
+        self._payload_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._payload_listeners:
+                self._payload_listeners.remove(listener)
+
+        return remove_listener
+
+    async def async_shutdown(self) -> None:
+        for listener in list(self._payload_listeners):
+            listener(None)
+        self._payload_listeners.clear()
+        self._position_listeners.clear()
+        if self._unsub_extrapolation is not None:
+            self._unsub_extrapolation()
+            self._unsub_extrapolation = None
+        for task in list(self._detail_tasks.values()):
+            task.cancel()
+        self._detail_tasks.clear()
+        self._passes.clear()
+        self._pending_events.clear()
+        if self.feed_hub is not None:
+            self.feed_hub.unregister(self._feed_key)
+        if self.archive is not None:
+            await self.archive.async_flush()
+        if self.recorder is not None:
+            await self.recorder.async_flush()
+        await super().async_shutdown()
+
+    async def async_load_dependencies(self) -> None:
+        """Import the lazy dependencies off the event loop, if that hasn't happened yet."""
+        if self.dependencies_loaded:
+            return
+        await self.hass.async_add_import_executor_job(import_dependencies)
+        self.dependencies_loaded = True
+
+    async def async_first_refresh(self) -> None:
+        """Load the lazy dependencies, then run the first update.
+
+        Flights restored from the archive are formatted as soon as the
+        dependencies are loaded, without waiting for the first poll.
+        """
+        await self.async_load_dependencies()
+        if self.historic_flights:
+            self.async_update_listeners()
+        await self.async_refresh()
+
+    async def async_restore_historic_flights(self) -> None:
+        """Load the most recent archived flights back into ``historic_flights``."""
+        if self.archive is None:
+            return
+        historic_max_count = self._config.get("historic_flights_max_count", 0)
+        self.historic_flights = await self.archive.async_recent(self._feed_key, historic_max_count)
+        _LOGGER.debug(f"Restored {len(self.historic_flights)} historic flight(s) from the archive")
+
+    def _now(self):
+        """The current time, or the recording's time while replaying one."""
+        if self.replay is not None and (replay_time := self.replay.replay_time) is not None:
+            return replay_time
+        return time.time()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Refresh when the next recorded poll is due while replaying, otherwise every ``update_interval``."""
+        if self.replay is None or (delay := self.replay.seconds_until_next_poll()) is None:
+            super()._schedule_refresh()
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+        self._unsub_refresh = async_call_later(self.hass, delay, self._handle_refresh_interval)
+
+    @property
+    def _feed_key(self):
+        return self.config_entry.entry_id if self.config_entry else id(self)
+
+    def check_poll_budget(self) -> None:
+        """Warn when the configured polling needs more requests than the limiter leaves for polls."""
+        if self.replay is not None:
+            return
+        fastest_interval = self._config.get("update_interval", 10)
+        if self._config.get("adaptive_polling", False):
+            fastest_interval = min(fastest_interval, self._config.get("adaptive_polling_min_interval", 2))
+        polls_per_minute = 60 / fastest_interval
+        if polls_per_minute > self.limiter.poll_rate_per_minute:
+            _LOGGER.warning(
+                f"Polling every {fastest_interval}s needs {polls_per_minute:.0f} requests per minute, but only "
+                f"{self.limiter.poll_rate_per_minute:.0f} of the {self.limiter.rate_per_minute:.0f} allowed by "
+                f"request_rate_per_minute are left for polls; polls will be spaced out to fit"
+            )
+
+    async def _async_get_all_flights(self, bounds):
+        if self.feed_hub is not None:
+            return await self.feed_hub.async_get_flights(
+                self._feed_key, bounds, self.update_interval.total_seconds()
+            )
+        if self.replay is not None:
+            return await self.hass.async_add_executor_job(fetch_flights, self.fr_api, bounds)
+
+        await self.limiter.async_acquire()
+        try:
+            flights = await self.hass.async_add_executor_job(fetch_flights, self.fr_api, bounds)
+        except RequestThrottled:
+            self.limiter.throttled()
+            raise
+        self.limiter.succeeded()
+        return flights
 
     async def _async_update_data(self):
+        # A scheduled refresh can come round before the first one has loaded them.
+        await self.async_load_dependencies()
+        cycle = self.telemetry.start_cycle()
         try:
             config = self.config
             your_latitude = config["latitude"]
             your_longitude = config["longitude"]
-            radius_km = config["radius_km"] * 1000
             minimum_altitude = config.get("filter_flight_altitude_ft_minimum", 0)
             maximum_altitude = config.get("filter_flight_altitude_ft_maximum", 60000)
             hold_seconds = config.get("hold_flight_data_seconds", 0)
             distance_units = config.get("distance_units", "imperial (miles (mi))")
-            altitude_units = config.get("altitude_units", "imperial (feet (ft))")
             speed_units = config.get("speed_units", "imperial (miles per hour (mph))")
 
-
-            bounds = await self.hass.async_add_executor_job(
-                self.fr_api.get_bounds_by_point, your_latitude, your_longitude, radius_km
-            )
-            all_flights = await self.hass.async_add_executor_job(
-                self.fr_api.get_flights, None, bounds
-            )
+            try:
+                all_flights = await self._async_get_all_flights(self._bounds)
+            except RequestThrottled as e:
+                _LOGGER.warning(f"Skipping feed poll, keeping the last known flights: {e}")
+                cycle.lap("feed")
+                cycle.count("throttled")
+                return list(self.tracked_flights.values())
+            # Positions are projected from when they were received: the feed's own
+            # timestamps can be stale.
+            polled_at = self._now()
+            if self.recorder is not None:
+                self.recorder.record_flights(self._bounds, all_flights)
+            cycle.lap("feed")
 
             all_flights_map = {flight.id: flight for flight in all_flights if flight.id}
             currently_visible_ids = set()
+            new_flights = {}
+            distances = {}
+
+            positioned_flights = [
+                flight for flight in all_flights_map.values()
+                if flight.latitude is not None and flight.longitude is not None
+            ]
+            geometry = compute_flight_geometry(
+                your_latitude,
+                your_longitude,
+                [flight.latitude for flight in positioned_flights],
+                [flight.longitude for flight in positioned_flights],
+                [flight.altitude for flight in positioned_flights],
+                config["radius_km"],
+                minimum_altitude,
+                maximum_altitude,
+                config["facing_direction"],
+                config["fov_cone"],
+            )
+            zone_hits = self.zone_index.evaluate(positioned_flights)
+            cycle.lap("geometry")
 
-            for flight_id, flight in all_flights_map.items():
-                if flight.latitude is None or flight.longitude is None:
-                    continue
-
-                flight_distance_km = geodesic((your_latitude, your_longitude), (flight.latitude, flight.longitude)).km
-                if flight_distance_km > config["radius_km"]:
-                    continue
-
-                flight_altitude_for_filter = flight.altitude if flight.altitude is not None else 0
-                if not (minimum_altitude <= flight_altitude_for_filter <= maximum_altitude):
+            for flight, is_visible, distance_km, bearing in zip(positioned_flights, geometry.visible, geometry.distances_km, geometry.bearings):
+                zones = zone_hits.get(flight.id)
+                if not is_visible and not zones:
                     continue
 
-                flight_bearing = self._calculate_bearing(your_latitude, your_longitude, flight.latitude, flight.longitude)
-
-                if self._is_within_fov(flight_bearing, config["facing_direction"], config["fov_cone"]):
-                    currently_visible_ids.add(flight_id)
-
-                    if flight_id not in self.tracked_flights:
-                        _LOGGER.debug(f"New flight in FOV: {flight_id}")
-                        try:
-                            flight_details = await self.hass.async_add_executor_job(self._get_flight_details_scraper, flight.id)
-                        except Exception as e:
-                            _LOGGER.warning(f"Could not fetch details for {flight_id}: {e}")
-                            flight_details = {}
-                        self.tracked_flights[flight_id] = {"data": flight_details}
+                flight_id = flight.id
+                currently_visible_ids.add(flight_id)
+                distances[flight_id] = distance_km
+
+                flight_pass = self._passes.get(flight_id)
+                if flight_pass is None:
+                    flight_pass = FlightPass(flight_id, flight.callsign, flight.aircraft_code, distance_km, bearing)
+                    self._passes[flight_id] = flight_pass
+                    self._pending_events.append((EVENT_FLIGHT_ENTERED, flight_pass.event_data()))
+                elif flight_pass.update(flight.callsign, flight.aircraft_code, distance_km, bearing):
+                    self._pending_events.append((EVENT_FLIGHT_CLOSEST_APPROACH, flight_pass.event_data(closest=True)))
+
+                if flight_id not in self.tracked_flights:
+                    _LOGGER.debug(f"New flight in FOV: {flight_id}")
+                    flight_details = {}
+                    new_flights[flight_id] = flight_details
+                    self.tracked_flights[flight_id] = {"data": flight_details}
+                else:
+                    flight_details = self.tracked_flights[flight_id]["data"]
+
+                flight_details['latitude'] = flight.latitude
+                flight_details['longitude'] = flight.longitude
+
+                flight_details['altitude'] = self._display_altitude(flight.altitude)
+
+                flight_details['heading'] = flight.heading
+
+                if flight.ground_speed is not None:
+                    flight_details['ground_speed_kts'] = flight.ground_speed
+                    if speed_units.startswith('metric'):
+                        flight_details['ground_speed'] = round(flight.ground_speed * 1.852)
                     else:
-                        flight_details = self.tracked_flights[flight_id]["data"]
+                        flight_details['ground_speed'] = round(flight.ground_speed * 1.15078)
+                else:
+                    flight_details['ground_speed_kts'] = 0
+                    flight_details['ground_speed'] = 0
+                    
+                flight_details['callsign'] = flight.callsign
+                flight_details['zones'] = zones or []
+
+                if not isinstance(flight_details.get('trail'), FlightTrail):
+                    flight_details['trail'] = self._new_trail(flight_details.get('trail') or [])
+
+                trail = flight_details['trail']
+                latest_point = trail.latest()
+                if not latest_point or (latest_point['lat'] != flight.latitude and latest_point['lng'] != flight.longitude):
+                    trail.append(flight.latitude, flight.longitude, flight.altitude, flight.ground_speed, flight.heading, int(polled_at))
+
+                self._position_fixes[flight_id] = PositionFix(
+                    flight.latitude, flight.longitude, flight.altitude, flight.heading,
+                    flight.ground_speed, vertical_rate_fpm(trail), polled_at,
+                )
+
+                set_path(flight_details, 'identification/id', flight.id)
+                set_path(flight_details, 'identification/callsign', flight.callsign)
+                
+                route = ROUTE_FIELDS.extract(flight_details)
+                origin_position = (route.origin_latitude, route.origin_longitude)
+                destination_position = (route.destination_latitude, route.destination_longitude)
+                current_position = (flight.latitude, flight.longitude)
+                
+                total_distance, distance_traveled, progress_percent = 0, 0, 0
+
+                if all(position is not None for position in origin_position) and all(position is not None for position in destination_position) and all(position is not None for position in current_position):
+                    total_dist_val_km = geodesic_km(origin_position, destination_position)
+                    distance_traveled_val_km = geodesic_km(origin_position, current_position)
+                    
+                    if distance_units.startswith('imperial'):
+                        total_distance = round(total_dist_val_km * 0.621371)
+                        distance_traveled = round(distance_traveled_val_km * 0.621371)
+                    else:
+                        total_distance = round(total_dist_val_km)
+                        distance_traveled = round(distance_traveled_val_km)
 
-                    flight_details['latitude'] = flight.latitude
-                    flight_details['longitude'] = flight.longitude
+                    if total_distance > 0:
+                        progress_percent = min(round((distance_traveled / total_distance) * 100), 100)
+                
+                flight_details['total_distance'] = total_distance
+                flight_details['distance_traveled'] = distance_traveled
+                flight_details['progress_percent'] = progress_percent
+                
+                self.tracked_flights[flight_id]["last_seen"] = polled_at
 
-                    if flight.altitude is not None:
-                        if altitude_units.startswith('metric'):
-                            flight_details['altitude'] = round(flight.altitude * 0.3048)
-                        else:
-                            flight_details['altitude'] = flight.altitude
-                    else:
-                        flight_details['altitude'] = 0
+            cycle.lap("tracking")
 
-                    flight_details['heading'] = flight.heading
+            await self._async_fetch_new_flight_details(new_flights, distances)
+            cycle.lap("details")
 
-                    if flight.ground_speed is not None:
-                        flight_details['ground_speed_kts'] = flight.ground_speed
-                        if speed_units.startswith('metric'):
-                            flight_details['ground_speed'] = round(flight.ground_speed * 1.852)
-                        else:
-                            flight_details['ground_speed'] = round(flight.ground_speed * 1.15078)
-                    else:
-                        flight_details['ground_speed_kts'] = 0
-                        flight_details['ground_speed'] = 0
-                        
-                    flight_details['callsign'] = flight.callsign
-
-                    if 'trail' not in flight_details:
-                        flight_details['trail'] = []
-
-                    latest_point = {
-                        "lat": flight.latitude,
-                        "lng": flight.longitude,
-                        "alt": flight.altitude,
-                        "spd": flight.ground_speed,
-                        "hd": flight.heading,
-                        "ts": int(time.time())
-                    }
-                    if not flight_details['trail'] or (flight_details['trail'][0]['lat'] != latest_point['lat'] and flight_details['trail'][0]['lng'] != latest_point['lng']):
-                        flight_details['trail'].insert(0, latest_point)
-
-                    dpath.util.new(flight_details, 'identification/id', flight.id)
-                    dpath.util.new(flight_details, 'identification/callsign', flight.callsign)
-                    
-                    origin_position = (dpath.util.get(flight_details, ORIGIN_LATITUDE, default=None), dpath.util.get(flight_details, ORIGIN_LONGITUDE, default=None))
-                    destination_position = (dpath.util.get(flight_details, DESTINATION_LATITUDE, default=None), dpath.util.get(flight_details, DESTINATION_LONGITUDE, default=None))
-                    current_position = (flight.latitude, flight.longitude)
-                    
-                    total_distance, distance_traveled, progress_percent = 0, 0, 0
-
-                    if all(position is not None for position in origin_position) and all(position is not None for position in destination_position) and all(position is not None for position in current_position):
-                        total_dist_val_km = geodesic(origin_position, destination_position).km
-                        distance_traveled_val_km = geodesic(origin_position, current_position).km
-                        
-                        if distance_units.startswith('imperial'):
-                            total_distance = round(total_dist_val_km * 0.621371)
-                            distance_traveled = round(distance_traveled_val_km * 0.621371)
-                        else:
-                            total_distance = round(total_dist_val_km)
-                            distance_traveled = round(distance_traveled_val_km)
-
-                        if total_distance > 0:
-                            progress_percent = min(round((distance_traveled / total_distance) * 100), 100)
-                    
-                    flight_details['total_distance'] = total_distance
-                    flight_details['distance_traveled'] = distance_traveled
-                    flight_details['progress_percent'] = progress_percent
-                    
-                    self.tracked_flights[flight_id]["last_seen"] = time.time()
+            # A pass ends as soon as the flight leaves the view, however long its data is held.
+            for flight_id in [flight_id for flight_id in self._passes if flight_id not in currently_visible_ids]:
+                self._pending_events.append((EVENT_FLIGHT_EXITED, self._passes.pop(flight_id).event_data()))
 
             expired_flight_ids = []
             for flight_id, flight_info in self.tracked_flights.items():
                 if flight_id not in currently_visible_ids:
-                    if time.time() - flight_info.get("last_seen", 0) > hold_seconds:
+                    if polled_at - flight_info.get("last_seen", 0) > hold_seconds:
                         _LOGGER.debug(f"Flight {flight_id} has expired and will be removed.")
                         expired_flight_ids.append(flight_id)
 
             historic_max_count = self._config.get("historic_flights_max_count", 0)
+            expired_flights = []
             for flight_id in expired_flight_ids:
+                fix = self._position_fixes.pop(flight_id, None)
                 if flight_id in self.tracked_flights:
+                    if fix is not None:
+                        # Archive where the flight was last reported, not where it was projected to.
+                        flight_details = self.tracked_flights[flight_id]["data"]
+                        flight_details['latitude'] = fix.latitude
+                        flight_details['longitude'] = fix.longitude
+                        flight_details['altitude'] = self._display_altitude(fix.altitude)
+                    expired_flights.append(self.tracked_flights[flight_id])
                     self.historic_flights.insert(0, self.tracked_flights[flight_id])
                     del self.tracked_flights[flight_id]
 
+            if self.archive is not None and expired_flights:
+                self.archive.async_add(self._feed_key, expired_flights, self._config.get("archive_retention_days", 90))
+
             if len(self.historic_flights) > historic_max_count:
                 self.historic_flights = self.historic_flights[:historic_max_count]
 
+            if self._config.get("adaptive_polling", False) and self.replay is None:
+                next_interval = next_poll_interval(positioned_flights, geometry, bool(currently_visible_ids), config, self.zone_index.zones)
+                if next_interval != self.update_interval.total_seconds():
+                    _LOGGER.debug(f"Adaptive polling: next poll in {next_interval:.1f}s")
+                    self.update_interval = timedelta(seconds=next_interval)
+            cycle.lap("expiry")
+
+            cycle.count("in_bounds", len(all_flights))
+            cycle.count("in_radius", sum(1 for distance_km in geometry.distances_km if distance_km <= config["radius_km"]))
+            cycle.count("in_fov", sum(1 for is_visible in geometry.visible if is_visible))
+            cycle.count("in_zones", len(zone_hits))
+            cycle.count("new", len(new_flights))
+            cycle.count("expired", len(expired_flights))
+            cycle.count("deferred_details", len(self._pending_details))
+
             return list(self.tracked_flights.values())
 
         except Exception as err:
+            cycle.count("failed")
             raise UpdateFailed(f"Error communicating with API: {err}")
+        finally:
+            self.telemetry.finish_cycle()
@@ -0,0 +1,126 @@
+import json
+import re
+from functools import cache, lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
+from .const import AIRCRAFT_CLASS_CACHE_SIZE
+
+TYPE_DESIGNATORS_PATH = Path(__file__).parent / "aircraft_types.json"
+
+# ICAO Doc 8643 description letters, e.g. "L2J" is a landplane with two jets.
+AIRFRAME_CATEGORIES = {
+    "L": "Airplane",
+    "S": "Airplane",
+    "A": "Airplane",
+    "H": "Helicopter",
+    "G": "Gyroplane",
+    "T": "Tiltrotor",
+}
+ENGINE_TYPES = {
+    "J": "Jet",
+    "T": "Turboprop",
+    "P": "Piston",
+    "E": "Electric",
+}
+WAKE_CATEGORIES = {
+    "L": "Light",
+    "M": "Medium",
+    "H": "Heavy",
+    "J": "Super",
+}
+
+HELICOPTER_CALLSIGN_PATTERN = re.compile(
+    r"^(LIFELN|POLICE|MEDIC|LL|HELI|SAR|SGR|ZULU|SLAYR|CRNGE|"
+    r"VORTX|SHARK|REAPER|APACHE|FIRE|RESCUE|PNTHR|VICTR|CHX|"
+    r"NHC|UKP|NPAS|AAC|AMBUSH|BARON|ARCTIC|COAST|KUST|RAINBOW|"
+    r"SAMU|DRAG|PEGASO|HEMS)",
+    re.IGNORECASE,
+)
+HELICOPTER_MODEL_PATTERN = re.compile(
+    r"(HELICOPTER|EUROCOPTER|ROBINSON|AGUSTA|BELL\s|SIKORSKY|"
+    r"AEROSPATIALE|MD\sHELICOPTERS|GUIMBAL|KAMOV|LEONARDO|"
+    r"WESTLAND|APACHE|CHINOOK|GAZELLE|MERLIN|WILDCAT|LYNX|"
+    r"PUMA|BOEING\sAH|AH\-64)",
+    re.IGNORECASE,
+)
+HELICOPTER_TYPE_CODE_PATTERN = re.compile(
+    r"^(R22|R44|R66|EC|AS[35]|H1[23467]|H6[045]|H47|AW|"
+    r"B[0245]|UH|CH|A1[0-9]|H500|MI[0-9]|NH90|SK[0-9]|"
+    r"EH10|LYNX|G2CA|S76|S92|EC45)",
+    re.IGNORECASE,
+)
+
+
+class AircraftClass(NamedTuple):
+    category: str
+    engine_type: str | None = None
+    wake_category: str | None = None
+
+
+AIRPLANE = AircraftClass("Airplane")
+HELICOPTER = AircraftClass("Helicopter")
+
+
+def _parse_description(description):
+    """Turn a description and wake category such as ``"L2J M"`` into an ``AircraftClass``."""
+    airframe, wake = description.split()
+    category = AIRFRAME_CATEGORIES.get(airframe[0], "Airplane")
+    engine_type = ENGINE_TYPES.get(airframe[-1])
+    if engine_type == "Turboprop" and category in ("Helicopter", "Tiltrotor"):
+        engine_type = "Turboshaft"
+    return AircraftClass(category, engine_type, WAKE_CATEGORIES.get(wake))
+
+
+@cache
+def load_type_designators():
+    """Read the bundled ICAO type designator table into a read-only mapping of type code to ``AircraftClass``.
+
+    The table is a subset of ICAO Doc 8643 covering the types commonly seen
+    on FlightRadar24, plus the designators ICAO reserves for aircraft without
+    a type of their own, such as ``GLID`` for gliders.
+    """
+    with open(TYPE_DESIGNATORS_PATH, encoding="utf-8") as file:
+        table = json.load(file)
+
+    designators = {}
+    for description, type_codes in table["descriptions"].items():
+        aircraft_class = _parse_description(description)
+        for type_code in type_codes:
+            designators[type_code] = aircraft_class
+    for type_code, category in table["categories"].items():
+        designators[type_code] = AircraftClass(category)
+    return MappingProxyType(designators)
+
+
+def is_helicopter(callsign, aircraft_model, aircraft_type) -> bool:
+    """Classify a flight as a helicopter based on callsign, model name, or type code.
+
+    Checking all three catches cases a type-code list alone would miss, e.g. a
+    police/medical helicopter broadcasting an unusual or missing type code.
+    """
+    callsign = callsign or ""
+    aircraft_model = aircraft_model or ""
+    aircraft_type = aircraft_type or ""
+
+    if HELICOPTER_CALLSIGN_PATTERN.match(callsign):
+        return True
+    if HELICOPTER_MODEL_PATTERN.search(aircraft_model):
+        return True
+    if HELICOPTER_TYPE_CODE_PATTERN.match(aircraft_type):
+        return True
+    return False
+
+
+@lru_cache(maxsize=AIRCRAFT_CLASS_CACHE_SIZE)
+def classify_aircraft(callsign, aircraft_model, aircraft_type) -> AircraftClass:
+    """Classify a flight by looking its type code up in the bundled table.
+
+    Types missing from the table fall back to ``is_helicopter`` and only get
+    a category, ``Helicopter`` or ``Airplane``.
+    """
+    if aircraft_type:
+        aircraft_class = load_type_designators().get(aircraft_type.upper())
+        if aircraft_class is not None:
+            return aircraft_class
+    return HELICOPTER if is_helicopter(callsign, aircraft_model, aircraft_type) else AIRPLANE
@@ -0,0 +1,231 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import DOMAIN, ARCHIVE_FLUSH_DELAY_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+ARCHIVE_FILENAME = f"{DOMAIN}_history.db"
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS historic_flights (
+        entry_id TEXT NOT NULL,
+        flight_id TEXT NOT NULL,
+        last_seen REAL NOT NULL,
+        callsign TEXT,
+        airline_icao TEXT,
+        aircraft_type TEXT,
+        registration TEXT,
+        record TEXT NOT NULL,
+        PRIMARY KEY (entry_id, flight_id, last_seen)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_historic_flights_last_seen ON historic_flights (entry_id, last_seen)",
+    "CREATE INDEX IF NOT EXISTS idx_historic_flights_airline_icao ON historic_flights (airline_icao)",
+    "CREATE INDEX IF NOT EXISTS idx_historic_flights_aircraft_type ON historic_flights (aircraft_type)",
+    "CREATE INDEX IF NOT EXISTS idx_historic_flights_registration ON historic_flights (registration)",
+)
+
+QUERY_FILTERS = ("callsign", "airline_icao", "aircraft_type", "registration")
+
+
+def _get(record, *keys):
+    value = record
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _normalise(value):
+    return value.upper() if isinstance(value, str) else value
+
+
+def _snapshot(flight_info):
+    """Copy the parts of a flight record the event loop may still replace, ready to serialise elsewhere.
+
+    Late details replace a flight's top-level fields in place, and trails are
+    FlightTrail ring buffers, which iterate as point dicts.
+    """
+    data = dict(flight_info.get("data") or {})
+    if data.get("trail") is not None:
+        data["trail"] = list(data["trail"])
+    return {**flight_info, "data": data}
+
+
+class FlightArchive:
+    """SQLite archive of expired flights shared by every config entry.
+
+    Writes are queued on the event loop and serialised and flushed in batches
+    from the executor.
+    The database runs in WAL mode and is indexed on last seen time, airline,
+    aircraft type and registration for the ``query_history`` service.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.path = hass.config.path(ARCHIVE_FILENAME)
+        self._connection = None
+        self._lock = threading.Lock()
+        self._pending = []
+        self._retention = {}
+        self._unsub_flush = None
+        self._unsub_stop = None
+
+    def _connect(self):
+        # Callers hold self._lock; the connection is shared between executor threads.
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+            self._connection.commit()
+        return self._connection
+
+    async def async_setup(self) -> None:
+        await self.hass.async_add_executor_job(self._locked, self._connect)
+
+        async def _async_close_on_stop(event: Event) -> None:
+            self._unsub_stop = None
+            await self.async_close()
+
+        self._unsub_stop = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_on_stop)
+
+    def _locked(self, function, *args):
+        with self._lock:
+            return function(*args)
+
+    @callback
+    def async_add(self, entry_id, flight_infos, retention_days) -> None:
+        """Queue expired flight records for the next batched write."""
+        for flight_info in flight_infos:
+            self._pending.append((entry_id, _snapshot(flight_info)))
+        self._retention[entry_id] = retention_days
+        if self._pending and self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, ARCHIVE_FLUSH_DELAY_SECONDS, self._async_scheduled_flush)
+
+    async def _async_scheduled_flush(self, _now) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+        retention = dict(self._retention)
+        try:
+            await self.hass.async_add_executor_job(self._locked, self._write, pending, retention)
+        except sqlite3.Error as e:
+            _LOGGER.error(f"Failed to archive {len(pending)} historic flight(s): {e}")
+
+    async def async_close(self) -> None:
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        await self.async_flush()
+        await self.hass.async_add_executor_job(self._locked, self._close)
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def async_recent(self, entry_id, limit):
+        """Return the ``limit`` most recently seen flight records for an entry, newest first."""
+        if limit <= 0:
+            return []
+        await self.async_flush()
+        return await self.hass.async_add_executor_job(self._locked, self._recent, entry_id, limit)
+
+    async def async_query(self, entry_id=None, start=None, end=None, limit=100, include_records=False, **filters):
+        await self.async_flush()
+        return await self.hass.async_add_executor_job(
+            self._locked, self._query, entry_id, start, end, limit, include_records, filters
+        )
+
+    def _to_row(self, entry_id, flight_info):
+        data = flight_info.get("data", {})
+        return (
+            entry_id,
+            str(_get(data, "identification", "id") or ""),
+            flight_info.get("last_seen") or time.time(),
+            _normalise(_get(data, "identification", "callsign") or data.get("callsign")),
+            _normalise(_get(data, "airline", "code", "icao")),
+            _normalise(_get(data, "aircraft", "model", "code")),
+            _normalise(_get(data, "aircraft", "registration")),
+            json.dumps(flight_info),
+        )
+
+    def _write(self, pending, retention):
+        rows = [self._to_row(entry_id, flight_info) for entry_id, flight_info in pending]
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO historic_flights VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            now = time.time()
+            for entry_id, retention_days in retention.items():
+                if retention_days:
+                    connection.execute(
+                        "DELETE FROM historic_flights WHERE entry_id = ? AND last_seen < ?",
+                        (entry_id, now - retention_days * 86400),
+                    )
+
+    def _recent(self, entry_id, limit):
+        cursor = self._connect().execute(
+            "SELECT record FROM historic_flights WHERE entry_id = ? ORDER BY last_seen DESC LIMIT ?",
+            (entry_id, limit),
+        )
+        return [json.loads(record) for (record,) in cursor]
+
+    def _query(self, entry_id, start, end, limit, include_records, filters):
+        clauses = []
+        parameters = []
+        if entry_id:
+            clauses.append("entry_id = ?")
+            parameters.append(entry_id)
+        if start is not None:
+            clauses.append("last_seen >= ?")
+            parameters.append(start)
+        if end is not None:
+            clauses.append("last_seen <= ?")
+            parameters.append(end)
+        for column in QUERY_FILTERS:
+            if filters.get(column):
+                clauses.append(f"{column} = ?")
+                parameters.append(_normalise(filters[column]))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._connect().execute(
+            "SELECT entry_id, flight_id, last_seen, callsign, airline_icao, aircraft_type, registration, record "
+            f"FROM historic_flights {where} ORDER BY last_seen DESC LIMIT ?",
+            (*parameters, limit),
+        )
+
+        results = []
+        for entry_id, flight_id, last_seen, callsign, airline_icao, aircraft_type, registration, record in cursor:
+            result = {
+                "entry_id": entry_id,
+                "flight_id": flight_id,
+                "last_seen": last_seen,
+                "callsign": callsign,
+                "airline_icao": airline_icao,
+                "aircraft_type": aircraft_type,
+                "registration": registration,
+            }
+            if include_records:
+                result["record"] = json.loads(record)
+            results.append(result)
+        return results
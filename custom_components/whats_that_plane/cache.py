@@ -0,0 +1,86 @@
+import copy
+import logging
+import time
+from collections import OrderedDict
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from .const import DOMAIN, DETAIL_CACHE_MAX_ENTRIES, DETAIL_CACHE_TTL_SECONDS, DETAIL_CACHE_SAVE_DELAY_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.detail_cache"
+
+
+class FlightDetailCache:
+    """LRU cache of clickhandler payloads keyed by FlightRadar24 flight id.
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_entries`` is exceeded. The cache is shared by every config
+    entry and persisted under ``.storage`` so it survives restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_entries=DETAIL_CACHE_MAX_ENTRIES, ttl=DETAIL_CACHE_TTL_SECONDS):
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        now = time.time()
+        entries = sorted(stored.get("entries", []), key=lambda entry: entry.get("stored_at", 0))
+        for entry in entries:
+            if now - entry.get("stored_at", 0) > self.ttl:
+                continue
+            self._entries[entry["flight_id"]] = (entry["stored_at"], entry["details"])
+        self._evict()
+        _LOGGER.debug(f"Restored {len(self._entries)} cached flight details")
+
+    async def async_save(self) -> None:
+        await self._store.async_save(self._data_to_save())
+
+    def get(self, flight_id):
+        entry = self._entries.get(flight_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, details = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[flight_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(flight_id)
+        self.hits += 1
+        return copy.deepcopy(details)
+
+    def set(self, flight_id, details) -> None:
+        if not flight_id or not details:
+            return
+        self._entries[flight_id] = (time.time(), copy.deepcopy(details))
+        self._entries.move_to_end(flight_id)
+        self._evict()
+        self._store.async_delay_save(self._data_to_save, DETAIL_CACHE_SAVE_DELAY_SECONDS)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _data_to_save(self) -> dict:
+        now = time.time()
+        return {
+            "entries": [
+                {"flight_id": flight_id, "stored_at": stored_at, "details": details}
+                for flight_id, (stored_at, details) in self._entries.items()
+                if now - stored_at <= self.ttl
+            ]
+        }
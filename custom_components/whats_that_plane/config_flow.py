@@ -1,13 +1,25 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN
+from homeassistant.helpers import selector
+from .const import DOMAIN, REQUEST_RATE_PER_MINUTE
+from .zones import ZONES_SCHEMA
+
+
+def _validate_zones(user_input, errors):
+    try:
+        user_input["zones"] = ZONES_SCHEMA(user_input.get("zones") or [])
+    except vol.Invalid:
+        errors["zones"] = "invalid_zones"
 
 class WhatsThatPlaneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     async def async_step_user(self, user_input=None):
+        errors = {}
         if user_input is not None:
+            _validate_zones(user_input, errors)
+        if user_input is not None and not errors:
             location_name = user_input.get("location_name", "").strip()
             title = "Visible Flights"
             if location_name:
@@ -25,15 +37,34 @@ class WhatsThatPlaneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required("facing_direction", default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=360)),
             vol.Required("fov_cone", default=90): vol.All(vol.Coerce(int), vol.Range(min=1, max=360)),
             vol.Required("update_interval", default=10): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("fov_sector_bounds", default=False): bool,
+            vol.Optional("zones", default=[]): selector.ObjectSelector(),
+            vol.Optional("adaptive_polling", default=False): bool,
+            vol.Optional("adaptive_polling_min_interval", default=2): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("adaptive_polling_max_interval", default=60): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("extrapolation_interval_seconds", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("extrapolation_max_seconds", default=60): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("record_file", default=""): str,
+            vol.Optional("replay_file", default=""): str,
+            vol.Optional("replay_speed", default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
             vol.Optional("filter_flight_altitude_ft_minimum", default=0): vol.Coerce(int),
             vol.Optional("filter_flight_altitude_ft_maximum", default=60000): vol.Coerce(int),
             vol.Optional("hold_flight_data_seconds", default=0): vol.Coerce(int),
             vol.Optional("historic_flights_max_count", default=0): vol.Coerce(int),
+            vol.Optional("historic_flights_in_attributes", default=False): bool,
+            vol.Optional("archive_historic_flights", default=False): bool,
+            vol.Optional("archive_retention_days", default=90): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("trail_max_points", default=1000): vol.All(vol.Coerce(int), vol.Range(min=2)),
+            vol.Optional("trail_simplify_tolerance_m", default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
             vol.Optional("distance_units", default="imperial (miles (mi))"): vol.In(["metric (kilometres (km))", "imperial (miles (mi))"]),
             vol.Optional("altitude_units", default="imperial (feet (ft))"): vol.In(["metric (metres (m))", "imperial (feet (ft))"]),
             vol.Optional("speed_units", default="imperial (miles per hour (mph))"): vol.In(["metric (kilometres per hour (km/h))", "imperial (miles per hour (mph))"]),
+            vol.Optional("detail_fetch_max_concurrency", default=4): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("detail_fetch_timeout_seconds", default=10): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("detail_fetch_cycle_timeout_seconds", default=5): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("request_rate_per_minute", default=REQUEST_RATE_PER_MINUTE): vol.All(vol.Coerce(int), vol.Range(min=1)),
         })
-        return self.async_show_form(step_id="user", data_schema=data_schema)
+        return self.async_show_form(step_id="user", data_schema=data_schema, errors=errors)
 
     @staticmethod
     @callback
@@ -43,7 +74,10 @@ class WhatsThatPlaneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 class WhatsThatPlaneOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
+        errors = {}
         if user_input is not None:
+            _validate_zones(user_input, errors)
+        if user_input is not None and not errors:
             new_options = {**self.config_entry.options, **user_input}
 
             location_name = new_options.get("location_name", "").strip()
@@ -65,12 +99,31 @@ class WhatsThatPlaneOptionsFlow(config_entries.OptionsFlow):
             vol.Required("facing_direction", default=current_config.get("facing_direction")): vol.All(vol.Coerce(int), vol.Range(min=0, max=360)),
             vol.Required("fov_cone", default=current_config.get("fov_cone")): vol.All(vol.Coerce(int), vol.Range(min=1, max=360)),
             vol.Required("update_interval", default=current_config.get("update_interval")): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("fov_sector_bounds", default=current_config.get("fov_sector_bounds", False)): bool,
+            vol.Optional("zones", default=current_config.get("zones", [])): selector.ObjectSelector(),
+            vol.Optional("adaptive_polling", default=current_config.get("adaptive_polling", False)): bool,
+            vol.Optional("adaptive_polling_min_interval", default=current_config.get("adaptive_polling_min_interval", 2)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("adaptive_polling_max_interval", default=current_config.get("adaptive_polling_max_interval", 60)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("extrapolation_interval_seconds", default=current_config.get("extrapolation_interval_seconds", 0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("extrapolation_max_seconds", default=current_config.get("extrapolation_max_seconds", 60)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("record_file", default=current_config.get("record_file", "")): str,
+            vol.Optional("replay_file", default=current_config.get("replay_file", "")): str,
+            vol.Optional("replay_speed", default=current_config.get("replay_speed", 1.0)): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
             vol.Optional("filter_flight_altitude_ft_minimum", default=current_config.get("filter_flight_altitude_ft_minimum", 0)): vol.Coerce(int),
             vol.Optional("filter_flight_altitude_ft_maximum", default=current_config.get("filter_flight_altitude_ft_maximum", 60000)): vol.Coerce(int),
             vol.Optional("hold_flight_data_seconds", default=current_config.get("hold_flight_data_seconds", 0)): vol.Coerce(int),
             vol.Optional("historic_flights_max_count", default=current_config.get("historic_flights_max_count", 0)): vol.Coerce(int),
+            vol.Optional("historic_flights_in_attributes", default=current_config.get("historic_flights_in_attributes", False)): bool,
+            vol.Optional("archive_historic_flights", default=current_config.get("archive_historic_flights", False)): bool,
+            vol.Optional("archive_retention_days", default=current_config.get("archive_retention_days", 90)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("trail_max_points", default=current_config.get("trail_max_points", 1000)): vol.All(vol.Coerce(int), vol.Range(min=2)),
+            vol.Optional("trail_simplify_tolerance_m", default=current_config.get("trail_simplify_tolerance_m", 0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
             vol.Optional("distance_units", default=current_config.get("distance_units", "imperial (miles (mi))")): vol.In(["metric (kilometres (km))", "imperial (miles (mi))"]),
             vol.Optional("altitude_units", default=current_config.get("altitude_units", "imperial (feet (ft))")): vol.In(["metric (metres (m))", "imperial (feet (ft))"]),
             vol.Optional("speed_units", default=current_config.get("speed_units", "imperial (miles per hour (mph))")): vol.In(["metric (kilometres per hour (km/h))", "imperial (miles per hour (mph))"]),
+            vol.Optional("detail_fetch_max_concurrency", default=current_config.get("detail_fetch_max_concurrency", 4)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("detail_fetch_timeout_seconds", default=current_config.get("detail_fetch_timeout_seconds", 10)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional("detail_fetch_cycle_timeout_seconds", default=current_config.get("detail_fetch_cycle_timeout_seconds", 5)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional("request_rate_per_minute", default=current_config.get("request_rate_per_minute", REQUEST_RATE_PER_MINUTE)): vol.All(vol.Coerce(int), vol.Range(min=1)),
         })
-        return self.async_show_form(step_id="init", data_schema=options_schema)
\ No newline at end of file
+        return self.async_show_form(step_id="init", data_schema=options_schema, errors=errors)
\ No newline at end of file
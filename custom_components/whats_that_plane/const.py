@@ -1,5 +1,64 @@
 DOMAIN = "whats_that_plane"
 
+DATA_DETAIL_CACHE = "detail_cache"
+DATA_FEED_HUB = "feed_hub"
+DATA_ARCHIVE = "archive"
+DATA_TRANSPORT = "transport"
+DATA_LIMITER = "limiter"
+DATA_FRONTEND = "frontend"
+
+EVENT_FLIGHT_ENTERED = f"{DOMAIN}_flight_entered"
+EVENT_FLIGHT_EXITED = f"{DOMAIN}_flight_exited"
+EVENT_FLIGHT_CLOSEST_APPROACH = f"{DOMAIN}_flight_closest_approach"
+
+# Bumped on a flight's data whenever scraped details are merged into it, so
+# formatted output derived from those details can be cached until it changes.
+DETAILS_REVISION = "details_revision"
+
+DETAIL_CACHE_MAX_ENTRIES = 500
+DETAIL_CACHE_TTL_SECONDS = 6 * 60 * 60
+DETAIL_CACHE_SAVE_DELAY_SECONDS = 30
+
+ARCHIVE_FLUSH_DELAY_SECONDS = 30
+RECORDER_FLUSH_DELAY_SECONDS = 30
+
+# Number of recent coordinator updates kept for the timing percentiles.
+TELEMETRY_WINDOW = 100
+# Serialising the sensor attributes to measure their size is nearly as costly as
+# formatting them, so it's only done on one update in this many.
+ATTRIBUTE_BYTES_SAMPLE_INTERVAL = 10
+
+# Cells per side of the grid used to look up which observation zones an aircraft may be in.
+ZONE_GRID_SIZE = 32
+
+# Distinct (callsign, model, type code) combinations whose aircraft classification is memoised.
+AIRCRAFT_CLASS_CACHE_SIZE = 4096
+
+# The bundled www files are served from here; the map card used to be copied to LEGACY_CARD_URL.
+FRONTEND_URL_BASE = f"/{DOMAIN}/static"
+FRONTEND_CARD_FILENAME = "whats-that-plane-map.js"
+LEGACY_CARD_URL = f"/local/community/{DOMAIN}/{FRONTEND_CARD_FILENAME}"
+FRONTEND_CACHE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+
+FR24_HOME_URL = "https://www.flightradar24.com"
+FR24_DATA_URL = "https://data-live.flightradar24.com"
+TRANSPORT_REQUEST_TIMEOUT_SECONDS = 10
+# Clearance without any expiring cookies is still renewed after this long, and
+# renewal starts this many seconds before the earliest cookie expires.
+CLEARANCE_MAX_AGE_SECONDS = 12 * 60 * 60
+CLEARANCE_REWARM_MARGIN_SECONDS = 120
+CLEARANCE_SAVE_DELAY_SECONDS = 30
+
+# Default budget shared by feed polls and detail fetches across every config
+# entry. DETAIL_REQUEST_MIN_SHARE of the rate is set aside for detail fetches,
+# which can also use spare poll tokens beyond DETAIL_REQUEST_RESERVE_TOKENS.
+REQUEST_RATE_PER_MINUTE = 30
+REQUEST_BURST = 10
+DETAIL_REQUEST_MIN_SHARE = 0.25
+DETAIL_REQUEST_RESERVE_TOKENS = 1
+REQUEST_BACKOFF_INITIAL_SECONDS = 30
+REQUEST_BACKOFF_MAX_SECONDS = 15 * 60
+
 COUNTRY_CODE_MAP = {
     "ABW": "AW",  # Aruba
     "AFG": "AF",  # Afghanistan
@@ -0,0 +1,120 @@
+LISTS = ("flights", "historic_flights")
+
+
+def record_key(record):
+    """Identify a formatted flight the way the map card does."""
+    return record.get("flight_id") or record.get("callsign")
+
+
+def _index_payload(payload):
+    records = {}
+    order = {}
+    for list_name in LISTS:
+        order[list_name] = []
+        for record in (payload or {}).get(list_name) or []:
+            key = record_key(record) if record else None
+            if key is None or key in records:
+                continue
+            records[key] = (list_name, record)
+            order[list_name].append(key)
+    return records, order
+
+
+def _find_prepend(previous, current, skip):
+    """Return how many points of ``current`` come before ``previous[skip:]``, or ``None``."""
+    if len(previous) <= skip:
+        return None
+    try:
+        new_points = current.index(previous[skip])
+    except ValueError:
+        return None
+    kept = len(current) - new_points
+    if kept <= len(previous) - skip and current[-1] == previous[skip + kept - 1]:
+        return new_points
+    return None
+
+
+def diff_trail(previous, current):
+    """Describe how a newest-first trail changed, or return ``None`` if it didn't.
+
+    When the previous newest point is still in the trail and everything after
+    it lines up, only the points recorded since are sent along with the new
+    length, so the receiver can prepend them and drop points trimmed from the
+    oldest end. Simplification overwrites the newest point in place, so when
+    the rest of the previous trail lines up instead, the delta also carries
+    ``replace_head`` and the receiver drops its newest point before
+    prepending. Any other change sends the whole trail.
+    """
+    if previous == current:
+        return None
+    if previous and current:
+        new_points = _find_prepend(previous, current, 0)
+        if new_points is not None:
+            return {"prepend": current[:new_points], "length": len(current)}
+        new_points = _find_prepend(previous, current, 1)
+        if new_points is not None:
+            return {"prepend": current[:new_points], "length": len(current), "replace_head": True}
+    return {"replace": current}
+
+
+def diff_flight_payloads(previous, current):
+    """Return the changes turning one flight payload into the next, or ``None`` if there are none.
+
+    Flights are matched by id across both lists, so a flight expiring to
+    history is a change of its ``list`` plus whatever fields changed with it.
+    The delta has the following keys, each present only when non-empty:
+
+    * ``added``: ``{"list": ..., "flight": ...}`` for every new flight
+    * ``changed``: ``{"flight_id": ..., "list": ..., "fields": {...}, "trail": ...}``
+      with only the parts that changed; ``trail`` is described by ``diff_trail``
+    * ``removed``: the ids of flights no longer in either list
+    * ``order``: the full id order of any list whose order changed
+    * ``config``: the new config attributes if they changed
+    """
+    previous_records, previous_order = _index_payload(previous)
+    current_records, current_order = _index_payload(current)
+    delta = {}
+
+    added = []
+    changed = []
+    for key, (list_name, record) in current_records.items():
+        if key not in previous_records:
+            added.append({"list": list_name, "flight": record})
+            continue
+
+        previous_list_name, previous_record = previous_records[key]
+        if record is previous_record:
+            continue
+        change = {}
+        if list_name != previous_list_name:
+            change["list"] = list_name
+        fields = {
+            field: value for field, value in record.items()
+            if field != "trail" and previous_record.get(field) != value
+        }
+        fields.update({field: None for field in previous_record.keys() - record.keys()})
+        if fields:
+            change["fields"] = fields
+        trail = diff_trail(previous_record.get("trail") or [], record.get("trail") or [])
+        if trail is not None:
+            change["trail"] = trail
+        if change:
+            changed.append({"flight_id": key, **change})
+
+    removed = [key for key in previous_records if key not in current_records]
+    order = {
+        list_name: current_order[list_name] for list_name in LISTS
+        if current_order[list_name] != previous_order[list_name]
+    }
+
+    if added:
+        delta["added"] = added
+    if changed:
+        delta["changed"] = changed
+    if removed:
+        delta["removed"] = removed
+    if order:
+        delta["order"] = order
+    if (current or {}).get("config") != (previous or {}).get("config"):
+        delta["config"] = (current or {}).get("config")
+    return delta or None
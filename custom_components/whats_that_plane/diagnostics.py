@@ -0,0 +1,44 @@
+import time
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, DATA_DETAIL_CACHE, DATA_FEED_HUB
+
+TO_REDACT = {"latitude", "longitude", "location_name"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    detail_cache = hass.data[DOMAIN].get(DATA_DETAIL_CACHE)
+    feed_hub = hass.data[DOMAIN].get(DATA_FEED_HUB)
+    transport = coordinator.transport
+    limiter = coordinator.limiter
+
+    return {
+        "config": async_redact_data(coordinator.config, TO_REDACT),
+        "update_interval_seconds": coordinator.update_interval.total_seconds(),
+        "telemetry": coordinator.telemetry.as_dict(),
+        "tracked_flights": len(coordinator.tracked_flights),
+        "historic_flights": len(coordinator.historic_flights),
+        "pending_details": len(coordinator._pending_details),
+        "feed_hub": {"polls": feed_hub.request_count} if feed_hub is not None else None,
+        "detail_cache": {
+            "entries": len(detail_cache),
+            "hits": detail_cache.hits,
+            "misses": detail_cache.misses,
+        } if detail_cache is not None else None,
+        "limiter": {
+            "tokens": round(limiter.tokens, 2),
+            "detail_tokens": round(limiter.detail_tokens, 2),
+            "rate_per_minute": limiter.rate_per_minute,
+            "backing_off": limiter.backing_off,
+            "throttled": limiter.throttled_count,
+        },
+        "transport": {
+            "clearance_renewals": getattr(transport, "warm_count", None),
+            "forbidden_responses": getattr(transport, "forbidden_count", None),
+            "clearance_valid_for_seconds": round(transport.valid_until - time.time()) if hasattr(transport, "valid_until") else None,
+        },
+        "replay": coordinator.replay.path if coordinator.replay is not None else None,
+        "recording": coordinator.recorder.path if coordinator.recorder is not None else None,
+    }
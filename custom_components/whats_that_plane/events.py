@@ -0,0 +1,57 @@
+from .const import EVENT_FLIGHT_CLOSEST_APPROACH, EVENT_FLIGHT_ENTERED, EVENT_FLIGHT_EXITED
+
+# Device trigger type for each event the coordinator fires.
+TRIGGER_EVENTS = {
+    "flight_entered": EVENT_FLIGHT_ENTERED,
+    "flight_exited": EVENT_FLIGHT_EXITED,
+    "flight_closest_approach": EVENT_FLIGHT_CLOSEST_APPROACH,
+}
+
+
+class FlightPass:
+    """One flight's pass through the view, tracked to report its closest approach.
+
+    The closest approach is reported once, on the first poll where the flight
+    is further away than the nearest distance seen so far.
+    """
+
+    __slots__ = (
+        "flight_id", "callsign", "aircraft_type", "distance_km", "bearing",
+        "closest_distance_km", "closest_bearing", "closest_reported",
+    )
+
+    def __init__(self, flight_id, callsign, aircraft_type, distance_km, bearing):
+        self.flight_id = flight_id
+        self.callsign = callsign
+        self.aircraft_type = aircraft_type
+        self.distance_km = distance_km
+        self.bearing = bearing
+        self.closest_distance_km = distance_km
+        self.closest_bearing = bearing
+        self.closest_reported = False
+
+    def update(self, callsign, aircraft_type, distance_km, bearing) -> bool:
+        """Record the latest position, returning ``True`` when the closest approach has just passed."""
+        self.callsign = callsign or self.callsign
+        self.aircraft_type = aircraft_type or self.aircraft_type
+        self.distance_km = distance_km
+        self.bearing = bearing
+        if distance_km < self.closest_distance_km:
+            self.closest_distance_km = distance_km
+            self.closest_bearing = bearing
+            return False
+        if self.closest_reported or distance_km == self.closest_distance_km:
+            return False
+        self.closest_reported = True
+        return True
+
+    def event_data(self, closest=False):
+        distance_km = self.closest_distance_km if closest else self.distance_km
+        bearing = self.closest_bearing if closest else self.bearing
+        return {
+            "flight_id": self.flight_id,
+            "callsign": self.callsign,
+            "aircraft_type": self.aircraft_type,
+            "distance_km": round(distance_km, 2),
+            "bearing": round(bearing, 1),
+        }
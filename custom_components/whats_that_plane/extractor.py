@@ -0,0 +1,71 @@
+def compile_path(path):
+    """Split a ``/`` separated path into lookup keys; numeric segments index lists."""
+    return tuple(int(segment) if segment.isdigit() else segment for segment in path.split("/"))
+
+
+class FieldRecord:
+    """Base class for the ``__slots__`` records returned by ``FieldExtractor``."""
+
+    __slots__ = ()
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class FieldExtractor:
+    """Extracts every field of a schema from a nested payload in one walk.
+
+    The schema maps field names to the ``a/b/0/c`` style paths used throughout
+    the integration. Paths are compiled once into a trie of direct lookups, so
+    extracting all fields costs one traversal of the payload rather than one
+    path parse and walk per field. Missing keys, out-of-range indexes and
+    ``None`` intermediates all yield ``None``, matching
+    ``dpath.util.get(..., default=None)``.
+    """
+
+    def __init__(self, name, schema):
+        self.schema = dict(schema)
+        self.fields = tuple(schema)
+        self.record_type = type(name, (FieldRecord,), {"__slots__": self.fields})
+        self._trie = {}
+        for field, path in schema.items():
+            node = self._trie
+            keys = compile_path(path)
+            for key in keys[:-1]:
+                node = node.setdefault(key, ({}, []))[0]
+            node.setdefault(keys[-1], ({}, []))[1].append(field)
+
+    def extract(self, payload):
+        record = self.record_type.__new__(self.record_type)
+        for field in self.fields:
+            setattr(record, field, None)
+        if payload:
+            self._walk(payload, self._trie, record)
+        return record
+
+    def _walk(self, value, node, record):
+        for key, (children, fields) in node.items():
+            try:
+                child = value[key]
+            except (KeyError, IndexError, TypeError):
+                continue
+            for field in fields:
+                setattr(record, field, child)
+            if children and isinstance(child, (dict, list)):
+                self._walk(child, children, record)
+
+
+def set_path(payload, path, value):
+    """Set ``value`` at ``path`` inside nested dicts, creating dicts on the way."""
+    keys = compile_path(path)
+    node = payload
+    for key in keys[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            child = node[key] = {}
+        node = child
+    node[keys[-1]] = value
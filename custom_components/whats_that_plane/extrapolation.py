@@ -0,0 +1,55 @@
+from .geometry import KNOTS_TO_KM_PER_SECOND, destination_point
+
+# Trail points further apart than this say little about the current climb or descent.
+VERTICAL_TREND_MAX_SPAN_SECONDS = 120
+
+
+def vertical_rate_fpm(trail):
+    """Estimate the climb (positive) or descent rate in feet per minute from the two newest trail points."""
+    newer = None
+    for point in trail or []:
+        if point.get("alt") is None or point.get("ts") is None:
+            continue
+        if newer is None:
+            newer = point
+            continue
+        elapsed = newer["ts"] - point["ts"]
+        if elapsed <= 0:
+            continue
+        if elapsed > VERTICAL_TREND_MAX_SPAN_SECONDS:
+            return 0.0
+        return (newer["alt"] - point["alt"]) * 60 / elapsed
+    return 0.0
+
+
+class PositionFix:
+    """The last reported position of a flight and the motion needed to project it forward."""
+
+    __slots__ = ("latitude", "longitude", "altitude", "heading", "ground_speed_kts", "vertical_rate_fpm", "timestamp")
+
+    def __init__(self, latitude, longitude, altitude, heading, ground_speed_kts, vertical_rate_fpm, timestamp):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.heading = heading
+        self.ground_speed_kts = ground_speed_kts
+        self.vertical_rate_fpm = vertical_rate_fpm
+        self.timestamp = timestamp
+
+    def project(self, now, max_seconds):
+        """Dead-reckon the (latitude, longitude, altitude) at ``now`` along a great circle.
+
+        The projection stops ``max_seconds`` after the fix so a flight that drops
+        out of the feed doesn't keep flying off on its own.
+        """
+        elapsed = min(max(0.0, now - self.timestamp), max_seconds)
+        latitude, longitude = self.latitude, self.longitude
+        if elapsed and self.heading is not None and self.ground_speed_kts:
+            latitude, longitude = destination_point(
+                latitude, longitude, self.heading, self.ground_speed_kts * KNOTS_TO_KM_PER_SECOND * elapsed
+            )
+
+        altitude = self.altitude
+        if altitude is not None and self.vertical_rate_fpm:
+            altitude = max(0, round(altitude + self.vertical_rate_fpm * elapsed / 60))
+        return latitude, longitude, altitude
@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import logging
+import os
+from http import HTTPStatus
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, FRONTEND_CACHE_MAX_AGE_SECONDS, FRONTEND_URL_BASE
+
+_LOGGER = logging.getLogger(__name__)
+
+FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "www")
+CONTENT_TYPES = {".js": "text/javascript", ".css": "text/css"}
+# Content encodings offered to browsers, most preferred first.
+ENCODINGS = ("br", "gzip")
+
+
+def _compress(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(body, quality=11)
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for token in request.headers.get(hdrs.ACCEPT_ENCODING, "").split(","):
+        encoding, _, parameters = token.strip().partition(";")
+        if parameters.strip().replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(encoding.strip().lower())
+    return accepted
+
+
+class FrontendAsset:
+    """A bundled file held in memory with its compressed variants."""
+
+    __slots__ = ("filename", "content_type", "body", "variants")
+
+    def __init__(self, filename, content_type, body):
+        self.filename = filename
+        self.content_type = content_type
+        self.body = body
+        self.variants = {}
+
+    def variant(self, encoding):
+        """Return the body compressed with ``encoding``, or ``None`` if it isn't available.
+
+        Compressing is slow, so this runs in the executor and each variant is built once.
+        """
+        if encoding not in self.variants:
+            self.variants[encoding] = _compress(self.body, encoding)
+        return self.variants[encoding]
+
+
+class FrontendBundle:
+    """The integration's www files, served from memory under ``FRONTEND_URL_BASE``.
+
+    The bundle's version is a hash of every file's contents. URLs carry it as a
+    ``v`` query string, so browsers can cache them for a year and any change to
+    the files moves every URL at once. The map card loads Leaflet with its own
+    query string, keeping the two in step.
+    """
+
+    def __init__(self, assets):
+        self.assets = {asset.filename: asset for asset in assets}
+        digest = hashlib.sha256()
+        for filename in sorted(self.assets):
+            digest.update(filename.encode())
+            digest.update(self.assets[filename].body)
+        self.version = digest.hexdigest()[:12]
+
+    @classmethod
+    def load(cls, directory=FRONTEND_DIR):
+        """Read the bundled files. Runs in the executor."""
+        assets = []
+        for filename in sorted(os.listdir(directory)):
+            content_type = CONTENT_TYPES.get(os.path.splitext(filename)[1])
+            if content_type is None:
+                continue
+            with open(os.path.join(directory, filename), "rb") as file:
+                assets.append(FrontendAsset(filename, content_type, file.read()))
+        return cls(assets)
+
+    def url(self, filename):
+        return f"{FRONTEND_URL_BASE}/{filename}?v={self.version}"
+
+    def prebuild(self) -> None:
+        """Build every compressed variant ahead of the first request. Runs in the executor."""
+        for asset in self.assets.values():
+            for encoding in ENCODINGS:
+                asset.variant(encoding)
+        _LOGGER.debug(f"Prebuilt compressed frontend files for version {self.version}")
+
+
+class FrontendAssetView(HomeAssistantView):
+    """Serves the bundled files, precompressed and cached for a year when versioned."""
+
+    url = FRONTEND_URL_BASE + "/{filename}"
+    name = f"api:{DOMAIN}:static"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant, bundle: FrontendBundle):
+        self.hass = hass
+        self.bundle = bundle
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        asset = self.bundle.assets.get(filename)
+        if asset is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        body = asset.body
+        headers = {hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        accepted = _accepted_encodings(request)
+        for encoding in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            variant = asset.variants.get(encoding)
+            if variant is None and encoding not in asset.variants:
+                variant = await self.hass.async_add_executor_job(asset.variant, encoding)
+            if variant is not None:
+                body = variant
+                headers[hdrs.CONTENT_ENCODING] = encoding
+                break
+
+        headers[hdrs.ETAG] = f'"{self.bundle.version}-{headers.get(hdrs.CONTENT_ENCODING, "identity")}"'
+        if request.query.get("v") == self.bundle.version:
+            headers[hdrs.CACHE_CONTROL] = f"public, max-age={FRONTEND_CACHE_MAX_AGE_SECONDS}, immutable"
+        else:
+            headers[hdrs.CACHE_CONTROL] = "no-cache"
+
+        if headers[hdrs.ETAG] in request.headers.get(hdrs.IF_NONE_MATCH, ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(body=body, content_type=asset.content_type, headers=headers)
@@ -0,0 +1,229 @@
+import math
+from functools import cache
+
+EARTH_MEAN_RADIUS_KM = 6371.0088
+KNOTS_TO_KM_PER_SECOND = 1.852 / 3600
+
+# Haversine on a sphere differs from the WGS-84 geodesic by at most ~0.56%, so
+# only aircraft whose spherical distance lies within this band of the radius can
+# land on a different side of it and need an exact geodesic.
+EDGE_RELATIVE_TOLERANCE = 0.006
+EDGE_ABSOLUTE_TOLERANCE_KM = 0.01
+
+
+@cache
+def load_numpy():
+    """Import NumPy on first use, or return ``None`` when it isn't installed."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - depends on the host environment
+        return None
+    return numpy
+
+
+def geodesic_km(first, second):
+    """WGS-84 geodesic distance between two (latitude, longitude) points."""
+    from geopy.distance import geodesic
+
+    return geodesic(first, second).km
+
+
+def calculate_bearing(your_latitude, your_longitude, flight_latitude, flight_longitude):
+    delta_longitude = math.radians(flight_longitude - your_longitude)
+    your_latitude = math.radians(your_latitude)
+    flight_latitude = math.radians(flight_latitude)
+    y = math.sin(delta_longitude) * math.cos(flight_latitude)
+    x = math.cos(your_latitude) * math.sin(flight_latitude) - math.sin(your_latitude) * math.cos(flight_latitude) * math.cos(delta_longitude)
+    initial_bearing = math.atan2(y, x)
+    return (math.degrees(initial_bearing) + 360) % 360
+
+
+def is_within_fov(bearing, direction, fov):
+    if fov >= 360:
+        return True
+    half_fov = fov / 2
+    lower_bound = (direction - half_fov) % 360
+    upper_bound = (direction + half_fov) % 360
+    return lower_bound <= bearing <= upper_bound if lower_bound < upper_bound else bearing >= lower_bound or bearing <= upper_bound
+
+
+def haversine_km(your_latitude, your_longitude, flight_latitude, flight_longitude):
+    your_latitude_rad = math.radians(your_latitude)
+    flight_latitude_rad = math.radians(flight_latitude)
+    delta_latitude = flight_latitude_rad - your_latitude_rad
+    delta_longitude = math.radians(flight_longitude - your_longitude)
+    a = math.sin(delta_latitude / 2) ** 2 + math.cos(your_latitude_rad) * math.cos(flight_latitude_rad) * math.sin(delta_longitude / 2) ** 2
+    return 2 * EARTH_MEAN_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def destination_point(latitude, longitude, bearing, distance_km):
+    """Return the (latitude, longitude) reached travelling ``distance_km`` along ``bearing``."""
+    angular_distance = distance_km / EARTH_MEAN_RADIUS_KM
+    latitude_rad = math.radians(latitude)
+    longitude_rad = math.radians(longitude)
+    bearing_rad = math.radians(bearing)
+    destination_latitude = math.asin(
+        math.sin(latitude_rad) * math.cos(angular_distance)
+        + math.cos(latitude_rad) * math.sin(angular_distance) * math.cos(bearing_rad)
+    )
+    destination_longitude = longitude_rad + math.atan2(
+        math.sin(bearing_rad) * math.sin(angular_distance) * math.cos(latitude_rad),
+        math.cos(angular_distance) - math.sin(latitude_rad) * math.sin(destination_latitude),
+    )
+    return math.degrees(destination_latitude), (math.degrees(destination_longitude) + 540) % 360 - 180
+
+
+def square_bounds(latitude, longitude, half_side_km):
+    """Return the (north, south, west, east) box of a square centred on a point.
+
+    Matches ``FlightRadar24API.get_bounds_by_point`` without importing the API.
+    """
+    corner_km = math.sqrt(2) * half_side_km
+    south, west = destination_point(latitude, longitude, 225, corner_km)
+    north, east = destination_point(latitude, longitude, 45, corner_km)
+    return north, south, west, east
+
+
+def sector_bounds(latitude, longitude, radius_km, facing_direction, fov_cone):
+    """Return the smallest (north, south, west, east) box covering the FOV sector.
+
+    The box spans the observer, both edges of the cone and any compass point the
+    arc sweeps through. The radius is padded to absorb the difference between the
+    spherical projection used here and the geodesic filter.
+    """
+    padded_radius_km = radius_km * (1 + 2 * EDGE_RELATIVE_TOLERANCE) + EDGE_ABSOLUTE_TOLERANCE_KM
+    if fov_cone >= 360:
+        bearings = [0, 90, 180, 270]
+        points = []
+    else:
+        half_fov = fov_cone / 2
+        bearings = [(facing_direction - half_fov) % 360, (facing_direction + half_fov) % 360]
+        bearings += [compass for compass in (0, 90, 180, 270) if is_within_fov(compass, facing_direction, fov_cone)]
+        points = [(latitude, longitude)]
+
+    points += [destination_point(latitude, longitude, bearing, padded_radius_km) for bearing in bearings]
+    latitudes = [point[0] for point in points]
+    longitudes = [point[1] for point in points]
+    return max(latitudes), min(latitudes), min(longitudes), max(longitudes)
+
+
+def _near_edge(distance_km, radius_km):
+    return abs(distance_km - radius_km) <= radius_km * EDGE_RELATIVE_TOLERANCE + EDGE_ABSOLUTE_TOLERANCE_KM
+
+
+class GeometryResult:
+    """Per-aircraft distance, bearing and visibility for one feed snapshot."""
+
+    __slots__ = ("distances_km", "bearings", "visible")
+
+    def __init__(self, distances_km, bearings, visible):
+        self.distances_km = distances_km
+        self.bearings = bearings
+        self.visible = visible
+
+
+def compute_flight_geometry(
+    your_latitude,
+    your_longitude,
+    latitudes,
+    longitudes,
+    altitudes,
+    radius_km,
+    minimum_altitude,
+    maximum_altitude,
+    facing_direction,
+    fov_cone,
+    refine_edges=True,
+):
+    """Compute distance, bearing and FOV membership for every aircraft in one pass.
+
+    Distances use the haversine formula. When ``refine_edges`` is set, aircraft
+    close enough to the radius for the spherical approximation to matter are
+    re-measured with geopy's exact geodesic, so the visible set matches a full
+    geodesic filter. Uses NumPy when it's installed and falls back to plain
+    Python otherwise. Missing altitudes are treated as 0.
+    """
+    if not latitudes:
+        return GeometryResult([], [], [])
+
+    if load_numpy() is not None:
+        distances_km, bearings, visible = _compute_numpy(
+            your_latitude, your_longitude, latitudes, longitudes, altitudes,
+            radius_km, minimum_altitude, maximum_altitude, facing_direction, fov_cone,
+        )
+    else:
+        distances_km, bearings, visible = _compute_python(
+            your_latitude, your_longitude, latitudes, longitudes, altitudes,
+            radius_km, minimum_altitude, maximum_altitude, facing_direction, fov_cone,
+        )
+
+    if refine_edges:
+        for index, distance_km in enumerate(distances_km):
+            if not _near_edge(distance_km, radius_km):
+                continue
+            exact_km = geodesic_km((your_latitude, your_longitude), (latitudes[index], longitudes[index]))
+            distances_km[index] = exact_km
+            altitude = altitudes[index] if altitudes[index] is not None else 0
+            visible[index] = (
+                exact_km <= radius_km
+                and minimum_altitude <= altitude <= maximum_altitude
+                and is_within_fov(bearings[index], facing_direction, fov_cone)
+            )
+
+    return GeometryResult(distances_km, bearings, visible)
+
+
+def _compute_python(your_latitude, your_longitude, latitudes, longitudes, altitudes, radius_km, minimum_altitude, maximum_altitude, facing_direction, fov_cone):
+    distances_km = []
+    bearings = []
+    visible = []
+    for latitude, longitude, altitude in zip(latitudes, longitudes, altitudes):
+        distance_km = haversine_km(your_latitude, your_longitude, latitude, longitude)
+        bearing = calculate_bearing(your_latitude, your_longitude, latitude, longitude)
+        altitude = altitude if altitude is not None else 0
+        distances_km.append(distance_km)
+        bearings.append(bearing)
+        visible.append(
+            distance_km <= radius_km
+            and minimum_altitude <= altitude <= maximum_altitude
+            and is_within_fov(bearing, facing_direction, fov_cone)
+        )
+    return distances_km, bearings, visible
+
+
+def _compute_numpy(your_latitude, your_longitude, latitudes, longitudes, altitudes, radius_km, minimum_altitude, maximum_altitude, facing_direction, fov_cone):
+    np = load_numpy()
+    flight_latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    flight_longitudes = np.asarray(longitudes, dtype=np.float64)
+    flight_altitudes = np.asarray([altitude if altitude is not None else 0 for altitude in altitudes], dtype=np.float64)
+    your_latitude_rad = math.radians(your_latitude)
+
+    delta_latitude = flight_latitudes - your_latitude_rad
+    delta_longitude = np.radians(flight_longitudes - your_longitude)
+    cos_flight_latitudes = np.cos(flight_latitudes)
+
+    a = np.sin(delta_latitude / 2) ** 2 + math.cos(your_latitude_rad) * cos_flight_latitudes * np.sin(delta_longitude / 2) ** 2
+    distances_km = 2 * EARTH_MEAN_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    y = np.sin(delta_longitude) * cos_flight_latitudes
+    x = math.cos(your_latitude_rad) * np.sin(flight_latitudes) - math.sin(your_latitude_rad) * cos_flight_latitudes * np.cos(delta_longitude)
+    bearings = (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+    if fov_cone >= 360:
+        in_fov = np.ones(len(bearings), dtype=bool)
+    else:
+        half_fov = fov_cone / 2
+        lower_bound = (facing_direction - half_fov) % 360
+        upper_bound = (facing_direction + half_fov) % 360
+        if lower_bound < upper_bound:
+            in_fov = (bearings >= lower_bound) & (bearings <= upper_bound)
+        else:
+            in_fov = (bearings >= lower_bound) | (bearings <= upper_bound)
+
+    visible = (
+        (distances_km <= radius_km)
+        & (flight_altitudes >= minimum_altitude)
+        & (flight_altitudes <= maximum_altitude)
+        & in_fov
+    )
+    return distances_km.tolist(), bearings.tolist(), visible.tolist()
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from homeassistant.core import HomeAssistant
+from requests import HTTPError
+from .const import DOMAIN
+from .limiter import THROTTLED_STATUS_CODES, RequestLimiter, RequestThrottled
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fetches for a region are shared with any subscriber asking within this many
+# seconds of its fastest interval, so jitter between coordinators doesn't cause
+# a second poll in the same tick.
+FRESHNESS_TOLERANCE_SECONDS = 0.5
+
+
+def create_flight_radar_api():
+    """Create a FlightRadar24 API client, importing the library on first use."""
+    from FlightRadar24 import FlightRadar24API
+
+    return FlightRadar24API()
+
+
+def fetch_flights(fr_api, bounds):
+    """Poll the feed from the executor, raising ``RequestThrottled`` if FlightRadar24 refuses it."""
+    try:
+        return fr_api.get_flights(None, bounds)
+    except HTTPError as e:
+        if e.response is not None and e.response.status_code in THROTTLED_STATUS_CODES:
+            raise RequestThrottled(f"feed poll refused with HTTP {e.response.status_code}") from e
+        raise
+
+
+def parse_bounds(bounds):
+    """Parse a FlightRadar24 bounds string ("north,south,west,east") into floats."""
+    north, south, west, east = (float(value) for value in bounds.split(","))
+    return north, south, west, east
+
+
+def format_bounds(north, south, west, east):
+    return f"{north:.4f},{south:.4f},{west:.4f},{east:.4f}"
+
+
+def _bounds_intersect(first, second):
+    first_north, first_south, first_west, first_east = first
+    second_north, second_south, second_west, second_east = second
+    return not (
+        first_south > second_north
+        or second_south > first_north
+        or first_west > second_east
+        or second_west > first_east
+    )
+
+
+def _union_bounds(first, second):
+    return (
+        max(first[0], second[0]),
+        min(first[1], second[1]),
+        min(first[2], second[2]),
+        max(first[3], second[3]),
+    )
+
+
+class FeedRegion:
+    """A group of subscribers whose bounds overlap and share one feed request."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.members = set()
+        self.interval = None
+        self.flights = None
+        self.fetched_at = None
+        self.fetch_task = None
+
+    @property
+    def bounds_string(self):
+        return format_bounds(*self.bounds)
+
+    def is_fresh(self):
+        if self.fetched_at is None or self.interval is None:
+            return False
+        return time.monotonic() - self.fetched_at < self.interval - FRESHNESS_TOLERANCE_SECONDS
+
+
+class FlightFeedHub:
+    """Shares FlightRadar24 feed polls between config entries.
+
+    Every coordinator asks the hub for flights with its own bounds and update
+    interval. Subscribers with overlapping bounds are grouped into a region, and
+    each region is polled once per tick of its fastest subscriber using the union
+    of its members' bounds. Coordinators then apply their own radius, FOV and
+    altitude filters to the shared flight list.
+    """
+
+    def __init__(self, hass: HomeAssistant, limiter: RequestLimiter):
+        self.hass = hass
+        self._fr_api = None
+        self.limiter = limiter
+        self._subscribers = {}
+        self._intervals = {}
+        self._regions = []
+        self.request_count = 0
+
+    @property
+    def fr_api(self):
+        if self._fr_api is None:
+            self._fr_api = create_flight_radar_api()
+        return self._fr_api
+
+    def _get_flights(self, bounds):
+        return fetch_flights(self.fr_api, bounds)
+
+    def unregister(self, key) -> None:
+        self._intervals.pop(key, None)
+        if self._subscribers.pop(key, None) is not None:
+            self._rebuild_regions()
+
+    async def async_get_flights(self, key, bounds, interval):
+        bounds = parse_bounds(bounds)
+        if self._subscribers.get(key) != bounds:
+            self._subscribers[key] = bounds
+            self._intervals[key] = interval
+            self._rebuild_regions()
+            region = self._region_for(key)
+        else:
+            region = self._region_for(key)
+            if self._intervals[key] != interval:
+                # Adaptive polling changes intervals from poll to poll; keep the region and its cached result.
+                self._intervals[key] = interval
+                region.interval = min(self._intervals[member] for member in region.members)
+        if region.is_fresh():
+            return region.flights
+
+        if region.fetch_task is None or region.fetch_task.done():
+            region.fetch_task = self.hass.async_create_task(self._async_fetch_region(region))
+
+        return await asyncio.shield(region.fetch_task)
+
+    async def _async_fetch_region(self, region):
+        bounds = region.bounds_string
+        _LOGGER.debug(f"Polling feed for {len(region.members)} subscriber(s) within {bounds}")
+        await self.limiter.async_acquire()
+        self.request_count += 1
+        try:
+            flights = await self.hass.async_add_executor_job(self._get_flights, bounds)
+        except RequestThrottled:
+            self.limiter.throttled()
+            raise
+        self.limiter.succeeded()
+        region.flights = flights
+        region.fetched_at = time.monotonic()
+        return flights
+
+    def _region_for(self, key):
+        for region in self._regions:
+            if key in region.members:
+                return region
+        raise KeyError(key)
+
+    def _rebuild_regions(self) -> None:
+        """Group subscribers into regions of transitively overlapping bounds.
+
+        Cached results are carried over to a rebuilt region when its bounds are
+        unchanged, so adding an unrelated entry elsewhere doesn't force a fresh
+        poll. A region's interval is its fastest member's and is updated in
+        place when only a member's interval changes.
+        """
+        previous_regions = {region.bounds: region for region in self._regions}
+
+        regions = []
+        for key, bounds in self._subscribers.items():
+            region = FeedRegion(bounds)
+            region.members.add(key)
+            region.interval = self._intervals[key]
+
+            merged = True
+            while merged:
+                merged = False
+                for other in regions:
+                    if _bounds_intersect(region.bounds, other.bounds):
+                        region.bounds = _union_bounds(region.bounds, other.bounds)
+                        region.members |= other.members
+                        region.interval = min(region.interval, other.interval)
+                        regions.remove(other)
+                        merged = True
+                        break
+            regions.append(region)
+
+        for region in regions:
+            previous = previous_regions.get(region.bounds)
+            if previous is not None:
+                region.flights = previous.flights
+                region.fetched_at = previous.fetched_at
+                region.fetch_task = previous.fetch_task
+
+        self._regions = regions
+        _LOGGER.debug(f"{DOMAIN} feed hub serving {len(self._subscribers)} subscriber(s) from {len(regions)} region(s)")
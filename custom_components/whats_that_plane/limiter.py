@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from .const import (
+    DETAIL_REQUEST_MIN_SHARE,
+    REQUEST_RATE_PER_MINUTE,
+    REQUEST_BURST,
+    REQUEST_BACKOFF_INITIAL_SECONDS,
+    REQUEST_BACKOFF_MAX_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+THROTTLED_STATUS_CODES = (403, 429)
+
+
+class RequestThrottled(Exception):
+    """Raised when FlightRadar24 throttles a request or the limiter is backing off."""
+
+
+class RequestLimiter:
+    """Token bucket budgeting every FlightRadar24 request made by the integration.
+
+    ``detail_share`` of ``rate_per_minute`` refills a bucket only detail
+    fetches can use, so fast polling can't starve them; the rest refills the
+    poll bucket up to ``burst``. Feed polls wait for a poll token with
+    ``async_acquire``. Detail fetches use ``try_acquire``, which takes a detail
+    token or else a poll token beyond ``reserve``, so they never take the
+    token the next poll needs and are deferred instead. A throttled response
+    starts an exponential backoff during which no request is allowed; the
+    first successful request resets it.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute=REQUEST_RATE_PER_MINUTE,
+        burst=REQUEST_BURST,
+        detail_share=DETAIL_REQUEST_MIN_SHARE,
+        backoff_initial=REQUEST_BACKOFF_INITIAL_SECONDS,
+        backoff_max=REQUEST_BACKOFF_MAX_SECONDS,
+    ):
+        self.capacity = burst
+        self.detail_share = detail_share
+        self.detail_capacity = max(1.0, burst * detail_share)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self._tokens = float(burst)
+        self._detail_tokens = self.detail_capacity
+        self._refilled_at = time.monotonic()
+        self.rate = self.detail_rate = 0.0
+        self.set_rate(rate_per_minute)
+        self._backoff = 0
+        self.blocked_until = 0.0
+        self.throttled_count = 0
+
+    def set_rate(self, rate_per_minute) -> None:
+        """Change the request budget, keeping the tokens already earned."""
+        self._refill()
+        self.rate_per_minute = rate_per_minute
+        self.rate = rate_per_minute * (1 - self.detail_share) / 60
+        self.detail_rate = rate_per_minute * self.detail_share / 60
+
+    @property
+    def poll_rate_per_minute(self):
+        return self.rate * 60
+
+    @property
+    def backing_off(self):
+        return time.monotonic() < self.blocked_until
+
+    @property
+    def tokens(self):
+        self._refill()
+        return self._tokens
+
+    @property
+    def detail_tokens(self):
+        self._refill()
+        return self._detail_tokens
+
+    def try_acquire(self, reserve=0) -> bool:
+        """Take a detail token, or a poll token if one is available beyond ``reserve``, without waiting."""
+        if self.backing_off:
+            return False
+        self._refill()
+        if self._detail_tokens >= 1:
+            self._detail_tokens -= 1
+            return True
+        if self._tokens < 1 + reserve:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def async_acquire(self) -> None:
+        """Wait for a token, raising ``RequestThrottled`` while backing off."""
+        while True:
+            if self.backing_off:
+                raise RequestThrottled(f"backing off for another {self.blocked_until - time.monotonic():.0f}s")
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def throttled(self) -> None:
+        # Requests already in flight when throttling starts fail together; count them once.
+        self._tokens = 0.0
+        self._detail_tokens = 0.0
+        if self.backing_off:
+            return
+        self._backoff = min(self.backoff_max, self._backoff * 2 if self._backoff else self.backoff_initial)
+        self.blocked_until = time.monotonic() + self._backoff
+        self.throttled_count += 1
+        _LOGGER.warning(f"FlightRadar24 is throttling requests, pausing for {self._backoff}s")
+
+    def succeeded(self) -> None:
+        self._backoff = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._detail_tokens = min(self.detail_capacity, self._detail_tokens + elapsed * self.detail_rate)
+        self._refilled_at = now
@@ -0,0 +1,171 @@
+import gzip
+import json
+import logging
+import threading
+import time
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .const import RECORDER_FLUSH_DELAY_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# The FlightRadar24 ``Flight`` attributes captured for every feed entry.
+FLIGHT_ATTRIBUTES = (
+    "id", "icao_24bit", "latitude", "longitude", "heading", "altitude", "ground_speed", "squawk",
+    "aircraft_code", "registration", "time", "origin_airport_iata", "destination_airport_iata",
+    "number", "airline_iata", "on_ground", "vertical_speed", "callsign", "airline_icao",
+)
+
+
+class RecordedFlight:
+    """Feed entry restored from a recording, with the attributes of a FlightRadar24 ``Flight``."""
+
+    __slots__ = FLIGHT_ATTRIBUTES
+
+    def __init__(self, attributes):
+        for name in FLIGHT_ATTRIBUTES:
+            setattr(self, name, attributes.get(name))
+
+
+class FeedRecorder:
+    """Appends every feed poll and clickhandler response to a gzipped JSONL file.
+
+    Each line is an event with its wall clock time ``t``: either
+    ``{"type": "flights", "bounds": ..., "flights": [...]}`` or
+    ``{"type": "details", "flight_id": ..., "details": {...}}``. Events are
+    buffered on the event loop and appended from the executor in batches, each
+    batch as its own gzip member so the file stays readable if recording stops
+    abruptly.
+    """
+
+    def __init__(self, hass: HomeAssistant, path):
+        self.hass = hass
+        self.path = path
+        self._pending = []
+        self._lock = threading.Lock()
+        self._unsub_flush = None
+
+    @callback
+    def record_flights(self, bounds, flights) -> None:
+        self._add({
+            "t": time.time(),
+            "type": "flights",
+            "bounds": bounds,
+            "flights": [{name: getattr(flight, name, None) for name in FLIGHT_ATTRIBUTES} for flight in flights],
+        })
+
+    @callback
+    def record_details(self, flight_id, details) -> None:
+        self._add({"t": time.time(), "type": "details", "flight_id": flight_id, "details": details})
+
+    def _add(self, event) -> None:
+        # Serialise now: details dicts are merged into live flights afterwards.
+        self._pending.append(json.dumps(event, separators=(",", ":")))
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, RECORDER_FLUSH_DELAY_SECONDS, self._async_scheduled_flush)
+
+    async def _async_scheduled_flush(self, _now) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._pending:
+            return
+
+        lines = self._pending
+        self._pending = []
+        try:
+            await self.hass.async_add_executor_job(self._write, lines)
+        except OSError as e:
+            _LOGGER.error(f"Failed to record {len(lines)} feed event(s) to {self.path}: {e}")
+
+    def _write(self, lines):
+        with self._lock, gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+class FeedReplay:
+    """Replays a ``FeedRecorder`` file in place of the live API and detail transport.
+
+    Every ``get_flights`` call returns the next recorded poll, holding the last
+    one once the recording ends, and ``seconds_until_next_poll`` says when the
+    following one is due at ``speed`` times real time, so the coordinator can
+    refresh once per recorded poll. ``replay_time`` is the recorded time of the
+    poll being served, running on at ``speed`` until the next one is due, and
+    ``async_get_flight_details`` serves the recorded clickhandler payload for a
+    flight.
+    """
+
+    def __init__(self, hass: HomeAssistant, path, speed=1.0):
+        self.hass = hass
+        self.path = path
+        self.speed = speed
+        self._polls = None
+        self._details = {}
+        self._position = -1
+        self._started_at = None
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._polls is not None:
+                return
+            polls = []
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    if event["type"] == "flights":
+                        polls.append((event["t"], event["flights"]))
+                    elif event["type"] == "details":
+                        self._details[event["flight_id"]] = event["details"]
+            polls.sort(key=lambda poll: poll[0])
+            self._polls = polls
+            _LOGGER.info(f"Replaying {len(polls)} feed poll(s) and {len(self._details)} flight detail(s) from {self.path} at {self.speed}x")
+
+    @property
+    def replay_time(self):
+        """The recorded time the replay has reached, or ``None`` before the recording is loaded."""
+        if not self._polls:
+            return None
+        if self._position < 0:
+            return self._polls[0][0]
+        replay_time = max(
+            self._polls[self._position][0],
+            self._polls[0][0] + (time.monotonic() - self._started_at) * self.speed,
+        )
+        if self._position + 1 < len(self._polls):
+            # Never run past the next poll before it has been served.
+            replay_time = min(replay_time, self._polls[self._position + 1][0])
+        return replay_time
+
+    def seconds_until_next_poll(self):
+        """Real seconds until the next recorded poll is due, or ``None`` if none is left to serve."""
+        if not self._polls or self._position < 0 or self._position + 1 >= len(self._polls):
+            return None
+        due_at = self._started_at + (self._polls[self._position + 1][0] - self._polls[0][0]) / self.speed
+        return max(0.0, due_at - time.monotonic())
+
+    def get_flights(self, airline=None, bounds=None, registration=None, aircraft_type=None, *, details=False):
+        self._load()
+        if not self._polls:
+            return []
+
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        if self._position + 1 < len(self._polls):
+            self._position += 1
+        if self._position == len(self._polls) - 1 and not self._finished:
+            self._finished = True
+            _LOGGER.info(f"Reached the end of the recording in {self.path}, holding the last poll")
+
+        return [RecordedFlight(attributes) for attributes in self._polls[self._position][1]]
+
+    async def async_get_flight_details(self, flight_id):
+        await self.hass.async_add_executor_job(self._load)
+        return self._details.get(flight_id)
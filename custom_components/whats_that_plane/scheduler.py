@@ -0,0 +1,141 @@
+import math
+from .geometry import EARTH_MEAN_RADIUS_KM, KNOTS_TO_KM_PER_SECOND, calculate_bearing, haversine_km, is_within_fov
+
+FOV_SAMPLES = 24
+
+
+def seconds_until_visible(distance_km, bearing, heading, ground_speed_kts, radius_km, facing_direction, fov_cone):
+    """Predict how long until an aircraft on a straight track enters the radius and FOV.
+
+    Works in a flat east/north plane centred on the observer, which is plenty for
+    the few tens of kilometres a radius covers. Returns ``None`` if the aircraft's
+    current track never crosses the visible sector.
+    """
+    if heading is None or not ground_speed_kts:
+        return None
+
+    bearing_rad = math.radians(bearing)
+    heading_rad = math.radians(heading)
+    speed = ground_speed_kts * KNOTS_TO_KM_PER_SECOND
+
+    position_x = distance_km * math.sin(bearing_rad)
+    position_y = distance_km * math.cos(bearing_rad)
+    velocity_x = speed * math.sin(heading_rad)
+    velocity_y = speed * math.cos(heading_rad)
+
+    # Solve |position + velocity * t| = radius for the entry and exit times.
+    a = velocity_x * velocity_x + velocity_y * velocity_y
+    b = 2 * (position_x * velocity_x + position_y * velocity_y)
+    c = position_x * position_x + position_y * position_y - radius_km * radius_km
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return None
+
+    root = math.sqrt(discriminant)
+    exit_time = (-b + root) / (2 * a)
+    if exit_time < 0:
+        return None
+    entry_time = max(0.0, (-b - root) / (2 * a))
+
+    if fov_cone >= 360:
+        return entry_time
+
+    for step in range(FOV_SAMPLES + 1):
+        t = entry_time + (exit_time - entry_time) * step / FOV_SAMPLES
+        x = position_x + velocity_x * t
+        y = position_y + velocity_y * t
+        if (x, y) == (0, 0):
+            return t
+        if is_within_fov((math.degrees(math.atan2(x, y)) + 360) % 360, facing_direction, fov_cone):
+            return t
+    return None
+
+
+def seconds_until_in_polygon(latitude, longitude, heading, ground_speed_kts, points):
+    """Predict how long until an aircraft on a straight track crosses into a polygon.
+
+    The polygon is projected onto a flat east/north plane centred on the
+    aircraft and the track is intersected with each edge. Returns ``None`` if
+    the track never crosses it.
+    """
+    if heading is None or not ground_speed_kts:
+        return None
+
+    heading_rad = math.radians(heading)
+    speed = ground_speed_kts * KNOTS_TO_KM_PER_SECOND
+    velocity_x = speed * math.sin(heading_rad)
+    velocity_y = speed * math.cos(heading_rad)
+    km_per_degree = EARTH_MEAN_RADIUS_KM * math.pi / 180
+    scale_x = km_per_degree * math.cos(math.radians(latitude))
+    corners = [((point_longitude - longitude) * scale_x, (point_latitude - latitude) * km_per_degree) for point_latitude, point_longitude in points]
+
+    soonest = None
+    previous_x, previous_y = corners[-1]
+    for corner_x, corner_y in corners:
+        # Solve velocity * t = previous + (corner - previous) * s for t >= 0 and 0 <= s <= 1.
+        edge_x, edge_y = corner_x - previous_x, corner_y - previous_y
+        denominator = velocity_x * edge_y - velocity_y * edge_x
+        if denominator:
+            t = (previous_x * edge_y - previous_y * edge_x) / denominator
+            s = (previous_x * velocity_y - previous_y * velocity_x) / denominator
+            if t >= 0 and 0 <= s <= 1 and (soonest is None or t < soonest):
+                soonest = t
+        previous_x, previous_y = corner_x, corner_y
+    return soonest
+
+
+def seconds_until_in_zone(zone, flight):
+    """Predict how long until an aircraft on a straight track enters a ``Zone``, ignoring its altitude band."""
+    if zone.kind == "polygon":
+        return seconds_until_in_polygon(flight.latitude, flight.longitude, flight.heading, flight.ground_speed, zone.points)
+    return seconds_until_visible(
+        haversine_km(zone.latitude, zone.longitude, flight.latitude, flight.longitude),
+        calculate_bearing(zone.latitude, zone.longitude, flight.latitude, flight.longitude),
+        flight.heading, flight.ground_speed, zone.radius_km, zone.facing_direction, zone.fov_cone,
+    )
+
+
+def next_poll_interval(flights, geometry, any_visible, config, zones=()):
+    """Choose the seconds until the next feed poll from the current traffic picture.
+
+    While something is visible the configured ``update_interval`` is used. When
+    the sky is empty, polling backs off to ``adaptive_polling_max_interval``
+    unless an aircraft is predicted to appear sooner, either in the radius and
+    FOV or in one of ``zones`` within its altitude band, in which case the next poll
+    is brought forward to halfway to its predicted entry, but never below
+    ``adaptive_polling_min_interval``.
+    """
+    base_interval = config.get("update_interval", 60)
+    min_interval = config.get("adaptive_polling_min_interval", 2)
+    max_interval = max(config.get("adaptive_polling_max_interval", 60), base_interval)
+
+    if any_visible:
+        return base_interval
+
+    minimum_altitude = config.get("filter_flight_altitude_ft_minimum", 0)
+    maximum_altitude = config.get("filter_flight_altitude_ft_maximum", 60000)
+
+    soonest = None
+    for flight, distance_km, bearing in zip(flights, geometry.distances_km, geometry.bearings):
+        altitude = flight.altitude if flight.altitude is not None else 0
+        if not (minimum_altitude <= altitude <= maximum_altitude):
+            continue
+        seconds = seconds_until_visible(
+            distance_km, bearing, flight.heading, flight.ground_speed,
+            config["radius_km"], config["facing_direction"], config["fov_cone"],
+        )
+        if seconds is not None and (soonest is None or seconds < soonest):
+            soonest = seconds
+
+    for zone in zones:
+        for flight in flights:
+            altitude = flight.altitude if flight.altitude is not None else 0
+            if not (zone.minimum_altitude <= altitude <= zone.maximum_altitude):
+                continue
+            seconds = seconds_until_in_zone(zone, flight)
+            if seconds is not None and (soonest is None or seconds < soonest):
+                soonest = seconds
+
+    if soonest is None:
+        return max_interval
+    return max(min_interval, min(max_interval, soonest / 2))
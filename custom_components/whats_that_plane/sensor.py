@@ -1,14 +1,23 @@
-import re
-import dpath.util
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN, COUNTRY_CODE_MAP, TIMEZONE_ABBREVIATION_MAP
-from pycountry import countries
+from .aircraft import classify_aircraft
+from .const import DOMAIN, ATTRIBUTE_BYTES_SAMPLE_INTERVAL, DETAILS_REVISION, COUNTRY_CODE_MAP, TIMEZONE_ABBREVIATION_MAP
+from .extractor import FieldExtractor
+from .geometry import haversine_km
+from .trail import FlightTrail
 
 CALLSIGN = 'identification/callsign'
 FLIGHT_ID = 'identification/id'
@@ -63,45 +72,128 @@ TIME_REAL_ARRIVAL = 'time/real/arrival'
 STATUS_LIVE = 'status/live'
 STATUS_ICON = 'status/icon'
 
-HELICOPTER_CALLSIGN_PATTERN = re.compile(
-    r"^(LIFELN|POLICE|MEDIC|LL|HELI|SAR|SGR|ZULU|SLAYR|CRNGE|"
-    r"VORTX|SHARK|REAPER|APACHE|FIRE|RESCUE|PNTHR|VICTR|CHX|"
-    r"NHC|UKP|NPAS|AAC|AMBUSH|BARON|ARCTIC|COAST|KUST|RAINBOW|"
-    r"SAMU|DRAG|PEGASO|HEMS)",
-    re.IGNORECASE,
-)
-HELICOPTER_MODEL_PATTERN = re.compile(
-    r"(HELICOPTER|EUROCOPTER|ROBINSON|AGUSTA|BELL\s|SIKORSKY|"
-    r"AEROSPATIALE|MD\sHELICOPTERS|GUIMBAL|KAMOV|LEONARDO|"
-    r"WESTLAND|APACHE|CHINOOK|GAZELLE|MERLIN|WILDCAT|LYNX|"
-    r"PUMA|BOEING\sAH|AH\-64)",
-    re.IGNORECASE,
-)
-HELICOPTER_TYPE_CODE_PATTERN = re.compile(
-    r"^(R22|R44|R66|EC|AS[35]|H1[23467]|H6[045]|H47|AW|"
-    r"B[0245]|UH|CH|A1[0-9]|H500|MI[0-9]|NH90|SK[0-9]|"
-    r"EH10|LYNX|G2CA|S76|S92|EC45)",
-    re.IGNORECASE,
+FLIGHT_FIELDS = FieldExtractor("FlightFields", {
+    "callsign": CALLSIGN,
+    "flight_id": FLIGHT_ID,
+    "flight_number": FLIGHT_NUMBER,
+    "airline_name": AIRLINE_NAME,
+    "airline_iata": AIRLINE_IATA,
+    "airline_icao": AIRLINE_ICAO,
+    "aircraft_model": AIRCRAFT_MODEL,
+    "aircraft_type": AIRCRAFT_TYPE,
+    "aircraft_icao": AIRCRAFT_ICAO,
+    "aircraft_registration": AIRCRAFT_REGISTRATION,
+    "large_aircraft_image": LARGE_AIRCRAFT_IMAGE,
+    "medium_aircraft_image": MEDIUM_AIRCRAFT_IMAGE,
+    "small_aircraft_image": SMALL_AIRCRAFT_IMAGE,
+    "thumbnail_aircraft_image": THUMBNAIL_AIRCRAFT_IMAGE,
+    "origin_city": ORIGIN_CITY,
+    "origin_country": ORIGIN_COUNTRY,
+    "origin_country_code": ORIGIN_COUNTRY_CODE,
+    "origin_country_codelong": ORIGIN_COUNTRY_CODELONG,
+    "origin_airport_name": ORIGIN_AIRPORT_NAME,
+    "origin_airport_code": ORIGIN_AIRPORT_CODE,
+    "origin_timezone_name": ORIGIN_TIMEZONE_NAME,
+    "origin_latitude": ORIGIN_LATITUDE,
+    "origin_longitude": ORIGIN_LONGITUDE,
+    "destination_city": DESTINATION_CITY,
+    "destination_country": DESTINATION_COUNTRY,
+    "destination_country_code": DESTINATION_COUNTRY_CODE,
+    "destination_country_codelong": DESTINATION_COUNTRY_CODELONG,
+    "destination_airport_name": DESTINATION_AIRPORT_NAME,
+    "destination_airport_code": DESTINATION_AIRPORT_CODE,
+    "destination_timezone_name": DESTINATION_TIMEZONE_NAME,
+    "destination_latitude": DESTINATION_LATITUDE,
+    "destination_longitude": DESTINATION_LONGITUDE,
+    "scheduled_departure": TIME_SCHEDULED_DEPARTURE,
+    "estimated_departure": TIME_ESTIMATED_DEPARTURE,
+    "real_departure": TIME_REAL_DEPARTURE,
+    "scheduled_arrival": TIME_SCHEDULED_ARRIVAL,
+    "estimated_arrival": TIME_ESTIMATED_ARRIVAL,
+    "real_arrival": TIME_REAL_ARRIVAL,
+    "status_live": STATUS_LIVE,
+    "status_icon": STATUS_ICON,
+})
+
+# Enough recent points for templates to derive a vertical trend; full trails are
+# served by the whats_that_plane/flights websocket command.
+ATTRIBUTE_TRAIL_POINTS = 6
+# The fields kept for each historic flight in the sensor's attributes; the full
+# records are served by the websocket command and the archive.
+HISTORIC_SUMMARY_FIELDS = (
+    "flight_id", "callsign", "aircraft_type", "latitude", "longitude", "altitude",
+    "last_seen_timestamp", "last_seen_time_formatted",
 )
 
 
-def is_helicopter(callsign, aircraft_model, aircraft_type) -> bool:
-    """Classify a flight as a helicopter based on callsign, model name, or type code.
+def trail_points(trail, count=None):
+    """Newest-first trail points, or only the newest ``count``, built from a ``FlightTrail`` on demand."""
+    if isinstance(trail, FlightTrail):
+        return trail.as_list() if count is None else trail.recent(count)
+    return list(trail or [])[:count]
+
+
+class HistoricRecord:
+    """A historic flight's trail-less attributes, with its full payload record built on first use.
+
+    ``summary`` holds the compact attribute entry once the sensor has built it.
+    """
+
+    __slots__ = ("key", "attributes", "trail", "summary", "_payload_record")
+
+    def __init__(self, key, attributes, trail):
+        self.key = key
+        self.attributes = attributes
+        self.trail = trail
+        self.summary = None
+        self._payload_record = None
+
+    def payload_record(self):
+        if self._payload_record is None:
+            self._payload_record = {**self.attributes, "trail": trail_points(self.trail)}
+        return self._payload_record
+
+
+UTC_ZONE = ZoneInfo("UTC")
+LOCAL_TIME_CACHE_SIZE = 4096
 
-    Checking all three catches cases a type-code list alone would miss, e.g. a
-    police/medical helicopter broadcasting an unusual or missing type code.
+
+@lru_cache(maxsize=None)
+def resolve_timezone(tz_name):
+    """Return the ZoneInfo and any fixed abbreviation override for a timezone name.
+
+    Raises ZoneInfoNotFoundError/ValueError for unknown names. Only successful
+    lookups are cached, and there are a few hundred IANA names at most.
     """
-    callsign = callsign or ""
-    aircraft_model = aircraft_model or ""
-    aircraft_type = aircraft_type or ""
+    return ZoneInfo(tz_name), TIMEZONE_ABBREVIATION_MAP.get(tz_name)
 
-    if HELICOPTER_CALLSIGN_PATTERN.match(callsign):
-        return True
-    if HELICOPTER_MODEL_PATTERN.search(aircraft_model):
-        return True
-    if HELICOPTER_TYPE_CODE_PATTERN.match(aircraft_type):
-        return True
-    return False
+
+@lru_cache(maxsize=LOCAL_TIME_CACHE_SIZE)
+def format_time_local(timestamp, tz_name):
+    """Format a UTC timestamp as local time with abbreviation and UTC offset.
+
+    Schedule times rarely change while a flight is tracked, so results are
+    memoised per (timestamp, timezone name).
+    """
+    if timestamp is None or not tz_name:
+        return None
+    try:
+        zone, abbreviation_override = resolve_timezone(tz_name)
+        local_datetime = datetime.fromtimestamp(timestamp, tz=UTC_ZONE).astimezone(zone)
+
+        timezone_abbreviation = abbreviation_override or local_datetime.tzname()
+
+        offset_seconds = local_datetime.utcoffset().total_seconds()
+        offset_hours = offset_seconds / 3600
+        offset_string = f"UTC{int(offset_hours):+}"
+
+        if timezone_abbreviation and any(c.isalpha() for c in timezone_abbreviation):
+            return f"{local_datetime.strftime('%-I:%M %p')} ({timezone_abbreviation} {offset_string})"
+        else:
+            return f"{local_datetime.strftime('%-I:%M %p')} ({offset_string})"
+
+    except (ZoneInfoNotFoundError, ValueError):
+        return datetime.fromtimestamp(timestamp).strftime('%-I:%M %p')
 
 
 async def async_setup_entry(
@@ -110,17 +202,118 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([WhatsThatPlaneSensor(coordinator)])
+    async_add_entities([
+        WhatsThatPlaneSensor(coordinator),
+        *(WhatsThatPlaneDiagnosticSensor(coordinator, description) for description in DIAGNOSTIC_SENSORS),
+    ])
+
+
+def _last_count(name):
+    def value(coordinator):
+        last = coordinator.telemetry.last
+        return last.counts.get(name, 0) if last is not None else None
+    return value
+
+
+def _detail_cache_hit_rate(coordinator):
+    telemetry = coordinator.telemetry
+    hits = telemetry.count_total("cache_hits")
+    lookups = hits + telemetry.count_total("cache_misses")
+    return round(hits / lookups * 100, 1) if lookups else None
+
+
+def _update_duration(coordinator):
+    last = coordinator.telemetry.last
+    return round(last.total_ms, 1) if last is not None else None
+
+
+def _update_duration_attributes(coordinator):
+    telemetry = coordinator.telemetry
+    last = telemetry.last
+    return {
+        "last_update": {stage: round(duration, 1) for stage, duration in last.durations.items()} if last is not None else {},
+        "percentiles": {
+            stage: {key: round(value, 1) for key, value in values.items() if value is not None}
+            for stage, values in telemetry.duration_percentiles().items()
+        },
+        "updates": len(telemetry.cycles),
+    }
+
+
+@dataclass(frozen=True, kw_only=True)
+class WhatsThatPlaneDiagnosticDescription(SensorEntityDescription):
+    value_fn: Callable[[Any], Any]
+    attributes_fn: Callable[[Any], dict] | None = None
+
+
+DIAGNOSTIC_SENSORS = (
+    WhatsThatPlaneDiagnosticDescription(
+        key="update_duration",
+        name="Flight Update Duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_update_duration,
+        attributes_fn=_update_duration_attributes,
+    ),
+    WhatsThatPlaneDiagnosticDescription(
+        key="aircraft_in_bounds",
+        name="Aircraft In Search Area",
+        icon="mdi:airplane-search",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_count("in_bounds"),
+    ),
+    WhatsThatPlaneDiagnosticDescription(
+        key="aircraft_in_radius",
+        name="Aircraft In Radius",
+        icon="mdi:radius-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_last_count("in_radius"),
+    ),
+    WhatsThatPlaneDiagnosticDescription(
+        key="detail_cache_hit_rate",
+        name="Flight Detail Cache Hit Rate",
+        icon="mdi:cached",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_detail_cache_hit_rate,
+    ),
+    WhatsThatPlaneDiagnosticDescription(
+        key="throttled_requests",
+        name="Throttled FlightRadar24 Requests",
+        icon="mdi:speedometer-slow",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.limiter.throttled_count,
+    ),
+    WhatsThatPlaneDiagnosticDescription(
+        key="attribute_payload_size",
+        name="Visible Flights Attribute Size",
+        icon="mdi:code-json",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.telemetry.last_count("attribute_bytes"),
+    ),
+)
 
 
 class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
+    _unrecorded_attributes = frozenset({"flights", "historic_flights"})
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "Visible Flights"
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_visible_flights"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, coordinator.config_entry.entry_id)})
         self._attr_icon = "mdi:airplane"
         self._attr_extra_state_attributes = {}
-        self.update_sensor_data()
+        self._static_cache = {}
+        self._historic_cache = {}
+        self._format_count = 0
+        self._visible_records = []
+        self._attr_native_value = 0
+        # Formatting needs the dependencies the first refresh loads off the event loop.
+        if coordinator.dependencies_loaded:
+            self.update_sensor_data()
 
     def _code_to_flag_emoji(self, country_code):
         if not country_code or len(country_code) != 2:
@@ -170,6 +363,9 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
         
         # If 3 letters, convert to 2 letters using pycountry
         if len(country_code) == 3:
+            # Imported here as pycountry loads its databases on import; the coordinator preloads it.
+            from pycountry import countries
+
             try:
                 country = countries.get(alpha_3=country_code)
                 return country.alpha_2 if country is not None else None
@@ -179,25 +375,7 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
         return None
 
     def _format_time_local(self, timestamp, tz_name):
-        if timestamp is None or not tz_name:
-            return None
-        try:
-            utc_datetime = datetime.fromtimestamp(timestamp, tz=ZoneInfo("UTC"))
-            local_datetime = utc_datetime.astimezone(ZoneInfo(tz_name))
-
-            timezone_abbreviation = TIMEZONE_ABBREVIATION_MAP.get(tz_name, local_datetime.tzname())
-
-            offset_seconds = local_datetime.utcoffset().total_seconds()
-            offset_hours = offset_seconds / 3600
-            offset_string = f"UTC{int(offset_hours):+}"
-
-            if timezone_abbreviation and any(c.isalpha() for c in timezone_abbreviation):
-                return f"{local_datetime.strftime('%-I:%M %p')} ({timezone_abbreviation} {offset_string})"
-            else:
-                return f"{local_datetime.strftime('%-I:%M %p')} ({offset_string})"
-
-        except (ZoneInfoNotFoundError, ValueError):
-            return datetime.fromtimestamp(timestamp).strftime('%-I:%M %p')
+        return format_time_local(timestamp, tz_name)
 
     def _format_duration(self, seconds):
         if seconds is None or seconds < 0:
@@ -211,30 +389,27 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
         else:
             return f"{int(hours)} hours {int(minutes)} minutes"
 
-    def _format_flight_data(self, flight_info):
-        flight = flight_info.get("data", {})
-        if not flight:
-            return None
+    def _format_static_flight_data(self, flight):
+        """Format the fields that only change when a flight's details are (re)fetched."""
+        fields = FLIGHT_FIELDS.extract(flight)
 
         # Flight information
-        callsign = dpath.util.get(flight, CALLSIGN, default=None) or flight.get('callsign')
-        flight_id = dpath.util.get(flight, FLIGHT_ID, default=None)
-        flight_number = dpath.util.get(flight, FLIGHT_NUMBER, default=None)
-        aircraft_model = dpath.util.get(flight, AIRCRAFT_MODEL, default=None)
-        aircraft_type = dpath.util.get(flight, AIRCRAFT_TYPE, default=None)
-        aircraft_category = "Helicopter" if is_helicopter(callsign, aircraft_model, aircraft_type) else "Airplane"
-        heading = flight.get(HEADING)
-        heading_compass = self._heading_to_compass(heading)
-        origin_country_code = dpath.util.get(flight, ORIGIN_COUNTRY_CODE, default=None)
-        destination_country_code = dpath.util.get(flight, DESTINATION_COUNTRY_CODE, default=None)
+        callsign = fields.callsign or flight.get('callsign')
+        flight_id = fields.flight_id
+        flight_number = fields.flight_number
+        aircraft_model = fields.aircraft_model
+        aircraft_type = fields.aircraft_type
+        aircraft_class = classify_aircraft(callsign, aircraft_model, aircraft_type)
+        origin_country_code = fields.origin_country_code
+        destination_country_code = fields.destination_country_code
         origin_2_letter_code = COUNTRY_CODE_MAP.get(origin_country_code, origin_country_code)
         destination_2_letter_code = COUNTRY_CODE_MAP.get(destination_country_code, destination_country_code)
         origin_country_code_flagsapi = self._get_country_code_2_letter(origin_country_code)
         destination_country_code_flagsapi = self._get_country_code_2_letter(destination_country_code)
 
         # Extract airline codes
-        airline_icao = dpath.util.get(flight, AIRLINE_ICAO, default=None)
-        airline_iata = dpath.util.get(flight, AIRLINE_IATA, default=None)
+        airline_icao = fields.airline_icao
+        airline_iata = fields.airline_iata
         
         # Generate airline logo link
         airline_logo_link = None
@@ -249,14 +424,14 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
                 flightradar_link = f"https://www.flightradar24.com/{callsign}/{flight_id}"
 
         # Flight time data
-        scheduled_departure = dpath.util.get(flight, TIME_SCHEDULED_DEPARTURE, default=None)
-        scheduled_arrival = dpath.util.get(flight, TIME_SCHEDULED_ARRIVAL, default=None)
-        real_departure = dpath.util.get(flight, TIME_REAL_DEPARTURE, default=None)
-        real_arrival = dpath.util.get(flight, TIME_REAL_ARRIVAL, default=None)
-        estimated_departure = dpath.util.get(flight, TIME_ESTIMATED_DEPARTURE, default=None)
-        estimated_arrival = dpath.util.get(flight, TIME_ESTIMATED_ARRIVAL, default=None)
-        origin_timezone_name = dpath.util.get(flight, ORIGIN_TIMEZONE_NAME, default=None)
-        destination_timezone_name = dpath.util.get(flight, DESTINATION_TIMEZONE_NAME, default=None)
+        scheduled_departure = fields.scheduled_departure
+        scheduled_arrival = fields.scheduled_arrival
+        real_departure = fields.real_departure
+        real_arrival = fields.real_arrival
+        estimated_departure = fields.estimated_departure
+        estimated_arrival = fields.estimated_arrival
+        origin_timezone_name = fields.origin_timezone_name
+        destination_timezone_name = fields.destination_timezone_name
 
         # Calculate delays
         departure_delay_mins = None
@@ -284,81 +459,51 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
             duration_seconds = effective_arrival - effective_departure
             total_flight_time_formatted = self._format_duration(duration_seconds)
 
-        # Last seen time for historic flights
-        last_seen_time_formatted = None
-        last_seen_timestamp = flight_info.get("last_seen")
-        last_seen_timestamp_formatted =  int(last_seen_timestamp) if last_seen_timestamp else None
-        if last_seen_timestamp:
-            time_diff = datetime.now(timezone.utc) - datetime.fromtimestamp(last_seen_timestamp, tz=timezone.utc)
-
-            days = time_diff.days
-            hours, remainder = divmod(time_diff.seconds, 3600)
-            minutes, _ = divmod(remainder, 60)
-
-            if days > 0:
-                last_seen_time_formatted = f"{days}d ago"
-            elif hours > 0:
-                last_seen_time_formatted = f"{hours}h ago"
-            elif minutes > 0:
-                last_seen_time_formatted = f"{minutes}m ago"
-            else:
-                last_seen_time_formatted = "Just now"
-
         return {
             "callsign": callsign,
             "flight_id": flight_id,
             "flight_number": flight_number,
             "flightradar_link": flightradar_link,
-            "status_live": dpath.util.get(flight, STATUS_LIVE, default=None),
-            "status_icon": dpath.util.get(flight, STATUS_ICON, default=None),
-            "airline_name": dpath.util.get(flight, AIRLINE_NAME, default=None),
+            "status_live": fields.status_live,
+            "status_icon": fields.status_icon,
+            "airline_name": fields.airline_name,
             "airline_iata": airline_iata,
             "airline_icao": airline_icao,
             "airline_logo_link": airline_logo_link,
             "aircraft_model": aircraft_model,
             "aircraft_type": aircraft_type,
-            "aircraft_category": aircraft_category,
-            "aircraft_icao": dpath.util.get(flight, AIRCRAFT_ICAO, default=None),
-            "aircraft_registration": dpath.util.get(flight, AIRCRAFT_REGISTRATION, default=None),
-            "large_aircraft_image_link": dpath.util.get(flight, LARGE_AIRCRAFT_IMAGE, default=None),
-            "medium_aircraft_image_link": dpath.util.get(flight, MEDIUM_AIRCRAFT_IMAGE, default=None),
-            "small_aircraft_image_link": dpath.util.get(flight, SMALL_AIRCRAFT_IMAGE, default=None),
-            "thumbnail_aircraft_image_link": dpath.util.get(flight, THUMBNAIL_AIRCRAFT_IMAGE, default=None),
-
-            "latitude": flight.get(LATITUDE),
-            "longitude": flight.get(LONGITUDE),
-            "altitude": flight.get(ALTITUDE),
-            "ground_speed": flight.get(GROUND_SPEED),
-            "ground_speed_kts": flight.get(GROUND_SPEED_KTS),
-            "heading": heading,
-            "heading_compass": heading_compass,
-            "total_distance": flight.get("total_distance"),
-            "distance_traveled": flight.get("distance_traveled"),
-            "progress_percent": flight.get("progress_percent"),
+            "aircraft_category": aircraft_class.category,
+            "aircraft_engine_type": aircraft_class.engine_type,
+            "aircraft_wake_category": aircraft_class.wake_category,
+            "aircraft_icao": fields.aircraft_icao,
+            "aircraft_registration": fields.aircraft_registration,
+            "large_aircraft_image_link": fields.large_aircraft_image,
+            "medium_aircraft_image_link": fields.medium_aircraft_image,
+            "small_aircraft_image_link": fields.small_aircraft_image,
+            "thumbnail_aircraft_image_link": fields.thumbnail_aircraft_image,
             "total_flight_time_formatted": total_flight_time_formatted,
-            "trail": flight.get("trail", []),
 
-            "origin_city": dpath.util.get(flight, ORIGIN_CITY, default=None),
-            "origin_country": dpath.util.get(flight, ORIGIN_COUNTRY, default=None),
+            "origin_city": fields.origin_city,
+            "origin_country": fields.origin_country,
             "origin_country_code": origin_country_code,
             "origin_country_code_flagsapi": origin_country_code_flagsapi,
-            "origin_country_code_long": dpath.util.get(flight, ORIGIN_COUNTRY_CODELONG, default=None),
+            "origin_country_code_long": fields.origin_country_codelong,
             "origin_flag_emoji": self._code_to_flag_emoji(origin_2_letter_code),
-            "origin_airport_name": dpath.util.get(flight, ORIGIN_AIRPORT_NAME, default=None),
-            "origin_airport_code": dpath.util.get(flight, ORIGIN_AIRPORT_CODE, default=None),
-            "origin_latitude": dpath.util.get(flight, ORIGIN_LATITUDE, default=None),
-            "origin_longitude": dpath.util.get(flight, ORIGIN_LONGITUDE, default=None),
+            "origin_airport_name": fields.origin_airport_name,
+            "origin_airport_code": fields.origin_airport_code,
+            "origin_latitude": fields.origin_latitude,
+            "origin_longitude": fields.origin_longitude,
 
-            "destination_city": dpath.util.get(flight, DESTINATION_CITY, default=None),
-            "destination_country": dpath.util.get(flight, DESTINATION_COUNTRY, default=None),
+            "destination_city": fields.destination_city,
+            "destination_country": fields.destination_country,
             "destination_country_code": destination_country_code,
             "destination_country_code_flagsapi": destination_country_code_flagsapi,
-            "destination_country_code_long": dpath.util.get(flight, DESTINATION_COUNTRY_CODELONG, default=None),
+            "destination_country_code_long": fields.destination_country_codelong,
             "destination_flag_emoji": self._code_to_flag_emoji(destination_2_letter_code),
-            "destination_airport_name": dpath.util.get(flight, DESTINATION_AIRPORT_NAME, default=None),
-            "destination_airport_code": dpath.util.get(flight, DESTINATION_AIRPORT_CODE, default=None),
-            "destination_latitude": dpath.util.get(flight, DESTINATION_LATITUDE, default=None),
-            "destination_longitude": dpath.util.get(flight, DESTINATION_LONGITUDE, default=None),
+            "destination_airport_name": fields.destination_airport_name,
+            "destination_airport_code": fields.destination_airport_code,
+            "destination_latitude": fields.destination_latitude,
+            "destination_longitude": fields.destination_longitude,
 
             "scheduled_departure_time_local": self._format_time_local(scheduled_departure, origin_timezone_name),
             "estimated_departure_time_local": self._format_time_local(estimated_departure, origin_timezone_name),
@@ -371,11 +516,117 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
             "real_arrival_time_local": self._format_time_local(real_arrival, destination_timezone_name),
             "estimated_arrival_delay_mins": estimated_arrival_delay_mins,
             "arrival_delay_mins": arrival_delay_mins,
+        }
 
-            "last_seen_timestamp": last_seen_timestamp_formatted,
-            "last_seen_time_formatted": last_seen_time_formatted,
+    def _format_dynamic_flight_data(self, flight, flight_info):
+        """Format the fields that change on every poll while a flight is visible."""
+        heading = flight.get(HEADING)
+        last_seen_timestamp = flight_info.get("last_seen")
+
+        return {
+            "latitude": flight.get(LATITUDE),
+            "longitude": flight.get(LONGITUDE),
+            "altitude": flight.get(ALTITUDE),
+            "ground_speed": flight.get(GROUND_SPEED),
+            "ground_speed_kts": flight.get(GROUND_SPEED_KTS),
+            "heading": heading,
+            "heading_compass": self._heading_to_compass(heading),
+            "total_distance": flight.get("total_distance"),
+            "distance_traveled": flight.get("distance_traveled"),
+            "progress_percent": flight.get("progress_percent"),
+            "zones": list(flight.get("zones") or []),
+            "trail": trail_points(flight.get("trail"), ATTRIBUTE_TRAIL_POINTS),
+
+            "last_seen_timestamp": int(last_seen_timestamp) if last_seen_timestamp else None,
+            "last_seen_time_formatted": self._format_last_seen(last_seen_timestamp),
         }
 
+    def _format_last_seen(self, last_seen_timestamp):
+        # Last seen time for historic flights
+        if not last_seen_timestamp:
+            return None
+
+        time_diff = datetime.now(timezone.utc) - datetime.fromtimestamp(last_seen_timestamp, tz=timezone.utc)
+
+        days = time_diff.days
+        hours, remainder = divmod(time_diff.seconds, 3600)
+        minutes, _ = divmod(remainder, 60)
+
+        if days > 0:
+            return f"{days}d ago"
+        elif hours > 0:
+            return f"{hours}h ago"
+        elif minutes > 0:
+            return f"{minutes}m ago"
+        else:
+            return "Just now"
+
+    def _static_cache_key(self, flight):
+        return (flight.get(DETAILS_REVISION, 0), flight.get('callsign'))
+
+    def _format_flight_data(self, flight_info):
+        flight = flight_info.get("data", {})
+        if not flight:
+            return None
+
+        cache_id = flight.get('identification', {}).get('id')
+        if cache_id is None:
+            return {**self._format_static_flight_data(flight), **self._format_dynamic_flight_data(flight, flight_info)}
+
+        static_key = self._static_cache_key(flight)
+        cached = self._static_cache.get(cache_id)
+        if cached is None or cached[0] != static_key:
+            cached = (static_key, self._format_static_flight_data(flight))
+            self._static_cache[cache_id] = cached
+
+        return {**cached[1], **self._format_dynamic_flight_data(flight, flight_info)}
+
+    def _format_historic_flight_data(self, flight_info):
+        """Format a historic flight, reusing the previous record while it's unchanged.
+
+        Historic flights no longer move, so the record is rebuilt only when late
+        details land or the relative "last seen" text rolls over.
+        """
+        flight = flight_info.get("data", {})
+        if not flight:
+            return None
+
+        cache_id = flight.get('identification', {}).get('id')
+        record_key = (self._static_cache_key(flight), flight_info.get("last_seen"))
+        last_seen_time_formatted = self._format_last_seen(flight_info.get("last_seen"))
+
+        cached = self._historic_cache.get(cache_id) if cache_id is not None else None
+        if cached is None or cached.key != record_key:
+            record = self._format_flight_data(flight_info)
+            attributes = {key: value for key, value in record.items() if key != "trail"}
+            cached = HistoricRecord(record_key, attributes, flight.get("trail"))
+        elif cached.attributes["last_seen_time_formatted"] != last_seen_time_formatted:
+            cached = HistoricRecord(
+                record_key,
+                {**cached.attributes, "last_seen_time_formatted": last_seen_time_formatted},
+                cached.trail,
+            )
+
+        if cache_id is not None:
+            self._historic_cache[cache_id] = cached
+        return cached
+
+    def _historic_summary(self, record):
+        """Build a historic flight's compact attribute entry, with its last distance from the viewing location."""
+        if record.summary is None:
+            attributes = record.attributes
+            summary = {field: attributes.get(field) for field in HISTORIC_SUMMARY_FIELDS}
+            summary["distance"] = None
+            config = self.coordinator.config
+            if attributes.get("latitude") is not None and attributes.get("longitude") is not None:
+                distance_km = haversine_km(config["latitude"], config["longitude"], attributes["latitude"], attributes["longitude"])
+                if config.get("distance_units", "imperial (miles (mi))").startswith("imperial"):
+                    summary["distance"] = round(distance_km * 0.621371, 1)
+                else:
+                    summary["distance"] = round(distance_km, 1)
+            record.summary = summary
+        return record.summary
+
     @property
     def native_value(self):
         return self._attr_native_value
@@ -384,17 +635,64 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
     def extra_state_attributes(self):
         return self._attr_extra_state_attributes
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_position_listener(self._handle_extrapolated_positions))
+
     def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.dependencies_loaded:
+            # Formatting imports them; wait for the coordinator to load them off the event loop.
+            return
         self.update_sensor_data()
         self.async_write_ha_state()
 
+    @callback
+    def _handle_extrapolated_positions(self, positions) -> None:
+        """Move visible flights to their extrapolated positions without reformatting anything else."""
+        visible_records = []
+        moved = False
+        for record, trail in self._visible_records:
+            position = positions.get(record["flight_id"])
+            if position is not None:
+                record = {**record, **position}
+                moved = True
+            visible_records.append((record, trail))
+        if not moved:
+            return
+
+        self._visible_records = visible_records
+        self._attr_extra_state_attributes = {
+            **self._attr_extra_state_attributes,
+            "flights": [record for record, _ in visible_records],
+        }
+        self.async_write_ha_state()
+
     def update_sensor_data(self):
+        started = time.perf_counter()
         visible_flights = self.coordinator.data or []
         self._attr_native_value = len(visible_flights)
 
-        flights_data = [self._format_flight_data(flight) for flight in visible_flights if flight]
+        # Attribute records carry only the newest trail points; full trails are
+        # added when the flight payload is built for the map card.
+        visible_records = [
+            (record, flight["data"].get("trail"))
+            for flight in visible_flights if flight
+            if (record := self._format_flight_data(flight))
+        ]
+        flights_data = [record for record, _ in visible_records]
+        self._visible_records = visible_records
         historic_flights = self.coordinator.historic_flights or []
-        historic_flights_data = [self._format_flight_data(flight) for flight in historic_flights if flight]
+        historic_records = [
+            record for flight in historic_flights if flight
+            if (record := self._format_historic_flight_data(flight)) is not None
+        ]
+
+        visible_ids = {flight["flight_id"] for flight in flights_data}
+        historic_ids = {record.attributes["flight_id"] for record in historic_records}
+        for cache_id in set(self._static_cache) - visible_ids - historic_ids:
+            del self._static_cache[cache_id]
+        for cache_id in set(self._historic_cache) - historic_ids:
+            del self._historic_cache[cache_id]
 
         config = self.coordinator.config
         config_attributes = {
@@ -406,10 +704,59 @@ class WhatsThatPlaneSensor(CoordinatorEntity, SensorEntity):
             "distance_units": config.get("distance_units", "metric"),
             "altitude_units": config.get("altitude_units", "imperial"),
             "speed_units": config.get("speed_units", "imperial"),
+            "zones": config.get("zones") or [],
         }
 
+        def build_payload():
+            return {
+                "config": config_attributes,
+                "flights": [{**record, "trail": trail_points(trail)} for record, trail in self._visible_records],
+                "historic_flights": [record.payload_record() for record in historic_records],
+            }
+
+        self.coordinator.async_set_flight_payload(build_payload)
+
         self._attr_extra_state_attributes = {
             "config": config_attributes,
             "flights": flights_data,
-            "historic_flights": historic_flights_data,
         }
+        if self.coordinator.zone_index:
+            zone_counts = {zone.name: 0 for zone in self.coordinator.zone_index.zones}
+            for flight in flights_data:
+                for zone_name in flight["zones"]:
+                    zone_counts[zone_name] += 1
+            self._attr_extra_state_attributes["zone_counts"] = zone_counts
+        if config.get("historic_flights_in_attributes", False):
+            self._attr_extra_state_attributes["historic_flights"] = [self._historic_summary(record) for record in historic_records]
+
+        formatting_ms = (time.perf_counter() - started) * 1000
+        telemetry = self.coordinator.telemetry
+        attribute_bytes = None
+        if telemetry.last is not None:
+            if self._format_count % ATTRIBUTE_BYTES_SAMPLE_INTERVAL == 0:
+                attribute_bytes = len(json_bytes(self._attr_extra_state_attributes))
+            self._format_count += 1
+        telemetry.record_format(formatting_ms, attribute_bytes)
+
+
+class WhatsThatPlaneDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Reports the coordinator's update telemetry for tuning ``update_interval`` and radius."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: WhatsThatPlaneDiagnosticDescription
+
+    def __init__(self, coordinator, description: WhatsThatPlaneDiagnosticDescription):
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, coordinator.config_entry.entry_id)})
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
@@ -0,0 +1,127 @@
+import time
+from collections import deque
+from .const import TELEMETRY_WINDOW
+
+# Coordinator stages in the order they run, followed by the sensor's formatting.
+STAGES = ("feed", "geometry", "tracking", "details", "expiry", "format")
+# Counts only measured on some cycles, summarised over the cycles that have them.
+SAMPLED_COUNTS = ("attribute_bytes",)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values``, or ``None`` if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _percentiles(values):
+    return {
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+    }
+
+
+class CycleRecord:
+    """Stage durations in milliseconds and counters for one coordinator update."""
+
+    __slots__ = ("started_at", "durations", "counts", "_lap_started")
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.durations = {}
+        self.counts = {}
+        self._lap_started = time.perf_counter()
+
+    def lap(self, stage) -> None:
+        """Attribute the time since the previous lap to ``stage``."""
+        now = time.perf_counter()
+        self.durations[stage] = self.durations.get(stage, 0.0) + (now - self._lap_started) * 1000
+        self._lap_started = now
+
+    def count(self, name, value=1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    @property
+    def total_ms(self):
+        return sum(self.durations.values())
+
+    def as_dict(self):
+        return {
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 3),
+            "durations_ms": {stage: round(duration, 3) for stage, duration in self.durations.items()},
+            "counts": dict(self.counts),
+        }
+
+
+class CycleTelemetry:
+    """Rolling window of the most recent ``CycleRecord``s with percentile summaries."""
+
+    def __init__(self, window=TELEMETRY_WINDOW):
+        self.cycles = deque(maxlen=window)
+        self.current = None
+
+    def start_cycle(self) -> CycleRecord:
+        self.current = CycleRecord()
+        return self.current
+
+    def finish_cycle(self) -> None:
+        if self.current is not None:
+            self.cycles.append(self.current)
+            self.current = None
+
+    @property
+    def last(self):
+        return self.cycles[-1] if self.cycles else None
+
+    def record_format(self, duration_ms, attribute_bytes=None) -> None:
+        """Attach the sensor's formatting of the latest data to the last finished cycle.
+
+        ``attribute_bytes`` is left out on the updates where it isn't sampled.
+        """
+        if (last := self.last) is None:
+            return
+        last.durations["format"] = duration_ms
+        if attribute_bytes is not None:
+            last.counts["attribute_bytes"] = attribute_bytes
+
+    def last_count(self, name):
+        """The most recent value of a count, looking back past cycles that didn't record it."""
+        for cycle in reversed(self.cycles):
+            if name in cycle.counts:
+                return cycle.counts[name]
+        return None
+
+    def count_total(self, name):
+        return sum(cycle.counts.get(name, 0) for cycle in self.cycles)
+
+    def duration_percentiles(self):
+        summary = {"total": _percentiles([cycle.total_ms for cycle in self.cycles])}
+        for stage in STAGES:
+            values = [cycle.durations[stage] for cycle in self.cycles if stage in cycle.durations]
+            if values:
+                summary[stage] = _percentiles(values)
+        return summary
+
+    def count_percentiles(self):
+        names = {name for cycle in self.cycles for name in cycle.counts}
+        return {
+            name: _percentiles([
+                cycle.counts[name] if name in SAMPLED_COUNTS else cycle.counts.get(name, 0)
+                for cycle in self.cycles if name not in SAMPLED_COUNTS or name in cycle.counts
+            ])
+            for name in sorted(names)
+        }
+
+    def as_dict(self):
+        last = self.last
+        return {
+            "cycles": len(self.cycles),
+            "last_cycle": last.as_dict() if last is not None else None,
+            "durations_ms": self.duration_percentiles(),
+            "counts": self.count_percentiles(),
+        }
@@ -0,0 +1,172 @@
+import math
+from array import array
+
+EARTH_MEAN_RADIUS_M = 6371008.8
+MISSING = math.nan
+# Most points a simplified segment may absorb before its end is kept regardless,
+# bounding the work per append on long straight legs.
+SIMPLIFY_MAX_WINDOW = 64
+
+
+def _to_float(value):
+    return MISSING if value is None else float(value)
+
+
+def _from_float(value):
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def merge_points(*trails):
+    """Merge newest-first point lists into one newest-first list ordered by ``ts``.
+
+    Where several points share a timestamp the one from the earliest list is
+    kept. Points without a timestamp can't be placed and go at the oldest end.
+    """
+    points = {}
+    untimed = []
+    for trail in trails:
+        for point in trail:
+            timestamp = point.get("ts")
+            if timestamp is None:
+                untimed.append(point)
+            else:
+                points.setdefault(timestamp, point)
+    return [points[timestamp] for timestamp in sorted(points, reverse=True)] + untimed
+
+
+class FlightTrail:
+    """Fixed-capacity ring buffer of trail points stored as parallel arrays.
+
+    Points are kept oldest to newest internally and exposed newest first as the
+    ``{"lat", "lng", "alt", "spd", "hd", "ts"}`` dicts FlightRadar24 uses, so the
+    sensor and map card see the same shape as before. Once ``capacity`` is
+    reached the oldest point is overwritten. Point dicts are built on demand
+    and not kept, so a trail only holds its arrays; ask for ``recent`` points
+    rather than the whole list where that's enough.
+
+    With a ``tolerance_m`` above zero the trail is simplified as it grows with an
+    opening window: the newest kept point is replaced by each new point for as
+    long as every point absorbed since the previous kept point stays within
+    ``tolerance_m`` metres of the straight segment between them, so no dropped
+    point is ever further than ``tolerance_m`` from the simplified trail.
+    """
+
+    __slots__ = (
+        "capacity", "tolerance_m", "_start", "_size", "_window",
+        "_lat", "_lng", "_alt", "_spd", "_hd", "_ts",
+    )
+
+    def __init__(self, capacity, tolerance_m=0.0):
+        self.capacity = max(2, int(capacity))
+        self.tolerance_m = tolerance_m
+        self._start = 0
+        self._size = 0
+        # (lat, lng) of the points dropped since the point before the newest.
+        self._window = []
+        self._lat = array("d", bytes(8 * self.capacity))
+        self._lng = array("d", bytes(8 * self.capacity))
+        self._alt = array("d", bytes(8 * self.capacity))
+        self._spd = array("d", bytes(8 * self.capacity))
+        self._hd = array("d", bytes(8 * self.capacity))
+        self._ts = array("d", bytes(8 * self.capacity))
+
+    @classmethod
+    def from_points(cls, points, capacity, tolerance_m=0.0):
+        """Build a trail from FlightRadar24-style points ordered newest first."""
+        trail = cls(capacity, tolerance_m)
+        for point in reversed(list(points)):
+            if point.get("lat") is None or point.get("lng") is None:
+                continue
+            trail.append(point["lat"], point["lng"], point.get("alt"), point.get("spd"), point.get("hd"), point.get("ts"))
+        return trail
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for offset in range(self._size - 1, -1, -1):
+            yield self._point(self._index(offset))
+
+    def latest(self):
+        if not self._size:
+            return None
+        return self._point(self._index(self._size - 1))
+
+    def append(self, lat, lng, alt=None, spd=None, hd=None, ts=None) -> None:
+        if self.tolerance_m > 0 and self._size >= 2:
+            previous = self._index(self._size - 1)
+            anchor = self._index(self._size - 2)
+            window = [*self._window, (self._lat[previous], self._lng[previous])]
+            if len(window) <= SIMPLIFY_MAX_WINDOW and all(
+                self._cross_track_m(anchor, point_lat, point_lng, lat, lng) <= self.tolerance_m
+                for point_lat, point_lng in window
+            ):
+                self._window = window
+                self._write(previous, lat, lng, alt, spd, hd, ts)
+                return
+            self._window = []
+
+        if self._size < self.capacity:
+            index = self._index(self._size)
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._write(index, lat, lng, alt, spd, hd, ts)
+
+    def recent(self, count):
+        """Return up to ``count`` of the newest points, newest first."""
+        return [self._point(self._index(offset)) for offset in range(self._size - 1, max(-1, self._size - 1 - count), -1)]
+
+    def as_list(self):
+        """Return all points, newest first."""
+        return list(self)
+
+    def _index(self, offset):
+        return (self._start + offset) % self.capacity
+
+    def _write(self, index, lat, lng, alt, spd, hd, ts) -> None:
+        self._lat[index] = lat
+        self._lng[index] = lng
+        self._alt[index] = _to_float(alt)
+        self._spd[index] = _to_float(spd)
+        self._hd[index] = _to_float(hd)
+        self._ts[index] = _to_float(ts)
+
+    def _point(self, index):
+        return {
+            "lat": self._lat[index],
+            "lng": self._lng[index],
+            "alt": _from_float(self._alt[index]),
+            "spd": _from_float(self._spd[index]),
+            "hd": _from_float(self._hd[index]),
+            "ts": _from_float(self._ts[index]),
+        }
+
+    def _cross_track_m(self, start_index, middle_lat, middle_lng, end_lat, end_lng):
+        """Distance in metres from the middle point to the start→end segment.
+
+        Uses a local equirectangular projection, which is accurate to well under
+        a metre over the few kilometres between consecutive trail points.
+        """
+        start_lat = self._lat[start_index]
+        start_lng = self._lng[start_index]
+        scale_x = math.cos(math.radians(start_lat)) * EARTH_MEAN_RADIUS_M * math.pi / 180
+        scale_y = EARTH_MEAN_RADIUS_M * math.pi / 180
+
+        middle_x = (middle_lng - start_lng) * scale_x
+        middle_y = (middle_lat - start_lat) * scale_y
+        end_x = (end_lng - start_lng) * scale_x
+        end_y = (end_lat - start_lat) * scale_y
+
+        segment_length_squared = end_x * end_x + end_y * end_y
+        if segment_length_squared == 0:
+            return math.hypot(middle_x, middle_y)
+
+        projection = max(0.0, min(1.0, (middle_x * end_x + middle_y * end_y) / segment_length_squared))
+        return math.hypot(middle_x - projection * end_x, middle_y - projection * end_y)
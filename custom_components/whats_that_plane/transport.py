@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from .const import (
+    DOMAIN,
+    FR24_HOME_URL,
+    FR24_DATA_URL,
+    TRANSPORT_REQUEST_TIMEOUT_SECONDS,
+    CLEARANCE_MAX_AGE_SECONDS,
+    CLEARANCE_REWARM_MARGIN_SECONDS,
+    CLEARANCE_SAVE_DELAY_SECONDS,
+)
+from .limiter import RequestLimiter, RequestThrottled
+
+_LOGGER = logging.getLogger(__name__)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.transport"
+
+
+def _morsel_expiry(morsel, now):
+    if morsel["max-age"]:
+        try:
+            return now + int(morsel["max-age"])
+        except ValueError:
+            pass
+    if morsel["expires"]:
+        try:
+            return parsedate_to_datetime(morsel["expires"]).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class FlightDetailTransport:
+    """Pooled async client for the FlightRadar24 clickhandler endpoint.
+
+    Cloudflare clearance is obtained once with ``cloudscraper`` in the executor;
+    the resulting cookies and user agent are then replayed on a keep-alive
+    aiohttp session. Clearance is persisted under ``.storage`` so it survives
+    restarts, renewed in the background shortly before its cookies expire, and
+    only re-solved on the request path when a 403 shows it has been revoked.
+
+    A 429, or a 403 that survives renewal, is reported to ``limiter`` and
+    raised as ``RequestThrottled``. ``home_url`` and ``data_url`` can point at a
+    local stand-in server.
+    """
+
+    def __init__(self, hass: HomeAssistant, limiter: RequestLimiter, home_url=FR24_HOME_URL, data_url=FR24_DATA_URL):
+        self.hass = hass
+        self.limiter = limiter
+        self.home_url = home_url.rstrip("/")
+        self.data_url = data_url.rstrip("/")
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._session = None
+        self._user_agent = None
+        self._cookies = {}
+        self._warmed_at = 0.0
+        self._generation = 0
+        self._warm_lock = asyncio.Lock()
+        self._unsub_rewarm = None
+        self.warm_count = 0
+        self.forbidden_count = 0
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if stored and stored.get("user_agent"):
+            now = time.time()
+            self._user_agent = stored["user_agent"]
+            self._warmed_at = stored.get("warmed_at", 0.0)
+            self._cookies = {
+                name: (cookie["value"], cookie.get("expires"))
+                for name, cookie in stored.get("cookies", {}).items()
+                if not cookie.get("expires") or cookie["expires"] > now
+            }
+            _LOGGER.debug(f"Restored Cloudflare clearance with {len(self._cookies)} cookie(s)")
+        self._schedule_rewarm()
+
+    async def async_close(self) -> None:
+        if self._unsub_rewarm is not None:
+            self._unsub_rewarm()
+            self._unsub_rewarm = None
+        if self._user_agent:
+            await self._store.async_save(self._data_to_save())
+        if self._session is not None:
+            # The session shares Home Assistant's connector, so detach it rather than closing it.
+            self._session.detach()
+            self._session = None
+
+    @property
+    def valid_until(self):
+        """Timestamp after which the current clearance should no longer be relied on."""
+        if not self._user_agent:
+            return 0.0
+        valid_until = self._warmed_at + CLEARANCE_MAX_AGE_SECONDS
+        for _, expires in self._cookies.values():
+            if expires:
+                valid_until = min(valid_until, expires)
+        return valid_until
+
+    async def async_get_flight_details(self, flight_id):
+        if time.time() >= self.valid_until:
+            await self.async_warm(self._generation)
+
+        generation = self._generation
+        details = await self._async_request(flight_id)
+        if details is None:
+            _LOGGER.debug(f"Clearance rejected fetching {flight_id}; renewing")
+            await self.async_warm(generation)
+            details = await self._async_request(flight_id)
+            if details is None:
+                self.limiter.throttled()
+                raise RequestThrottled(f"Cloudflare denied access to flight {flight_id}")
+        self.limiter.succeeded()
+        return details
+
+    async def async_warm(self, generation=None) -> None:
+        """Solve a fresh Cloudflare challenge.
+
+        Callers that saw the clearance fail pass the ``generation`` they used, so
+        concurrent failures trigger a single renewal.
+        """
+        async with self._warm_lock:
+            if generation is not None and generation != self._generation:
+                return
+            try:
+                user_agent, cookies = await self.hass.async_add_executor_job(self._solve_clearance)
+            except Exception as e:
+                _LOGGER.warning(f"Could not obtain Cloudflare clearance from {self.home_url}: {e}")
+                return
+
+            self._user_agent = user_agent
+            self._cookies = cookies
+            self._warmed_at = time.time()
+            self._generation += 1
+            self.warm_count += 1
+            self._store.async_delay_save(self._data_to_save, CLEARANCE_SAVE_DELAY_SECONDS)
+            self._schedule_rewarm()
+
+    def _solve_clearance(self):
+        import cloudscraper
+        scraper = cloudscraper.create_scraper()
+        try:
+            response = scraper.get(f"{self.home_url}/", timeout=TRANSPORT_REQUEST_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            cookies = {cookie.name: (cookie.value, cookie.expires) for cookie in scraper.cookies}
+            return scraper.headers["User-Agent"], cookies
+        finally:
+            scraper.close()
+
+    async def _async_request(self, flight_id):
+        """Return the clickhandler payload, or ``None`` if the clearance was refused."""
+        if self._session is None:
+            self._session = async_create_clientsession(self.hass, auto_cleanup=False, cookie_jar=aiohttp.DummyCookieJar())
+
+        headers = {
+            "Accept": "application/json",
+            "Referer": f"{self.home_url}/",
+            "Origin": self.home_url,
+        }
+        if self._user_agent:
+            headers["User-Agent"] = self._user_agent
+        if self._cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, (value, _) in self._cookies.items())
+
+        async with self._session.get(
+            f"{self.data_url}/clickhandler/",
+            params={"flight": flight_id},
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=TRANSPORT_REQUEST_TIMEOUT_SECONDS),
+        ) as response:
+            self._remember_cookies(response.cookies)
+            if response.status == 403:
+                self.forbidden_count += 1
+                return None
+            if response.status == 429:
+                self.limiter.throttled()
+                raise RequestThrottled(f"details for {flight_id} refused with HTTP 429")
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    def _remember_cookies(self, cookies) -> None:
+        # Cloudflare refreshes its bot management cookie on ordinary responses.
+        if not cookies:
+            return
+        now = time.time()
+        for name, morsel in cookies.items():
+            self._cookies[name] = (morsel.value, _morsel_expiry(morsel, now))
+        self._store.async_delay_save(self._data_to_save, CLEARANCE_SAVE_DELAY_SECONDS)
+        self._schedule_rewarm()
+
+    def _schedule_rewarm(self) -> None:
+        if self._unsub_rewarm is not None:
+            self._unsub_rewarm()
+        delay = max(0.0, self.valid_until - CLEARANCE_REWARM_MARGIN_SECONDS - time.time())
+        self._unsub_rewarm = async_call_later(self.hass, delay, self._async_scheduled_rewarm)
+
+    async def _async_scheduled_rewarm(self, _now) -> None:
+        self._unsub_rewarm = None
+        await self.async_warm(self._generation)
+
+    def _data_to_save(self) -> dict:
+        return {
+            "user_agent": self._user_agent,
+            "warmed_at": self._warmed_at,
+            "cookies": {
+                name: {"value": value, "expires": expires}
+                for name, (value, expires) in self._cookies.items()
+            },
+        }
@@ -0,0 +1,70 @@
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from .const import DOMAIN
+
+EMPTY_PAYLOAD = {"flights": [], "historic_flights": []}
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_get_flights)
+    websocket_api.async_register_command(hass, websocket_subscribe_flights)
+
+
+@callback
+def _get_coordinator(hass: HomeAssistant, entity_id):
+    entity_entry = er.async_get(hass).async_get(entity_id)
+    if entity_entry is None or entity_entry.platform != DOMAIN:
+        return None
+    return hass.data.get(DOMAIN, {}).get(entity_entry.config_entry_id)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/flights",
+        vol.Required("entity_id"): str,
+    }
+)
+@callback
+def websocket_get_flights(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Return the full flight payload, including trails and history, for a sensor."""
+    coordinator = _get_coordinator(hass, msg["entity_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"No {DOMAIN} sensor found for {msg['entity_id']}")
+        return
+
+    connection.send_result(msg["id"], coordinator.flight_payload or EMPTY_PAYLOAD)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_flights",
+        vol.Required("entity_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_flights(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+    """Send the full flight payload for a sensor, then only what changes on each update.
+
+    Events carry either ``snapshot`` with the same payload as ``flights`` or
+    ``delta`` as described by ``diff_flight_payloads``. ``closed`` is sent if
+    the entry is unloaded or reloaded, after which the client should subscribe
+    again.
+    """
+    coordinator = _get_coordinator(hass, msg["entity_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"No {DOMAIN} sensor found for {msg['entity_id']}")
+        return
+
+    @callback
+    def forward_delta(delta) -> None:
+        if delta is None:
+            connection.send_message(websocket_api.event_message(msg["id"], {"closed": True}))
+            return
+        connection.send_message(websocket_api.event_message(msg["id"], {"delta": delta}))
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_payload_listener(forward_delta)
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"snapshot": coordinator.flight_payload or EMPTY_PAYLOAD}))
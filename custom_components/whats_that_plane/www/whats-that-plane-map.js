@@ -1,3 +1,7 @@
+// Leaflet is served next to this card with the same version query string, so it is cached for as long as the card is.
+const CARD_URL = new URL(import.meta.url);
+const assetUrl = (filename) => `${new URL(filename, CARD_URL).pathname}${CARD_URL.search}`;
+
 class WhatsThatPlaneMap extends HTMLElement {
   constructor() {
     super();
@@ -6,12 +10,15 @@ class WhatsThatPlaneMap extends HTMLElement {
     this._map = null;
     this._planeMarkers = {};
     this._planePaths = {};
+    this._renderedFlights = {};
     this._colorCache = {};
     this._airportMarkersLayer = null;
     this._selectedFlight = null;
     this._locationMarker = null;
     this._fovCone = null;
     this._updateTimer = null;
+    this._drawTimer = null;
+    this._unsubscribeFlights = null;
     this.goldenRatioConjugate = 0.61803398875;
     this.hue = Math.random();
     this._selectedFlightId = null;
@@ -138,7 +145,7 @@ class WhatsThatPlaneMap extends HTMLElement {
         .lds-ring div:nth-child(3) { animation-delay: -0.15s; }
         @keyframes lds-ring { 0% { transform: rotate(0deg); } 100% { transform: rotate(360deg); } }
       </style>
-      <link rel="stylesheet" href="/local/community/whats_that_plane/leaflet.css"/>
+      <link rel="stylesheet" href="${assetUrl('leaflet.css')}"/>
       <div id="loader"><div class="lds-ring"><div></div><div></div><div></div><div></div></div><p>Loading Map...</p></div>
       <div id="map-container">
         <div id="map"></div>
@@ -206,6 +213,14 @@ class WhatsThatPlaneMap extends HTMLElement {
 
   connectedCallback() {
     this.initMap();
+    if (this._map && this._hass) this.updateMap();
+  }
+
+  disconnectedCallback() {
+    if (this._unsubscribeFlights) {
+      this._unsubscribeFlights().catch(() => {});
+      this._unsubscribeFlights = null;
+    }
   }
 
   setConfig(config) {
@@ -229,6 +244,10 @@ class WhatsThatPlaneMap extends HTMLElement {
           this.mapInitialized = true;
       }
 
+      // hass is set on every state change in Home Assistant; only the sensor's own updates matter here.
+      const entityState = hass.states[this._config.entity];
+      if (entityState && this._state && entityState.last_updated === this._state.last_updated) return;
+
       if (this._updateTimer) {
         cancelAnimationFrame(this._updateTimer);
       }
@@ -243,16 +262,7 @@ class WhatsThatPlaneMap extends HTMLElement {
     const dimOpacity = 0.3;
 
     for (const flightId in this._planeMarkers) {
-        const isSelected = flightId === this._selectedFlightId;
-        const opacity = isFlightSelected ? (isSelected ? 1.0 : dimOpacity) : 1.0;
-        
-        if (this._planeMarkers[flightId]) {
-            this._planeMarkers[flightId].setOpacity(opacity);
-        }
-        if (this._planePaths[flightId]) {
-            this._planePaths[flightId].outline.setStyle({ opacity: opacity * 0.8 });
-            this._planePaths[flightId].inline.setStyle({ opacity: opacity * 0.9 });
-        }
+        this._updateFlightOpacity(flightId);
     }
 
     if (this._locationMarker) {
@@ -260,6 +270,19 @@ class WhatsThatPlaneMap extends HTMLElement {
     }
   }
 
+  _updateFlightOpacity(flightId) {
+    const dimOpacity = 0.3;
+    const opacity = this._selectedFlightId && flightId !== this._selectedFlightId ? dimOpacity : 1.0;
+
+    if (this._planeMarkers[flightId]) {
+        this._planeMarkers[flightId].setOpacity(opacity);
+    }
+    if (this._planePaths[flightId]) {
+        this._planePaths[flightId].outline.setStyle({ opacity: opacity * 0.8 });
+        this._planePaths[flightId].inline.setStyle({ opacity: opacity * 0.9 });
+    }
+  }
+
 
   _deselectFlight() {
     this._selectedFlightId = null;
@@ -386,7 +409,7 @@ class WhatsThatPlaneMap extends HTMLElement {
 
     try {
         if (typeof L === 'undefined') {
-            await this._loadScript('/local/community/whats_that_plane/leaflet.js');
+            await this._loadScript(assetUrl('leaflet.js'));
         }
 
         if (L.DomUtil.setPosition) {
@@ -548,7 +571,86 @@ class WhatsThatPlaneMap extends HTMLElement {
     this._state = entityState;
 
     if (!this.staticElementsDrawn) this.drawStaticElements();
-    this.drawFlightElements();
+    if (this._unsubscribeFlights || this._subscribingFlights) return;
+    this._subscribeFlights().catch((error) => {
+      console.warn('Could not subscribe to flight updates, loading them on each sensor update instead:', error);
+      this._loadFlightData().then(() => this.drawFlightElements());
+    });
+  }
+
+  async _subscribeFlights() {
+    // The integration sends a snapshot of every flight once, then only what changed on each update.
+    this._subscribingFlights = true;
+    try {
+      this._unsubscribeFlights = await this._hass.connection.subscribeMessage(
+        (message) => this._handleFlightMessage(message),
+        { type: 'whats_that_plane/subscribe_flights', entity_id: this._config.entity },
+      );
+    } finally {
+      this._subscribingFlights = false;
+    }
+  }
+
+  _handleFlightMessage(message) {
+    if (message.closed) {
+      // The entry was unloaded or reloaded; subscribe again on the next sensor update.
+      if (this._unsubscribeFlights) {
+        this._unsubscribeFlights().catch(() => {});
+        this._unsubscribeFlights = null;
+      }
+      this._state = null;
+      return;
+    }
+
+    this._flightData = message.snapshot || this._applyFlightDelta(this._flightData, message.delta);
+    this._flightDataUpdated = null;
+
+    if (this._drawTimer) {
+      cancelAnimationFrame(this._drawTimer);
+    }
+    this._drawTimer = requestAnimationFrame(() => this.drawFlightElements());
+  }
+
+  _applyFlightDelta(payload, delta) {
+    const lists = ['flights', 'historic_flights'];
+    const records = new Map();
+    lists.forEach(list => (payload[list] || []).forEach(flight => records.set(flight.flight_id || flight.callsign, { list, flight })));
+
+    (delta.added || []).forEach(({ list, flight }) => records.set(flight.flight_id || flight.callsign, { list, flight }));
+    (delta.changed || []).forEach(change => {
+      const entry = records.get(change.flight_id);
+      if (!entry) return;
+      const flight = { ...entry.flight, ...(change.fields || {}) };
+      if (change.trail) {
+        const kept = (entry.flight.trail || []).slice(change.trail.replace_head ? 1 : 0);
+        flight.trail = change.trail.replace || change.trail.prepend.concat(kept).slice(0, change.trail.length);
+      }
+      entry.flight = flight;
+      if (change.list) entry.list = change.list;
+    });
+    (delta.removed || []).forEach(id => records.delete(id));
+
+    const result = { config: 'config' in delta ? delta.config : payload.config };
+    lists.forEach(list => {
+      const order = (delta.order && delta.order[list]) || (payload[list] || []).map(flight => flight.flight_id || flight.callsign);
+      result[list] = order.map(id => records.get(id)).filter(entry => entry && entry.list === list).map(entry => entry.flight);
+    });
+    return result;
+  }
+
+  async _loadFlightData() {
+    if (this._flightData && this._flightDataUpdated === this._state.last_updated) return;
+    this._flightDataUpdated = this._state.last_updated;
+
+    try {
+      this._flightData = await this._hass.callWS({ type: 'whats_that_plane/flights', entity_id: this._config.entity });
+    } catch (error) {
+      console.warn('Could not load full flight data, falling back to sensor attributes:', error);
+      this._flightData = {
+        flights: this._state.attributes.flights,
+        historic_flights: this._state.attributes.historic_flights
+      };
+    }
   }
 
   drawStaticElements() {
@@ -572,40 +674,59 @@ class WhatsThatPlaneMap extends HTMLElement {
   }
 
   drawFlightElements() {
-    this._visibleFlightsLayer.clearLayers();
-    this._historicFlightsLayer.clearLayers();
-    this._planeMarkers = {};
-    this._planePaths = {};
-
     let selectedFlightData = null;
+    const drawnFlightIds = new Set();
+    const addedFlightIds = [];
 
     const processFlights = (flights, type) => {
         (flights || []).forEach(flight => {
             const id = flight.flight_id || flight.callsign;
+            if (drawnFlightIds.has(id)) return;
             if (id === this._selectedFlightId) {
                 selectedFlightData = flight;
             }
-            this.drawFlight(flight, type);
+            const isNew = !this._renderedFlights[id];
+            if (this.drawFlight(flight, type)) {
+                drawnFlightIds.add(id);
+                if (isNew) addedFlightIds.push(id);
+            }
         });
     };
 
-    processFlights(this._state.attributes.flights, 'visible');
-    processFlights(this._state.attributes.historic_flights, 'historic');
-    
-    const allFlights = (this._state.attributes.flights || []).concat(this._state.attributes.historic_flights || []);
-    const allFlightIds = new Set(allFlights.map(f => f.flight_id || f.callsign));
+    processFlights(this._flightData.flights, 'visible');
+    processFlights(this._flightData.historic_flights, 'historic');
 
-    if (this._selectedFlightId && !allFlightIds.has(this._selectedFlightId)) {
+    for (const flightId of Object.keys(this._renderedFlights)) {
+        if (!drawnFlightIds.has(flightId)) this._removeFlight(flightId);
+    }
+
+    if (this._selectedFlightId && !drawnFlightIds.has(this._selectedFlightId)) {
         this._deselectFlight();
-    } else {
-        this._updateAllElementsOpacity();
+    } else if (this._selectedFlightId) {
+        // Flights that were already on the map keep their opacity; only new ones need dimming.
+        addedFlightIds.forEach(flightId => this._updateFlightOpacity(flightId));
     }
     
     if (selectedFlightData) {
+        this._selectedFlight = selectedFlightData;
         this._updateInfoCardContent(selectedFlightData);
     }
   }
 
+  _removeFlight(flightId) {
+    const rendered = this._renderedFlights[flightId];
+    const layer = rendered.type === 'visible' ? this._visibleFlightsLayer : this._historicFlightsLayer;
+    if (this._planePaths[flightId]) {
+        layer.removeLayer(this._planePaths[flightId].outline);
+        layer.removeLayer(this._planePaths[flightId].inline);
+    }
+    layer.removeLayer(this._planeMarkers[flightId]);
+    delete this._planePaths[flightId];
+    delete this._planeMarkers[flightId];
+    delete this._renderedFlights[flightId];
+    delete this._colorCache[flightId];
+  }
+
 
   _hslToRgb(h, s, l) {
     let r, g, b;
@@ -704,16 +825,67 @@ class WhatsThatPlaneMap extends HTMLElement {
   }
 
   drawFlight(flight, type) {
-      if (!flight.latitude || !flight.longitude) return;
+      if (!flight.latitude || !flight.longitude) return false;
 
       const flightId = flight.flight_id || flight.callsign;
       const layer = (type === 'visible') ? this._visibleFlightsLayer : this._historicFlightsLayer;
+      const trail = (flight.trail || []).filter(p => p.lat && p.lng);
+      const rendered = this._renderedFlights[flightId];
+
+      if (!rendered) {
+        this._addFlight(flightId, flight, type, layer, trail);
+        return true;
+      }
+
+      rendered.flight = flight;
+      if (rendered.type !== type) {
+        // Move the existing layers rather than redrawing them, keeping the marker above its trail.
+        const previousLayer = (rendered.type === 'visible') ? this._visibleFlightsLayer : this._historicFlightsLayer;
+        const paths = this._planePaths[flightId];
+        const layers = paths ? [paths.outline, paths.inline, this._planeMarkers[flightId]] : [this._planeMarkers[flightId]];
+        layers.forEach(l => { previousLayer.removeLayer(l); layer.addLayer(l); });
+        rendered.type = type;
+      }
+
+      const positionChanged = flight.latitude !== rendered.latitude || flight.longitude !== rendered.longitude;
+      if (positionChanged) {
+        this._planeMarkers[flightId].setLatLng([flight.latitude, flight.longitude]);
+      }
+      if ((flight.heading || 0) !== rendered.heading) {
+        this._planeMarkers[flightId].setIcon(this._planeIcon(flight.heading || 0, this._getFlightColor(flightId)));
+        rendered.heading = flight.heading || 0;
+      }
+
+      const trailHead = trail[0];
+      const trailChanged = trail.length !== rendered.trailLength || !this._isSameTrailPoint(trailHead, rendered.trailHead);
+      if (positionChanged || trailChanged) {
+        this._updateTrail(flightId, flight, layer, trail, rendered);
+      }
+      rendered.latitude = flight.latitude;
+      rendered.longitude = flight.longitude;
+      rendered.trailHead = trailHead;
+      rendered.trailLength = trail.length;
+      return true;
+  }
+
+  _addFlight(flightId, flight, type, layer, trail) {
       const uniqueColor = this._getFlightColor(flightId);
+      const rendered = {
+        type,
+        flight,
+        latitude: flight.latitude,
+        longitude: flight.longitude,
+        heading: flight.heading || 0,
+        trailHead: trail[0],
+        trailLength: trail.length,
+      };
+      this._renderedFlights[flightId] = rendered;
       
+      // Handlers read the flight from the registry so they always see the latest update.
       const clickHandler = (e) => {
           L.DomEvent.stopPropagation(e);
-          this._showFlightInfo(flight);
-          this._zoomToFlightRoute(flight);
+          this._showFlightInfo(rendered.flight);
+          this._zoomToFlightRoute(rendered.flight);
       }
       
       const highlight = () => {
@@ -742,28 +914,13 @@ class WhatsThatPlaneMap extends HTMLElement {
             }
         }
       };
+      rendered.handlers = { clickHandler, highlight, reset };
 
-      if (flight.trail && flight.trail.length > 0) {
-        const trailPoints = flight.trail.filter(p => p.lat && p.lng).map(p => [p.lat, p.lng]);
-        const currentPosition = [flight.latitude, flight.longitude];
-        trailPoints.unshift(currentPosition);
-        
-        const outline = L.polyline(trailPoints, { color: '#FFFFFF', weight: 4, opacity: 0.8 });
-        const inline = L.polyline(trailPoints, { color: uniqueColor, weight: 2, opacity: 0.9 });
-        outline.addTo(layer); 
-        inline.addTo(layer);
-        this._planePaths[flightId] = { outline, inline };
-        
-        [outline, inline].forEach(p => { 
-            p.on('mouseover', highlight); 
-            p.on('mouseout', reset); 
-            p.on('click', clickHandler);
-        });
-    }
-
-      const planeIcon = L.divIcon({ html: `<div style="transform: rotate(${flight.heading || 0}deg); filter: drop-shadow(0px 0px 2px rgba(0,0,0,0.7));"><svg viewbox="0 0 24 24" width="30" height="30" role="img" aria-hidden="true" style="color: ${uniqueColor};"><path fill="currentColor" d="M21 16v-2l-8-5V3.5c0-.83-.67-1.5-1.5-1.5S10 2.67 10 3.5V9l-8 5v2l8-2.5V19l-2 1.5V22l3.5-1 3.5 1v-1.5L13 19v-5.5l8 2.5z"/></svg></div>`, className: '', iconSize: [30, 30], iconAnchor: [15, 15] });
+      if (trail.length > 0) {
+        this._addTrail(flightId, flight, layer, trail, rendered);
+      }
 
-      const marker = L.marker([flight.latitude, flight.longitude], { icon: planeIcon });
+      const marker = L.marker([flight.latitude, flight.longitude], { icon: this._planeIcon(rendered.heading, uniqueColor) });
       marker.addTo(layer);
       marker.on('mouseover', highlight);
       marker.on('mouseout', reset);
@@ -771,6 +928,61 @@ class WhatsThatPlaneMap extends HTMLElement {
       this._planeMarkers[flightId] = marker;
   }
 
+  _addTrail(flightId, flight, layer, trail, rendered) {
+      const trailPoints = trail.map(p => [p.lat, p.lng]);
+      trailPoints.unshift([flight.latitude, flight.longitude]);
+
+      const outline = L.polyline(trailPoints, { color: '#FFFFFF', weight: 4, opacity: 0.8 });
+      const inline = L.polyline(trailPoints, { color: this._getFlightColor(flightId), weight: 2, opacity: 0.9 });
+      outline.addTo(layer); 
+      inline.addTo(layer);
+      this._planePaths[flightId] = { outline, inline };
+      
+      [outline, inline].forEach(p => { 
+          p.on('mouseover', rendered.handlers.highlight); 
+          p.on('mouseout', rendered.handlers.reset); 
+          p.on('click', rendered.handlers.clickHandler);
+      });
+  }
+
+  _updateTrail(flightId, flight, layer, trail, rendered) {
+      const paths = this._planePaths[flightId];
+      if (!paths) {
+        if (trail.length === 0) return;
+        this._addTrail(flightId, flight, layer, trail, rendered);
+        // Keep the marker drawn above the trail that was just added.
+        this._planeMarkers[flightId].removeFrom(layer).addTo(layer);
+        this._updateFlightOpacity(flightId);
+        return;
+      }
+
+      // Trails are newest first. When the previous newest point is still there, only the points
+      // recorded since are new: prepend them behind the current position and drop whatever the
+      // integration trimmed from the oldest end. Anything else, such as simplification, redraws it.
+      const current = L.latLng(flight.latitude, flight.longitude);
+      let newPoints = 0;
+      while (newPoints < trail.length && !this._isSameTrailPoint(trail[newPoints], rendered.trailHead)) newPoints++;
+
+      let latlngs;
+      if (rendered.trailHead && newPoints < trail.length && trail.length <= rendered.trailLength + newPoints) {
+        latlngs = paths.inline.getLatLngs();
+        latlngs.splice(0, 1, current, ...trail.slice(0, newPoints).map(p => L.latLng(p.lat, p.lng)));
+        latlngs.length = trail.length + 1;
+      } else {
+        latlngs = [current, ...trail.map(p => L.latLng(p.lat, p.lng))];
+      }
+      paths.outline.setLatLngs(latlngs);
+      paths.inline.setLatLngs(latlngs);
+  }
+
+  _isSameTrailPoint(a, b) {
+      return !!a && !!b && a.ts === b.ts && a.lat === b.lat && a.lng === b.lng;
+  }
+
+  _planeIcon(heading, color) {
+      return L.divIcon({ html: `<div style="transform: rotate(${heading}deg); filter: drop-shadow(0px 0px 2px rgba(0,0,0,0.7));"><svg viewbox="0 0 24 24" width="30" height="30" role="img" aria-hidden="true" style="color: ${color};"><path fill="currentColor" d="M21 16v-2l-8-5V3.5c0-.83-.67-1.5-1.5-1.5S10 2.67 10 3.5V9l-8 5v2l8-2.5V19l-2 1.5V22l3.5-1 3.5 1v-1.5L13 19v-5.5l8 2.5z"/></svg></div>`, className: '', iconSize: [30, 30], iconAnchor: [15, 15] });
+  }
+
   _calculateFovCone(lat, lon, dir, fov, rad) {
     const toRad = (d) => d * Math.PI / 180;
     const toDeg = (r) => r * 180 / Math.PI;
@@ -0,0 +1,184 @@
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+from .const import ZONE_GRID_SIZE
+from .geometry import calculate_bearing, haversine_km, is_within_fov, sector_bounds
+
+ZONE_TYPES = ("circle", "sector", "polygon")
+
+
+def _point(value):
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise vol.Invalid("polygon points must be [latitude, longitude] pairs")
+    return [cv.latitude(value[0]), cv.longitude(value[1])]
+
+
+def _validate_zone(zone):
+    if zone["type"] == "polygon":
+        if len(zone.get("points", [])) < 3:
+            raise vol.Invalid(f"polygon zone {zone['name']} needs at least 3 points")
+    elif "radius_km" not in zone:
+        raise vol.Invalid(f"{zone['type']} zone {zone['name']} needs a radius_km")
+    return zone
+
+
+def _unique_names(zones):
+    names = [zone["name"] for zone in zones]
+    if len(names) != len(set(names)):
+        raise vol.Invalid("zone names must be unique")
+    return zones
+
+
+ZONE_SCHEMA = vol.All(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("type", default="circle"): vol.In(ZONE_TYPES),
+        vol.Optional("latitude"): cv.latitude,
+        vol.Optional("longitude"): cv.longitude,
+        vol.Optional("radius_km"): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional("facing_direction", default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
+        vol.Optional("fov_cone", default=90): vol.All(vol.Coerce(float), vol.Range(min=0, max=360, min_included=False)),
+        vol.Optional("points"): [_point],
+        vol.Optional("altitude_min_ft"): vol.Coerce(int),
+        vol.Optional("altitude_max_ft"): vol.Coerce(int),
+    },
+    _validate_zone,
+)
+ZONES_SCHEMA = vol.All([ZONE_SCHEMA], _unique_names)
+
+
+class Zone:
+    """A circle, FOV sector or polygon with its own altitude band.
+
+    Circles and sectors are centred on the entry's location unless the zone
+    gives its own. Distances use the spherical haversine, so a zone edge is
+    accurate to about 0.5%.
+    """
+
+    __slots__ = (
+        "name", "kind", "latitude", "longitude", "radius_km", "facing_direction", "fov_cone",
+        "points", "minimum_altitude", "maximum_altitude", "bounds",
+    )
+
+    def __init__(self, name, kind, latitude, longitude, radius_km=None, facing_direction=0, fov_cone=360,
+                 points=None, minimum_altitude=0, maximum_altitude=60000):
+        self.name = name
+        self.kind = kind
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_km = radius_km
+        self.facing_direction = facing_direction
+        self.fov_cone = fov_cone if kind == "sector" else 360
+        self.points = [tuple(point) for point in points or []]
+        self.minimum_altitude = minimum_altitude
+        self.maximum_altitude = maximum_altitude
+
+        if kind == "polygon":
+            latitudes = [point[0] for point in self.points]
+            longitudes = [point[1] for point in self.points]
+            self.bounds = (max(latitudes), min(latitudes), min(longitudes), max(longitudes))
+        else:
+            self.bounds = sector_bounds(latitude, longitude, radius_km, facing_direction, self.fov_cone)
+
+    @classmethod
+    def from_config(cls, zone, config):
+        """Build a zone from its options, falling back to the entry's location and altitude filters."""
+        return cls(
+            zone["name"],
+            zone.get("type", "circle"),
+            zone.get("latitude", config["latitude"]),
+            zone.get("longitude", config["longitude"]),
+            zone.get("radius_km"),
+            zone.get("facing_direction", 0),
+            zone.get("fov_cone", 90),
+            zone.get("points"),
+            zone.get("altitude_min_ft", config.get("filter_flight_altitude_ft_minimum", 0)),
+            zone.get("altitude_max_ft", config.get("filter_flight_altitude_ft_maximum", 60000)),
+        )
+
+    def contains(self, latitude, longitude, altitude):
+        if not (self.minimum_altitude <= (altitude or 0) <= self.maximum_altitude):
+            return False
+        north, south, west, east = self.bounds
+        if not (south <= latitude <= north and west <= longitude <= east):
+            return False
+        if self.kind == "polygon":
+            return _point_in_polygon(latitude, longitude, self.points)
+        if haversine_km(self.latitude, self.longitude, latitude, longitude) > self.radius_km:
+            return False
+        if self.fov_cone >= 360:
+            return True
+        return is_within_fov(calculate_bearing(self.latitude, self.longitude, latitude, longitude), self.facing_direction, self.fov_cone)
+
+
+def _point_in_polygon(latitude, longitude, points):
+    inside = False
+    previous_latitude, previous_longitude = points[-1]
+    for point_latitude, point_longitude in points:
+        if (point_latitude > latitude) != (previous_latitude > latitude):
+            crossing = point_longitude + (latitude - point_latitude) * (previous_longitude - point_longitude) / (previous_latitude - point_latitude)
+            if longitude < crossing:
+                inside = not inside
+        previous_latitude, previous_longitude = point_latitude, point_longitude
+    return inside
+
+
+class ZoneIndex:
+    """Uniform grid over every zone's bounding box for evaluating zones in one pass.
+
+    The union of the zone bounds is split into ``grid_size`` × ``grid_size``
+    cells, each listing the zones whose bounds overlap it. Locating an aircraft
+    is then a bounds check, one cell lookup and exact tests against only the
+    zones in that cell, however many zones the entry defines.
+    """
+
+    def __init__(self, zones, grid_size=ZONE_GRID_SIZE):
+        self.zones = list(zones)
+        self.grid_size = grid_size
+        self.bounds = None
+        self._cells = {}
+        if not self.zones:
+            return
+
+        self.bounds = (
+            max(zone.bounds[0] for zone in self.zones),
+            min(zone.bounds[1] for zone in self.zones),
+            min(zone.bounds[2] for zone in self.zones),
+            max(zone.bounds[3] for zone in self.zones),
+        )
+        for zone in self.zones:
+            north, south, west, east = zone.bounds
+            first_row, first_column = self._cell(south, west)
+            last_row, last_column = self._cell(north, east)
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    self._cells.setdefault((row, column), []).append(zone)
+
+    def __bool__(self):
+        return bool(self.zones)
+
+    def _cell(self, latitude, longitude):
+        north, south, west, east = self.bounds
+        row = int((latitude - south) / (north - south) * self.grid_size) if north > south else 0
+        column = int((longitude - west) / (east - west) * self.grid_size) if east > west else 0
+        return min(row, self.grid_size - 1), min(column, self.grid_size - 1)
+
+    def locate(self, latitude, longitude, altitude):
+        """Return the names of the zones containing an aircraft, in configuration order."""
+        north, south, west, east = self.bounds
+        if not (south <= latitude <= north and west <= longitude <= east):
+            return []
+        return [
+            zone.name for zone in self._cells.get(self._cell(latitude, longitude), ())
+            if zone.contains(latitude, longitude, altitude)
+        ]
+
+    def evaluate(self, flights):
+        """Map the id of every flight inside at least one zone to the names of its zones."""
+        if not self.zones:
+            return {}
+        hits = {}
+        for flight in flights:
+            names = self.locate(flight.latitude, flight.longitude, flight.altitude)
+            if names:
+                hits[flight.id] = names
+        return hits
@@ -0,0 +1,74 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from whats_that_plane.geometry import compute_flight_geometry  # noqa: E402
+from whats_that_plane.scheduler import next_poll_interval  # noqa: E402
+from whats_that_plane.zones import Zone  # noqa: E402
+
+LATITUDE = 51.5
+LONGITUDE = -0.2
+CONFIG = {
+    "latitude": LATITUDE,
+    "longitude": LONGITUDE,
+    "radius_km": 5,
+    "facing_direction": 0,
+    "fov_cone": 360,
+    "update_interval": 10,
+    "adaptive_polling_min_interval": 2,
+    "adaptive_polling_max_interval": 120,
+}
+# About 20 km north of the observer, well outside its 5 km radius.
+ZONE_LATITUDE = LATITUDE + 0.18
+
+
+def _flight(latitude, longitude, heading, altitude=3000, ground_speed=300):
+    return SimpleNamespace(latitude=latitude, longitude=longitude, heading=heading, altitude=altitude, ground_speed=ground_speed)
+
+
+def _interval(flights, zones=()):
+    geometry = compute_flight_geometry(
+        LATITUDE, LONGITUDE,
+        [flight.latitude for flight in flights],
+        [flight.longitude for flight in flights],
+        [flight.altitude for flight in flights],
+        CONFIG["radius_km"], 0, 60000, CONFIG["facing_direction"], CONFIG["fov_cone"],
+    )
+    return next_poll_interval(flights, geometry, False, CONFIG, zones)
+
+
+def _zones(minimum_altitude=0, maximum_altitude=60000):
+    circle = Zone("circle", "circle", ZONE_LATITUDE, LONGITUDE + 0.3, radius_km=3,
+                  minimum_altitude=minimum_altitude, maximum_altitude=maximum_altitude)
+    polygon = Zone("polygon", "polygon", None, None, points=[
+        (ZONE_LATITUDE - 0.02, LONGITUDE - 0.35), (ZONE_LATITUDE - 0.02, LONGITUDE - 0.25),
+        (ZONE_LATITUDE + 0.02, LONGITUDE - 0.25), (ZONE_LATITUDE + 0.02, LONGITUDE - 0.35),
+    ], minimum_altitude=minimum_altitude, maximum_altitude=maximum_altitude)
+    return [circle, polygon]
+
+
+@pytest.mark.parametrize("longitude", [LONGITUDE + 0.3, LONGITUDE - 0.3])
+def test_flight_heading_into_a_zone_brings_the_poll_forward(longitude):
+    # 300 kt due north, 10-11 km (about 70 s) short of the zone and nowhere near the radius.
+    flight = _flight(ZONE_LATITUDE - 0.12, longitude, heading=0)
+
+    assert _interval([flight]) == CONFIG["adaptive_polling_max_interval"]
+    assert 30 <= _interval([flight], _zones()) <= 40
+
+
+@pytest.mark.parametrize("longitude", [LONGITUDE + 0.3, LONGITUDE - 0.3])
+def test_flight_outside_a_zones_altitude_band_is_ignored(longitude):
+    flight = _flight(ZONE_LATITUDE - 0.12, longitude, heading=0, altitude=3000)
+
+    assert _interval([flight], _zones(minimum_altitude=5000)) == CONFIG["adaptive_polling_max_interval"]
+
+
+@pytest.mark.parametrize("longitude", [LONGITUDE + 0.3, LONGITUDE - 0.3])
+def test_flight_heading_away_from_a_zone_is_ignored(longitude):
+    flight = _flight(ZONE_LATITUDE - 0.12, longitude, heading=180)
+
+    assert _interval([flight], _zones()) == CONFIG["adaptive_polling_max_interval"]
@@ -0,0 +1,128 @@
+import math
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "custom_components"))
+
+from whats_that_plane.trail import EARTH_MEAN_RADIUS_M, SIMPLIFY_MAX_WINDOW, FlightTrail, merge_points  # noqa: E402
+
+LATITUDE = 51.4775
+LONGITUDE = -0.4614
+
+
+def _offset(north_m, east_m):
+    return (
+        LATITUDE + math.degrees(north_m / EARTH_MEAN_RADIUS_M),
+        LONGITUDE + math.degrees(east_m / (EARTH_MEAN_RADIUS_M * math.cos(math.radians(LATITUDE)))),
+    )
+
+
+def _circle(radius_m, points):
+    return [
+        _offset(radius_m * math.cos(2 * math.pi * step / points), radius_m * math.sin(2 * math.pi * step / points))
+        for step in range(points)
+    ]
+
+
+def _distance_to_trail_m(lat, lng, trail_points):
+    """Distance in metres from a point to the nearest segment of a simplified trail."""
+    scale_x = math.cos(math.radians(LATITUDE)) * EARTH_MEAN_RADIUS_M * math.pi / 180
+    scale_y = EARTH_MEAN_RADIUS_M * math.pi / 180
+    x, y = lng * scale_x, lat * scale_y
+    best = math.inf
+    for first, second in zip(trail_points, trail_points[1:]):
+        start_x, start_y = first["lng"] * scale_x, first["lat"] * scale_y
+        end_x, end_y = second["lng"] * scale_x - start_x, second["lat"] * scale_y - start_y
+        length_squared = end_x * end_x + end_y * end_y
+        projection = 0.0 if length_squared == 0 else max(0.0, min(1.0, ((x - start_x) * end_x + (y - start_y) * end_y) / length_squared))
+        best = min(best, math.hypot(x - start_x - projection * end_x, y - start_y - projection * end_y))
+    return best
+
+
+def _record(path, tolerance_m, capacity=1000):
+    trail = FlightTrail(capacity, tolerance_m)
+    for timestamp, (lat, lng) in enumerate(path):
+        trail.append(lat, lng, 1000, 90, 0, timestamp)
+    return trail
+
+
+@pytest.mark.parametrize("radius_m", [2000, 5000])
+def test_simplified_circle_stays_within_tolerance(radius_m):
+    path = _circle(radius_m, 360)
+    trail = _record(path, 50)
+    points = trail.as_list()
+
+    assert 2 < len(points) < len(path)
+    assert max(_distance_to_trail_m(lat, lng, points) for lat, lng in path) <= 50 + 1e-6
+
+
+def test_simplified_straight_leg_is_bounded_by_window():
+    path = [_offset(step * 100, step * 100) for step in range(500)]
+    points = _record(path, 50).as_list()
+
+    assert len(points) == math.ceil((len(path) - 1) / (SIMPLIFY_MAX_WINDOW + 1)) + 1
+    assert points[0]["lat"] == pytest.approx(path[-1][0])
+    assert points[-1]["lat"] == pytest.approx(path[0][0])
+
+
+def test_zero_tolerance_keeps_every_point_up_to_capacity():
+    path = _circle(2000, 50)
+    points = _record(path, 0, capacity=20).as_list()
+
+    assert len(points) == 20
+    assert [point["ts"] for point in points] == list(range(49, 29, -1))
+
+
+def test_deferred_details_trail_merges_by_timestamp():
+    # Polled locally every 10s while the details request was deferred...
+    local = FlightTrail(1000)
+    for timestamp in range(100, 140, 10):
+        local.append(*_offset(timestamp * 10, 0), 1000, 90, 0, timestamp)
+    # ...then FlightRadar24's trail arrives, overlapping the local points and newer than them.
+    scraped = [
+        {"lat": lat, "lng": lng, "alt": 1000, "spd": 90, "hd": 0, "ts": timestamp}
+        for timestamp in range(145, -5, -5)
+        for lat, lng in [_offset(timestamp * 10, 0)]
+    ]
+
+    merged = FlightTrail.from_points(merge_points(local.as_list(), scraped), 1000).as_list()
+    timestamps = [point["ts"] for point in merged]
+
+    assert timestamps == sorted(set(timestamps), reverse=True)
+    assert timestamps[0] == 145
+    assert timestamps[-1] == 0
+    assert len(merged) == len(scraped)
+    assert all(point in merged for point in local.as_list())
+
+
+def _retained_bytes(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def test_trail_holds_less_than_a_list_of_points():
+    path = _circle(5000, 1000)
+
+    def record():
+        trail = _record(path, 0)
+        # Building the points for a payload or the attributes must not leave them attached to the trail.
+        trail.as_list()
+        trail.recent(10)
+        return trail
+
+    trail_bytes, trail = _retained_bytes(record)
+    list_bytes, points = _retained_bytes(lambda: [
+        {"lat": lat, "lng": lng, "alt": 1000, "spd": 90, "hd": 0, "ts": timestamp}
+        for timestamp, (lat, lng) in enumerate(path)
+    ])
+
+    assert len(trail) == len(points) == 1000
+    assert trail_bytes < list_bytes / 4